@@ -3,11 +3,10 @@ from tkinter import ttk, messagebox
 import os
 import sys
 import json
+import threading
 # 取得 libs 資料夾的絕對路徑並加到 sys.path
 sys.path.append(os.path.join(os.path.dirname(__file__), "libs"))
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
+# openpyxl 載入較慢，改在匯出時才載入（視窗顯示後會在背景預先載入）
 
 # 添加當前目錄到路徑，確保能導入其他模組
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -41,6 +40,19 @@ class MainApplication:
         
         # 載入資料
         self.load_data()
+        
+        # 視窗顯示後在背景預先載入 openpyxl
+        self.root.after_idle(self.prewarm_openpyxl)
+    
+    def prewarm_openpyxl(self):
+        """在背景執行緒匯入 openpyxl，第一次匯出時就不必等待"""
+        def run():
+            try:
+                import openpyxl.styles
+                import openpyxl.utils
+            except ImportError:
+                pass
+        threading.Thread(target=run, daemon=True).start()
     
     def init_tabs(self):
         """初始化所有頁籤"""
@@ -138,6 +150,8 @@ class MainApplication:
         """匯出所有頁籤到單一Excel檔案"""
         try:
             from tkinter import filedialog
+            from openpyxl import Workbook
+            from openpyxl.styles import Font, PatternFill, Alignment
             filename = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
                 filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
@@ -2,9 +2,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tksheet import Sheet
 import os
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 from datetime import datetime
 
 class CustomersTab:
@@ -180,6 +177,10 @@ class CustomersTab:
         if not self.data: messagebox.showwarning("警告","沒有資料可以匯出"); return
         filename = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel", "*.xlsx")])
         if not filename: return
+        # openpyxl 載入較慢，匯出時才載入
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
         wb=Workbook(); ws=wb.active; ws.title="客戶管理"
         BLUE=PatternFill(start_color="366092", end_color="366092", fill_type="solid")
         ORANGE=PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")
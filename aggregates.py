@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+即時統計模組
+掛在 RecordStore 的異動監聽上，每次新增、修改、刪除記錄或變更狀態時
+只調整受影響的計數，摘要資訊隨時可直接讀取，不必重新掃描全部記錄
+"""
+
+from datetime import date
+
+from record_store import RECORD_KINDS
+from record_types import to_record
+
+
+APPROVED = "已核准"
+UNKNOWN_DEPARTMENT = "未分類"
+UNKNOWN_RATING = "未知"
+
+
+def _add(counter, key, amount):
+    """計數加減，歸零時移除該鍵"""
+    value = counter.get(key, 0) + amount
+    # 天數為浮點數，加減後可能留下極小的誤差
+    if abs(value) > 1e-9:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
+
+
+class LiveAggregates:
+    """即時維護的統計計數
+
+    - approved_leave_days：{(employee_id, 年度): 已核准請假天數}
+    - approved_leave_counts：{(employee_id, 年度): 已核准請假筆數}
+    - status_counts：{記錄類別: {狀態: 筆數}}（請假、加班）
+    - rating_distribution：{部門: {年度總評: 筆數}}
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.rebuild()
+        store.add_listener(self._on_change)
+
+    def rebuild(self):
+        """依 store 目前內容重新計算（整批載入時使用）"""
+        self.approved_leave_days = {}
+        self.approved_leave_counts = {}
+        self.status_counts = {'leave_requests': {}, 'overtime_requests': {}}
+        self.rating_distribution = {}
+        self._departments = {}
+        for employee_id, entry in self.store.employees.items():
+            self._add_employee(employee_id, entry, 1)
+
+    # === 單筆記錄的貢獻 ===
+    def _department_of(self, employee_id):
+        return self._departments.get(employee_id, UNKNOWN_DEPARTMENT)
+
+    def _apply_record(self, kind, employee_id, record, sign):
+        """將一筆記錄的貢獻加入（sign=1）或扣除（sign=-1）"""
+        if kind == 'performance_records':
+            rating = record.get('annual_rating') or UNKNOWN_RATING
+            distribution = self.rating_distribution.setdefault(self._department_of(employee_id), {})
+            _add(distribution, rating, sign)
+            if not distribution:
+                del self.rating_distribution[self._department_of(employee_id)]
+            return
+
+        status = record.get('status', '')
+        _add(self.status_counts[kind], status, sign)
+
+        if kind == 'leave_requests' and status == APPROVED:
+            ordinal = record.typed('start_date')
+            days = record.typed('days')
+            if ordinal is not None and isinstance(days, float):
+                key = (employee_id, date.fromordinal(ordinal).year)
+                _add(self.approved_leave_days, key, sign * days)
+                _add(self.approved_leave_counts, key, sign)
+
+    def _add_employee(self, employee_id, entry, sign):
+        if sign > 0:
+            department = entry.get('basic_info', {}).get('department') or UNKNOWN_DEPARTMENT
+            self._departments[employee_id] = department
+        for kind in RECORD_KINDS:
+            for record in entry.get(kind, []):
+                self._apply_record(kind, employee_id, to_record(kind, record), sign)
+        if sign < 0:
+            self._departments.pop(employee_id, None)
+
+    def _put_employee(self, employee_id, basic_info, old_id=None):
+        """員工基本資料異動：部門或員工編號改變時，搬移該員工的計數"""
+        previous_id = old_id or employee_id
+        department = basic_info.get('department') or UNKNOWN_DEPARTMENT
+        if previous_id not in self._departments:
+            self._departments[employee_id] = department
+            return
+        if previous_id == employee_id and self._departments[employee_id] == department:
+            return
+
+        # 只處理這位員工自己的記錄（此時 store 中已是新的員工編號）
+        entry = self.store.employees.get(employee_id, {})
+        moved = {'basic_info': {'department': self._departments[previous_id]}}
+        for kind in RECORD_KINDS:
+            moved[kind] = entry.get(kind, [])
+        self._add_employee(previous_id, moved, -1)
+        self._add_employee(employee_id, dict(moved, basic_info=basic_info), 1)
+
+    # === 異動監聽 ===
+    def _on_change(self, event):
+        op = event['op']
+        if op in ('load', 'clear'):
+            self.rebuild()
+        elif op == 'extend':
+            for employee_id, old_entry in event.get('replaced', {}).items():
+                self._add_employee(employee_id, old_entry, -1)
+            for employee_id, entry in event['employees'].items():
+                self._add_employee(employee_id, entry, 1)
+        elif op == 'put_employee':
+            self._put_employee(event['employee_id'], event['basic_info'], event['old_id'])
+        elif op == 'put_employees':
+            for employee_id, basic_info in event['employees']:
+                self._put_employee(employee_id, basic_info)
+        elif op == 'delete_employee':
+            self._add_employee(event['employee_id'], event['entry'], -1)
+        elif op == 'add_record':
+            self._apply_record(event['kind'], event['employee_id'], event['record'], 1)
+        elif op == 'update_record':
+            kind = event['kind']
+            self._apply_record(kind, event['employee_id'], to_record(kind, event['old_record']), -1)
+            self._apply_record(kind, event['employee_id'], event['record'], 1)
+        elif op == 'delete_record':
+            self._apply_record(event['kind'], event['employee_id'], event['record'], -1)
+        elif op == 'load_records':
+            kind = event['kind']
+            for employee_id, record in event['rows']:
+                self._apply_record(kind, employee_id, record, 1)
+
+    # === 查詢 ===
+    def pending_count(self, kind):
+        """待審核的筆數"""
+        return self.status_counts[kind].get("待審核", 0)
+
+    def approved_leave_days_of(self, employee_id, year):
+        """某位員工某年度已核准的請假天數"""
+        return self.approved_leave_days.get((employee_id, int(year)), 0.0)
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+統計分析模組
+將請假、加班記錄轉成欄式（每個欄位一個陣列）的資料表，
+以向量化的分組加總計算各種統計；有安裝 NumPy 時使用 NumPy，
+否則退回標準函式庫的 array 與迴圈計算
+"""
+
+from array import array
+from datetime import date
+
+from aggregates import LiveAggregates
+
+# NumPy 載入較慢，第一次建立資料表時才載入（None 表示未安裝）
+np = None
+_numpy_checked = False
+
+
+def load_numpy():
+    """載入 NumPy，未安裝時回傳 None"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        _numpy_checked = True
+    return np
+
+
+class LabelEncoder:
+    """將文字值編成連續的整數代碼"""
+
+    def __init__(self):
+        self.codes = {}
+        self.labels = []
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.labels)
+            self.labels.append(value)
+        return code
+
+
+class ColumnTable:
+    """欄式資料表
+
+    code 欄位為整數代碼（-1 表示缺值），labels[欄位] 為代碼對應的文字；
+    value 欄位為浮點數。各欄以標準函式庫的 array 保存，可逐列新增、修改，
+    統計時才以 np.frombuffer 包成 NumPy 陣列（不複製資料）。
+    每列對應一個記錄鍵值，刪除的列所有代碼設為 -1，不會被任何分組統計到，
+    空出的列留給之後新增的記錄使用。
+    """
+
+    def __init__(self, code_names, value_names):
+        self.encoders = {name: LabelEncoder() for name in code_names}
+        self.labels = {name: encoder.labels for name, encoder in self.encoders.items()}
+        self.codes = {name: array('q') for name in code_names}
+        self.values = {name: array('d') for name in value_names}
+        self.row_of = {}
+        self._free = []
+
+    def __len__(self):
+        for column in self.values.values():
+            return len(column)
+        return 0
+
+    def dead_rows(self):
+        """已刪除、尚未重新使用的列數"""
+        return len(self._free)
+
+    def put(self, key, labels, values):
+        """新增或更新記錄鍵值對應的列
+
+        labels 為 {code 欄位: 文字值}（None 表示缺值），values 為 {value 欄位: 浮點數}。
+        """
+        row = self.row_of.get(key)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = len(self)
+                for column in self.codes.values():
+                    column.append(-1)
+                for column in self.values.values():
+                    column.append(0.0)
+            self.row_of[key] = row
+        for name, label in labels.items():
+            self.codes[name][row] = -1 if label is None else self.encoders[name].encode(label)
+        for name, number in values.items():
+            self.values[name][row] = number
+
+    def remove(self, key):
+        """刪除記錄鍵值對應的列"""
+        row = self.row_of.pop(key, None)
+        if row is None:
+            return
+        for column in self.codes.values():
+            column[row] = -1
+        for column in self.values.values():
+            column[row] = 0.0
+        self._free.append(row)
+
+    def group_sum(self, keys, value, where=None):
+        """依 keys 欄位分組加總 value 欄位
+
+        where 為 {欄位: 文字值}，只統計符合的列。
+        回傳 [(各分組欄位的文字, 加總, 筆數), ...]，依分組文字排序。
+        """
+        if load_numpy() is not None:
+            return self._group_sum_numpy(keys, value, where or {})
+        return self._group_sum_python(keys, value, where or {})
+
+    def _filter_codes(self, where):
+        """將篩選條件轉成 {欄位: 代碼}，條件值不存在時回傳 None"""
+        wanted = {}
+        for name, label in where.items():
+            code = self.encoders[name].codes.get(label)
+            if code is None:
+                return None
+            wanted[name] = code
+        return wanted
+
+    def _group_sum_numpy(self, keys, value, where):
+        wanted = self._filter_codes(where)
+        if wanted is None or not len(self):
+            return []
+
+        # 只在統計期間包成 NumPy 陣列，之後 array 才能繼續增長
+        codes = {name: np.frombuffer(column, dtype=np.int64) for name, column in self.codes.items()}
+        mask = np.ones(len(self), dtype=bool)
+        for name in keys:
+            mask &= codes[name] >= 0
+        for name, code in wanted.items():
+            mask &= codes[name] == code
+
+        # 多個分組欄位合併成單一代碼，再以 np.unique 換成只含實際出現分組的連續編號，
+        # bincount 的陣列大小為分組數，而不是各欄代碼數的乘積
+        shape = tuple(max(len(self.labels[name]), 1) for name in keys)
+        combined = np.zeros(int(mask.sum()), dtype=np.int64)
+        for name, size in zip(keys, shape):
+            combined = combined * size + codes[name][mask]
+        if not combined.size:
+            return []
+
+        groups, inverse = np.unique(combined, return_inverse=True)
+        sums = np.bincount(inverse, weights=np.frombuffer(self.values[value], dtype=np.float64)[mask],
+                           minlength=len(groups))
+        counts = np.bincount(inverse, minlength=len(groups))
+        parts = np.unravel_index(groups, shape)
+
+        # 依文字排序：先算出各代碼的文字排名，再以 lexsort 一次排好
+        ranks = []
+        for name, part in zip(keys, parts):
+            labels = self.labels[name]
+            rank = np.empty(len(labels), dtype=np.int64)
+            rank[sorted(range(len(labels)), key=labels.__getitem__)] = np.arange(len(labels))
+            ranks.append(rank[part])
+        order = np.lexsort(ranks[::-1])
+
+        label_columns = [np.array(self.labels[name], dtype=object)[part[order]].tolist()
+                         for name, part in zip(keys, parts)]
+        return list(zip(zip(*label_columns), sums[order].tolist(), counts[order].tolist()))
+
+    def _group_sum_python(self, keys, value, where):
+        wanted = self._filter_codes(where)
+        if wanted is None:
+            return []
+
+        key_columns = [self.codes[name] for name in keys]
+        filters = [(self.codes[name], code) for name, code in wanted.items()]
+        values = self.values[value]
+        sums = {}
+        counts = {}
+        for i in range(len(values)):
+            if any(column[i] != code for column, code in filters):
+                continue
+            group = tuple(column[i] for column in key_columns)
+            if min(group) < 0:
+                continue
+            sums[group] = sums.get(group, 0.0) + values[i]
+            counts[group] = counts.get(group, 0) + 1
+
+        return sorted(
+            (tuple(self.labels[name][code] for name, code in zip(keys, group)), sums[group], counts[group])
+            for group in sums
+        )
+
+
+class RecordColumns:
+    """某類記錄的欄式資料表，隨 store 的異動逐筆維護
+
+    固定欄位：employee、department、year、month（YYYY-MM），
+    另加 text_fields 中的文字欄位；value_field 轉成浮點數（缺值為 0）。
+    """
+
+    def __init__(self, store, kind, date_field, value_field, text_fields):
+        self.store = store
+        self.kind = kind
+        self.date_field = date_field
+        self.value_field = value_field
+        self.text_fields = tuple(text_fields)
+        self.table = ColumnTable(['employee', 'department', 'year', 'month'] + list(text_fields), [value_field])
+        # 同一天的記錄很多，年月的換算結果重複使用
+        self._months = {}
+
+        departments = {}
+        for employee_id, record in store.query(kind):
+            department = departments.get(employee_id)
+            if department is None:
+                department = departments[employee_id] = self._department(employee_id)
+            self.put(employee_id, record, department)
+
+    def _department(self, employee_id):
+        basic_info = self.store.employees.get(employee_id, {}).get('basic_info', {})
+        return basic_info.get('department') or '未分類'
+
+    def put(self, employee_id, record, department=None):
+        """新增或更新一筆記錄的列"""
+        labels = {
+            'employee': employee_id,
+            'department': department or self._department(employee_id),
+            'year': None,
+            'month': None,
+        }
+        ordinal = record.typed(self.date_field)
+        if ordinal is not None:
+            year_month = self._months.get(ordinal)
+            if year_month is None:
+                day = date.fromordinal(ordinal)
+                year_month = self._months[ordinal] = (str(day.year), f"{day.year}-{day.month:02d}")
+            labels['year'], labels['month'] = year_month
+        for name in self.text_fields:
+            labels[name] = record.get(name, '')
+
+        number = record.typed(self.value_field)
+        self.table.put(self.store.record_key(record), labels,
+                       {self.value_field: number if isinstance(number, float) else 0.0})
+
+    def remove_records(self, records):
+        for record in records:
+            self.table.remove(self.store.record_key(record))
+
+    def refresh_employee(self, employee_id):
+        """員工資料（部門、員工編號）異動後，重新編碼該員工的記錄"""
+        department = self._department(employee_id)
+        for key in self.store.query_keys(self.kind, employee_id=employee_id):
+            _, record = self.store.get_record(self.kind, key)
+            self.put(employee_id, record, department)
+
+    def on_change(self, event):
+        """依異動事件更新資料表，需要整個重建時回傳 False"""
+        op = event['op']
+        kind = event.get('kind')
+        if kind is not None:
+            if kind != self.kind:
+                return True
+            if op == 'delete_record':
+                self.table.remove(event['key'])
+            elif op == 'load_records':
+                for employee_id, record in event['rows']:
+                    self.put(employee_id, record)
+            else:
+                self.put(event['employee_id'], event['record'])
+        elif op == 'put_employee':
+            self.refresh_employee(event['employee_id'])
+        elif op == 'put_employees':
+            for employee_id, _ in event['employees']:
+                self.refresh_employee(employee_id)
+        elif op == 'delete_employee':
+            self.remove_records(event['entry'].get(self.kind, []))
+        elif op == 'extend':
+            for entry in event['replaced'].values():
+                self.remove_records(entry.get(self.kind, []))
+            for employee_id, entry in event['employees'].items():
+                department = self._department(employee_id)
+                for record in entry.get(self.kind, []):
+                    self.put(employee_id, record, department)
+        else:
+            # load、clear：整批資料換掉，下次統計時再重建
+            return False
+        # 刪除的列過多時改為重建，避免統計時掃描大量空列
+        table = self.table
+        return table.dead_rows() <= max(1000, len(table) // 2)
+
+
+# 各類記錄資料表的欄位：(日期欄位, 數值欄位, 文字欄位)
+TABLE_FIELDS = {
+    'leave_requests': ('start_date', 'days', ('leave_type', 'status')),
+    'overtime_requests': ('overtime_date', 'hours', ('overtime_type', 'status')),
+}
+
+
+class Analytics:
+    """請假／加班統計
+
+    欄式資料表在第一次統計時建立，之後依 store 的異動事件逐筆更新，
+    只有整批載入或清空時才在下次統計時重建；
+    每次統計都直接在陣列上分組加總。
+    live 為即時維護的計數，摘要資訊直接由它讀取。
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._columns = {}
+        self.live = LiveAggregates(store)
+        store.add_listener(self._on_change)
+
+    def _on_change(self, event):
+        for kind, columns in list(self._columns.items()):
+            if not columns.on_change(event):
+                del self._columns[kind]
+
+    def table(self, kind):
+        """取得某類記錄的欄式資料表（必要時重建）"""
+        columns = self._columns.get(kind)
+        if columns is None:
+            date_field, value_field, text_fields = TABLE_FIELDS[kind]
+            columns = self._columns[kind] = RecordColumns(self.store, kind, date_field, value_field, text_fields)
+        return columns.table
+
+    def invalidate(self):
+        """捨棄所有資料表，下次統計時重建
+
+        經由 RecordStore 方法的異動（包括 load_records 延遲載入）都會發出通知並自動更新，
+        只有直接修改 store 中的記錄物件或員工資料、沒有發出通知時才需要呼叫。
+        """
+        self._columns.clear()
+
+    def leave_days_by_employee_type_year(self, status=None):
+        """每位員工每年各假別的請假天數"""
+        where = {'status': status} if status else None
+        return self.table('leave_requests').group_sum(['employee', 'year', 'leave_type'], 'days', where)
+
+    def leave_days_by_department_month(self, status=None):
+        """各部門每月請假天數"""
+        where = {'status': status} if status else None
+        return self.table('leave_requests').group_sum(['department', 'month'], 'days', where)
+
+    def approved_leave_days_by_employee_year(self, status=None):
+        """每位員工每年已核准的請假天數（即時計數，不受 status 影響）"""
+        live = self.live
+        return sorted(((employee_id, str(year)), days, live.approved_leave_counts.get((employee_id, year), 0))
+                      for (employee_id, year), days in live.approved_leave_days.items())
+
+    def overtime_hours_by_department_month(self, status=None):
+        """各部門每月加班時數"""
+        where = {'status': status} if status else None
+        return self.table('overtime_requests').group_sum(['department', 'month'], 'hours', where)
+
+    def overtime_hours_by_employee_month(self, status=None):
+        """每位員工每月加班時數"""
+        where = {'status': status} if status else None
+        return self.table('overtime_requests').group_sum(['employee', 'month'], 'hours', where)
+
+
+# 統計頁籤可選的報表：(名稱, Analytics 方法, 分組欄位標題, 數值欄位標題)
+REPORTS = (
+    ("各部門每月加班時數", 'overtime_hours_by_department_month', ("部門", "月份"), "加班時數"),
+    ("各員工每月加班時數", 'overtime_hours_by_employee_month', ("員工編號", "月份"), "加班時數"),
+    ("各員工每年各假別請假天數", 'leave_days_by_employee_type_year', ("員工編號", "年度", "請假類型"), "請假天數"),
+    ("各部門每月請假天數", 'leave_days_by_department_month', ("部門", "月份"), "請假天數"),
+    ("各員工每年已核准請假天數", 'approved_leave_days_by_employee_year', ("員工編號", "年度"), "已核准天數"),
+)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+異動日誌與自動儲存模組
+每次異動只在日誌檔尾端追加一行，背景執行緒定期把日誌壓縮成快照，
+程式異常結束後可由「快照 + 日誌」還原資料
+"""
+
+import json
+import os
+import threading
+import time
+
+from record_store import RECORD_KINDS, RECORD_ID_FIELD, new_employee_entry
+from record_types import to_json
+
+
+SNAPSHOT_FILE = 'snapshot.json'
+JOURNAL_FILE = 'journal.jsonl'
+
+
+def _locate(records, entry):
+    """找出日誌所指的記錄位置（舊版日誌以 index 指定）"""
+    if 'record_id' not in entry:
+        return entry['index']
+    for i, record in enumerate(records):
+        if record.get(RECORD_ID_FIELD) == entry['record_id']:
+            return i
+    return None
+
+
+def apply_change(employees, entry):
+    """將一筆日誌套用到 employees 字典（還原與壓縮共用）"""
+    op = entry['op']
+
+    if op == 'load':
+        employees.clear()
+        employees.update(entry['employees'])
+    elif op == 'clear':
+        employees.clear()
+    elif op == 'extend':
+        employees.update(entry['employees'])
+    elif op == 'put_employee':
+        employee_id, old_id = entry['employee_id'], entry.get('old_id')
+        if old_id and old_id in employees:
+            employees[employee_id] = employees.pop(old_id)
+        employees.setdefault(employee_id, new_employee_entry())['basic_info'] = entry['basic_info']
+    elif op == 'put_employees':
+        for employee_id, basic_info in entry['employees']:
+            employees.setdefault(employee_id, new_employee_entry())['basic_info'] = basic_info
+    elif op == 'delete_employee':
+        employees.pop(entry['employee_id'], None)
+    elif op == 'add_record':
+        employee = employees[entry['employee_id']]
+        employee.setdefault(entry['kind'], []).append(entry['record'])
+    elif op in ('update_record', 'delete_record'):
+        records = employees[entry['employee_id']][entry['kind']]
+        index = _locate(records, entry)
+        if index is None:
+            return
+        if op == 'update_record':
+            records[index] = entry['record']
+        else:
+            del records[index]
+
+
+def _journal_entry(event):
+    """將 RecordStore 異動事件轉成可重播的日誌內容"""
+    op = event['op']
+    entry = {'op': op}
+    if op in ('load', 'extend'):
+        entry['employees'] = event['employees']
+    elif op == 'put_employee':
+        entry.update(employee_id=event['employee_id'], old_id=event['old_id'],
+                     basic_info=event['basic_info'])
+    elif op == 'put_employees':
+        entry['employees'] = event['employees']
+    elif op == 'delete_employee':
+        entry['employee_id'] = event['employee_id']
+    elif op == 'add_record':
+        entry.update(kind=event['kind'], employee_id=event['employee_id'], record=event['record'])
+    elif op == 'update_record':
+        entry.update(kind=event['kind'], employee_id=event['employee_id'],
+                     record_id=event['key'], record=event['record'])
+    elif op == 'delete_record':
+        entry.update(kind=event['kind'], employee_id=event['employee_id'], record_id=event['key'])
+    elif op != 'clear':
+        return None
+    return entry
+
+
+class ChangeJournal:
+    """異動日誌
+
+    - record_change：RecordStore 異動監聽器，每次異動追加一行 JSON
+    - start_autosave：啟動背景執行緒，有異動時定期壓縮成快照
+    - recover：讀取快照並重播日誌，取回上次的資料
+
+    每行日誌帶有遞增序號，快照記錄已包含的最後序號，
+    壓縮過程中任何時間點中斷，重播時都不會重複套用。
+    """
+
+    def __init__(self, directory, interval=30):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.rotated_path = self.journal_path + '.old'
+
+        self.dirty = False
+        self._seq = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # === 還原 ===
+    def _read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return 0, {}
+        with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        return snapshot.get('last_seq', 0), snapshot.get('employees', {})
+
+    @staticmethod
+    def _replay(path, employees, last_seq):
+        """重播日誌檔中序號大於 last_seq 的異動，回傳最後序號"""
+        if not os.path.exists(path):
+            return last_seq
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 最後一行可能因中斷而不完整
+                    break
+                if entry['seq'] <= last_seq:
+                    continue
+                apply_change(employees, entry)
+                last_seq = entry['seq']
+        return last_seq
+
+    def _write_snapshot(self, last_seq, employees):
+        """先寫入暫存檔再以 os.replace 原子性地取代快照"""
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'last_seq': last_seq, 'employees': employees}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    @staticmethod
+    def _max_seq(path):
+        """檔案中出現過的最大序號（損毀的內容略過）"""
+        last_seq = 0
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    seq = entry.get('seq', entry.get('last_seq', 0))
+                    if isinstance(seq, int):
+                        last_seq = max(last_seq, seq)
+        return last_seq
+
+    def _set_aside(self):
+        """還原失敗時把快照與日誌改名保留，回傳改名後的路徑
+
+        之後的異動從空白重新記錄，序號接續檔案中出現過的最大值，
+        新的日誌不會被誤認為已套用過的舊異動。
+        """
+        suffix = time.strftime('.broken-%Y%m%d-%H%M%S')
+        last_seq = self._seq
+        moved = []
+        for path in (self.snapshot_path, self.rotated_path, self.journal_path):
+            if os.path.exists(path):
+                last_seq = max(last_seq, self._max_seq(path))
+                os.replace(path, path + suffix)
+                moved.append(path + suffix)
+        self._seq = last_seq
+        return moved
+
+    def recover(self):
+        """讀取快照並重播尚未壓縮的日誌，回傳還原後的 employees
+
+        讀取或重播失敗時，原檔案改名保留（見 _set_aside）後再拋出例外。
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            return self._recover()
+        except Exception:
+            self._set_aside()
+            raise
+
+    def _recover(self):
+        snapshot_seq, employees = self._read_snapshot()
+        last_seq = snapshot_seq
+        for path in (self.rotated_path, self.journal_path):
+            last_seq = self._replay(path, employees, last_seq)
+        self._seq = last_seq
+
+        # 有重播到異動時，先併入快照再開始新的日誌
+        if last_seq != snapshot_seq:
+            self._write_snapshot(last_seq, employees)
+        for path in (self.rotated_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        for employee_data in employees.values():
+            for kind in RECORD_KINDS:
+                employee_data.setdefault(kind, [])
+        return employees
+
+    # === 寫入 ===
+    def open(self):
+        """開啟日誌檔準備追加"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+    def record_change(self, event):
+        """RecordStore 異動監聽器：追加一行日誌"""
+        entry = _journal_entry(event)
+        if entry is None:
+            return
+        with self._lock:
+            if self._file is None:
+                return
+            self._seq += 1
+            entry['seq'] = self._seq
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':'),
+                                        default=to_json) + '\n')
+            self._file.flush()
+            self.dirty = True
+
+    # === 壓縮 ===
+    def compact(self):
+        """將日誌壓縮進快照（可在背景執行緒呼叫）"""
+        with self._compact_lock:
+            # 上一次壓縮失敗留下的舊日誌要先處理，避免被覆蓋
+            if not os.path.exists(self.rotated_path):
+                with self._lock:
+                    if not self.dirty or self._file is None:
+                        return False
+                    # 換一個新的日誌檔，主執行緒可以繼續追加
+                    self._file.close()
+                    os.replace(self.journal_path, self.rotated_path)
+                    self._file = open(self.journal_path, 'a', encoding='utf-8')
+                    self.dirty = False
+
+            last_seq, employees = self._read_snapshot()
+            last_seq = self._replay(self.rotated_path, employees, last_seq)
+            self._write_snapshot(last_seq, employees)
+            os.remove(self.rotated_path)
+            return True
+
+    def _autosave_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"❌ 自動儲存失敗: {e}")
+
+    def start_autosave(self):
+        """啟動背景自動儲存執行緒"""
+        self.open()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._autosave_loop, name='autosave', daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """停止自動儲存，並做最後一次壓縮"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.compact()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def discard(self):
+        """停止記錄並刪除所有自動儲存檔案"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.dirty = False
+            self._seq = 0
+            for path in (self.journal_path, self.rotated_path, self.snapshot_path):
+                if os.path.exists(path):
+                    os.remove(path)
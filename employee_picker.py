@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+員工選擇元件
+可輸入文字的員工選單：輸入時以共用的員工搜尋索引篩選，
+下拉清單在第一次開啟時才建立，且只放入捲動到的範圍，員工再多也不必產生全部選項
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+
+# 輸入後等待多久才篩選（毫秒），連續輸入時只篩選一次
+FILTER_DELAY_MS = 120
+
+# 下拉清單每次放入的選項數量，捲動到底時再放入下一批
+PAGE_SIZE = 50
+
+# 下拉清單顯示的列數
+VISIBLE_ROWS = 10
+
+
+def employee_label(store, employee_id):
+    """選單中顯示的文字：「員工編號 - 姓名」"""
+    return f"{employee_id} - {store.employee_name(employee_id)}"
+
+
+class EmployeePicker(ttk.Entry):
+    """可輸入篩選的員工選單
+
+    所有選單共用同一個 EmployeeSearchIndex，不再各自保存完整的員工清單。
+    輸入的字串延長時（使用者接著輸入），只在上一次的結果中繼續篩選。
+    選定員工時發出 <<EmployeePicked>> 事件；employee_id() 取得目前選定的員工編號，
+    文字清空時為 None（篩選條件中代表全部員工）。
+    """
+
+    def __init__(self, master, store, search_index, width=20, **kwargs):
+        self.var = tk.StringVar()
+        super().__init__(master, textvariable=self.var, width=width, **kwargs)
+        self.store = store
+        self.search_index = search_index
+
+        self._employee_id = None
+        self._matches = []
+        self._shown = 0
+        self._last_query = None
+        self._filter_after_id = None
+        self._popup = None
+        self._listbox = None
+
+        self.bind('<KeyRelease>', self._on_key_release)
+        self.bind('<Down>', lambda e: self._move(1))
+        self.bind('<Up>', lambda e: self._move(-1))
+        self.bind('<Return>', self._on_return)
+        self.bind('<Escape>', lambda e: self._close())
+        self.bind('<FocusOut>', lambda e: self.after(150, self._on_focus_out))
+        self.bind('<Destroy>', self._on_destroy, add='+')
+
+    # === 選定的員工 ===
+    def employee_id(self):
+        """目前選定的員工編號；輸入的文字恰為某位員工的編號時也視為選定"""
+        text = self.var.get().strip()
+        if not text:
+            return None
+        if self._employee_id is not None and text == employee_label(self.store, self._employee_id):
+            return self._employee_id
+        employee_id = text.split(' - ')[0]
+        return employee_id if employee_id in self.store.employees else None
+
+    def set_employee(self, employee_id):
+        """選定員工（None 表示清空）"""
+        if employee_id not in self.store.employees:
+            employee_id = None
+        self._employee_id = employee_id
+        self.var.set(employee_label(self.store, employee_id) if employee_id is not None else '')
+        self.icursor(tk.END)
+
+    def refresh(self):
+        """員工資料異動後更新顯示的姓名，並捨棄上一次的篩選結果"""
+        self._last_query = None
+        if self._employee_id is not None:
+            if self._employee_id in self.store.employees:
+                self.var.set(employee_label(self.store, self._employee_id))
+            else:
+                self.set_employee(None)
+        if self._is_open():
+            self._filter()
+
+    def _pick(self, employee_id):
+        self.set_employee(employee_id)
+        self._close()
+        self.event_generate('<<EmployeePicked>>')
+
+    # === 篩選 ===
+    def _query(self):
+        """要搜尋的字串：顯示的是已選定員工時列出全部員工"""
+        text = self.var.get()
+        if self._employee_id is not None and text == employee_label(self.store, self._employee_id):
+            return ''
+        return text
+
+    def _filter(self):
+        self._filter_after_id = None
+        query = self._query()
+        last = self._last_query
+        if last and query.casefold().startswith(last.casefold()):
+            self._matches = self.search_index.search(query, within=self._matches)
+        else:
+            self._matches = self.search_index.search(query)
+        self._last_query = query
+        self._open()
+
+    def _schedule_filter(self):
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(FILTER_DELAY_MS, self._filter)
+
+    def _on_key_release(self, event):
+        if event.keysym in ('Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab',
+                            'Left', 'Right', 'Home', 'End', 'Shift_L', 'Shift_R',
+                            'Control_L', 'Control_R', 'Alt_L', 'Alt_R'):
+            return
+        if not self.var.get().strip():
+            # 清空文字即取消選定
+            self._employee_id = None
+        self._schedule_filter()
+
+    # === 下拉清單 ===
+    def _is_open(self):
+        return self._popup is not None and self._popup.winfo_viewable()
+
+    def _create_popup(self):
+        """第一次開啟時才建立下拉清單"""
+        self._popup = tk.Toplevel(self)
+        self._popup.withdraw()
+        self._popup.overrideredirect(True)
+        scrollbar = ttk.Scrollbar(self._popup, orient=tk.VERTICAL)
+        self._listbox = tk.Listbox(self._popup, height=VISIBLE_ROWS, exportselection=False,
+                                   takefocus=0, activestyle='none')
+        self._listbox.configure(yscrollcommand=lambda first, last: self._on_list_scroll(scrollbar, first, last))
+        scrollbar.configure(command=self._listbox.yview)
+        self._listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._listbox.bind('<ButtonPress-1>', self._on_list_click)
+
+    def _open(self):
+        if self._popup is None:
+            self._create_popup()
+        self._listbox.delete(0, tk.END)
+        self._shown = 0
+        self._show_more()
+        if self._shown:
+            self._listbox.selection_set(0)
+            self._listbox.activate(0)
+
+        self.update_idletasks()
+        self._popup.geometry(f"{self.winfo_width()}x{self._listbox.winfo_reqheight()}"
+                             f"+{self.winfo_rootx()}+{self.winfo_rooty() + self.winfo_height()}")
+        self._popup.deiconify()
+        self._popup.lift()
+
+    def _show_more(self):
+        """放入下一批選項"""
+        page = self._matches[self._shown:self._shown + PAGE_SIZE]
+        if page:
+            self._listbox.insert(tk.END, *(employee_label(self.store, employee_id) for employee_id in page))
+            self._shown += len(page)
+
+    def _on_list_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        if float(last) >= 1.0 and self._shown < len(self._matches):
+            self._show_more()
+
+    def _close(self):
+        if self._popup is not None:
+            self._popup.withdraw()
+
+    def _move(self, step):
+        """以方向鍵移動下拉清單中的選取"""
+        if not self._is_open():
+            self._filter()
+            return 'break'
+        selection = self._listbox.curselection()
+        index = (selection[0] + step) if selection else 0
+        if index >= self._shown - 1:
+            self._show_more()
+        index = max(0, min(index, self._shown - 1))
+        self._listbox.selection_clear(0, tk.END)
+        self._listbox.selection_set(index)
+        self._listbox.activate(index)
+        self._listbox.see(index)
+        return 'break'
+
+    def _on_return(self, event):
+        if self._is_open():
+            selection = self._listbox.curselection()
+            if selection:
+                self._pick(self._matches[selection[0]])
+        return 'break'
+
+    def _on_list_click(self, event):
+        index = self._listbox.nearest(event.y)
+        if 0 <= index < self._shown:
+            self._pick(self._matches[index])
+            self.focus_set()
+        return 'break'
+
+    def _on_focus_out(self):
+        """離開輸入框時關閉清單，未選定員工的文字還原為原本選定的員工"""
+        if not self.winfo_exists() or self.focus_get() in (self, self._listbox):
+            return
+        self._close()
+        if self.var.get().strip() and self.employee_id() is None:
+            self.set_employee(self._employee_id)
+
+    def _on_destroy(self, event):
+        if event.widget is self and self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+            self._filter_after_id = None
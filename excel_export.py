@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 匯出模組
+將員工資料快照匯出成「基本資料／考績／請假／加班」四個工作表，
+匯出過程以產生器逐段回報進度，可在背景執行緒執行並隨時取消；
+活頁簿採 write-only 模式逐列寫出，資料量再大記憶體用量也不會跟著成長
+"""
+
+import os
+from itertools import chain, islice
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+
+from excel_handler import display_width
+
+
+# 每寫入多少列回報一次進度
+PROGRESS_EVERY = 1000
+
+# 活頁簿共用的具名樣式
+HEADER_STYLE = 'export_header'
+CELL_STYLE = 'export_cell'
+
+# 欄寬上限
+MAX_COLUMN_WIDTH = 40
+
+# 以前幾列資料估算欄寬（write-only 工作表必須在寫出第一列前設定欄寬）
+WIDTH_SAMPLE_ROWS = 2000
+
+BASIC_INFO_HEADERS = [
+    "員工編號", "姓名", "身分證字號", "性別", "出生日期", "聯絡電話", "電子郵件",
+    "緊急聯絡人", "緊急聯絡人電話", "戶籍地址", "通訊地址",
+    "部門", "職位", "職級", "到職日期", "直屬主管", "工作地點", "僱用類型", "薪資等級"
+]
+PERFORMANCE_HEADERS = ["員工編號", "姓名", "年度", "上半年考績", "下半年考績", "年度總評", "備註"]
+LEAVE_HEADERS = ["員工編號", "姓名", "請假類型", "開始日期", "結束日期", "請假天數", "申請日期", "狀態", "請假事由"]
+OVERTIME_HEADERS = ["員工編號", "姓名", "加班日期", "開始時間", "結束時間", "加班時數", "加班類型", "申請日期", "狀態", "加班事由"]
+
+# 各工作表欄位對應的資料欄位（與上方標題順序相同，匯入時也依此對應）
+BASIC_INFO_FIELDS = [
+    "employee_id", "name", "id_number", "gender", "birth_date", "phone", "email",
+    "emergency_contact", "emergency_phone", "address", "mailing_address",
+    "department", "position", "job_level", "hire_date", "supervisor", "work_location", "employment_type", "salary_grade"
+]
+# 記錄工作表的前兩欄固定為員工編號、姓名
+PERFORMANCE_FIELDS = ["year", "first_half", "second_half", "annual_rating", "remarks"]
+LEAVE_FIELDS = ["leave_type", "start_date", "end_date", "days", "apply_date", "status", "reason"]
+OVERTIME_FIELDS = ["overtime_date", "start_time", "end_time", "hours", "overtime_type", "apply_date", "status", "reason"]
+
+
+def basic_info_rows(employees):
+    for emp_id, data in employees.items():
+        info = data.get('basic_info', {})
+        yield [emp_id] + [info.get(field, "") for field in BASIC_INFO_FIELDS[1:]]
+
+
+def record_rows(kind, fields):
+    """產生某類記錄工作表的資料列函式"""
+    def rows(employees):
+        for emp_id, emp_data in employees.items():
+            name = emp_data.get("basic_info", {}).get("name", "")
+            for record in emp_data.get(kind, []):
+                yield [emp_id, name] + [record.get(field, "") for field in fields]
+    return rows
+
+
+performance_rows = record_rows('performance_records', PERFORMANCE_FIELDS)
+leave_rows = record_rows('leave_requests', LEAVE_FIELDS)
+overtime_rows = record_rows('overtime_requests', OVERTIME_FIELDS)
+
+
+# (工作表名稱, 標題, 資料列產生函式, 記錄類別)
+EXPORT_SHEETS = (
+    ("員工基本資料", BASIC_INFO_HEADERS, basic_info_rows, None),
+    ("考績管理", PERFORMANCE_HEADERS, performance_rows, 'performance_records'),
+    ("請假管理", LEAVE_HEADERS, leave_rows, 'leave_requests'),
+    ("加班管理", OVERTIME_HEADERS, overtime_rows, 'overtime_requests'),
+)
+
+# 工作表名稱 -> (記錄類別, 標題 -> 資料欄位)；記錄類別為 None 表示基本資料
+SHEET_FIELDS = {
+    "員工基本資料": (None, dict(zip(BASIC_INFO_HEADERS, BASIC_INFO_FIELDS))),
+    "考績管理": ('performance_records', dict(zip(PERFORMANCE_HEADERS[2:], PERFORMANCE_FIELDS))),
+    "請假管理": ('leave_requests', dict(zip(LEAVE_HEADERS[2:], LEAVE_FIELDS))),
+    "加班管理": ('overtime_requests', dict(zip(OVERTIME_HEADERS[2:], OVERTIME_FIELDS))),
+}
+
+
+def count_rows(employees):
+    """計算匯出的資料列總數（用於進度條）"""
+    total = 0
+    for _, _, _, kind in EXPORT_SHEETS:
+        if kind is None:
+            total += len(employees)
+        else:
+            total += sum(len(data.get(kind, [])) for data in employees.values())
+    return total
+
+
+def register_styles(wb):
+    """在活頁簿註冊標題與資料儲存格的具名樣式，所有儲存格共用同一組樣式"""
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    header = NamedStyle(name=HEADER_STYLE)
+    header.font = Font(bold=True, color="FFFFFF")
+    header.fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+    header.alignment = Alignment(horizontal="center", vertical="center")
+    header.border = border
+    wb.add_named_style(header)
+
+    cell = NamedStyle(name=CELL_STYLE)
+    cell.border = border
+    wb.add_named_style(cell)
+
+
+def measure_widths(headers, data_rows):
+    """依標題與資料列計算各欄寬度（全形字元算兩個字寬）"""
+    widths = [display_width(header) for header in headers]
+    for row_data in data_rows:
+        for col, value in enumerate(row_data):
+            if value:
+                width = display_width(value)
+                if width > widths[col]:
+                    widths[col] = width
+    return [min(width + 2, MAX_COLUMN_WIDTH) for width in widths]
+
+
+def styled_cells(ws, count, style):
+    """建立一列套用具名樣式的 write-only 儲存格
+
+    write-only 工作表在 append 時就把整列寫出，
+    因此同一組儲存格可以換上新值後重複使用，不必每個值都建立新物件。
+    """
+    cells = []
+    for _ in range(count):
+        cell = WriteOnlyCell(ws)
+        cell.style = style
+        cells.append(cell)
+    return cells
+
+
+def fill_cells(cells, values):
+    for cell, value in zip(cells, values):
+        cell.value = value
+    return cells
+
+
+def write_styled_sheet(ws, headers, make_rows, progress_every=PROGRESS_EVERY):
+    """寫入標題和資料, 標題有顏色，凍結首列，加上filter，自動欄寬
+
+    ws 為 write-only 工作表，欄寬必須在第一列寫出前設定，
+    因此先取出前 WIDTH_SAMPLE_ROWS 列估算欄寬，再接著寫出全部資料列，
+    資料只產生一次，暫存的列數也有上限。
+    此為產生器：每寫入 progress_every 列就產出一次本段寫入的列數。
+    """
+    rows = iter(make_rows())
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+
+    # 自動欄寬
+    for col, width in enumerate(measure_widths(headers, sample), 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+    # 凍結首列
+    ws.freeze_panes = "A2"
+
+    # 標題列
+    ws.append(fill_cells(styled_cells(ws, len(headers), HEADER_STYLE), headers))
+
+    # 資料列
+    cells = styled_cells(ws, len(headers), CELL_STYLE)
+    row_count = 0
+    pending = 0
+    for row_data in chain(sample, rows):
+        ws.append(fill_cells(cells, row_data))
+        row_count += 1
+        pending += 1
+        if pending == progress_every:
+            yield pending
+            pending = 0
+    if pending:
+        yield pending
+
+    # filter
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{row_count + 1}"
+
+
+def export_workbook(employees, file_path, cancel_event=None):
+    """將員工資料匯出成 Excel
+
+    此為產生器，逐段產出 (已寫入列數, 總列數, 說明文字)。
+    cancel_event 被設定時立即停止，不會留下寫到一半的檔案；
+    檔案先寫入暫存檔，完成後才取代目標檔案。
+    """
+    total = count_rows(employees)
+    done = 0
+
+    wb = openpyxl.Workbook(write_only=True)
+    register_styles(wb)
+
+    for title, headers, rows_of, _ in EXPORT_SHEETS:
+        ws = wb.create_sheet(title)
+        yield done, total, f"正在寫入「{title}」..."
+        for written in write_styled_sheet(ws, headers, lambda: rows_of(employees)):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            done += written
+            yield done, total, f"正在寫入「{title}」（{done}/{total}）..."
+
+    if cancel_event is not None and cancel_event.is_set():
+        return
+    yield done, total, "正在儲存檔案..."
+    tmp_path = file_path + '.tmp'
+    try:
+        wb.save(tmp_path)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
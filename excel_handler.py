@@ -7,7 +7,10 @@ Excel處理模組
 
 import os
 import sys
+import time
+import unicodedata
 from datetime import datetime, date
+from functools import lru_cache
 
 # 設置套件路徑
 def setup_environment():
@@ -19,24 +22,204 @@ def setup_environment():
 
 setup_environment()
 
-try:
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-    from openpyxl.worksheet.datavalidation import DataValidation
-    from openpyxl.formatting.rule import ColorScaleRule
-    print("✅ Excel處理模組載入成功")
-except ImportError as e:
-    print(f"❌ Excel處理模組載入失敗: {e}")
-    raise
+# openpyxl 載入需要數百毫秒，改在第一次建立 ExcelHandler 時才載入
+openpyxl = None
+Font = PatternFill = Alignment = Border = Side = NamedStyle = None
+get_column_letter = DataValidation = ColorScaleRule = FormulaRule = None
+
+# Excel 工作表的最大列數，條件格式涵蓋整欄，使用者日後新增的列也會套用
+EXCEL_MAX_ROW = 1048576
+
+# 條件格式：欄位標題 -> ((符合的值, 具名樣式), ...)
+CONDITIONAL_FORMATS = {
+    "狀態": ((("已核准", "Approved"), 'highlight_green'),
+             (("已拒絕", "Rejected"), 'highlight_red'),
+             (("待審核", "Pending"), 'highlight_yellow')),
+    "考績": ((("優", "Excellent"), 'highlight_green'),
+             (("差", "Poor"), 'highlight_red')),
+}
+CONDITIONAL_FORMATS["Status"] = CONDITIONAL_FORMATS["狀態"]
+CONDITIONAL_FORMATS["Performance"] = CONDITIONAL_FORMATS["年度總評"] = CONDITIONAL_FORMATS["考績"]
+
+
+def load_openpyxl(quiet=False):
+    """載入 openpyxl 及本模組使用的類別（只在第一次呼叫時實際載入）
+
+    quiet=True 時不顯示載入成功的訊息（批次匯入的每個子行程都會呼叫）。
+    """
+    global openpyxl, Font, PatternFill, Alignment, Border, Side, NamedStyle
+    global get_column_letter, DataValidation, ColorScaleRule, FormulaRule
+    if openpyxl is not None:
+        return
+    try:
+        import openpyxl as module
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+        from openpyxl.utils import get_column_letter
+        from openpyxl.worksheet.datavalidation import DataValidation
+        from openpyxl.formatting.rule import ColorScaleRule, FormulaRule
+        openpyxl = module
+        if not quiet:
+            print("✅ Excel處理模組載入成功")
+    except ImportError as e:
+        print(f"❌ Excel處理模組載入失敗: {e}")
+        raise
+
+
+@lru_cache(maxsize=65536)
+def text_display_width(text):
+    """字串在 Excel 中的顯示寬度：全形（中日韓）字元算 2，多行文字取最寬的一行"""
+    lines = text.splitlines() if '\n' in text or '\r' in text else (text,)
+    if text.isascii():
+        return max(map(len, lines), default=0)
+    east_asian_width = unicodedata.east_asian_width
+    return max((sum(2 if east_asian_width(ch) in ('W', 'F') else 1 for ch in line) for line in lines),
+               default=0)
+
+
+def display_width(value):
+    """儲存格內容的顯示寬度（空白儲存格為 0）"""
+    if value is None:
+        return 0
+    return text_display_width(value if isinstance(value, str) else str(value))
+
+
+# 表頭 -> 欄位鍵值
+HEADER_FIELDS = {
+    # 基本資料
+    "員工編號": "employee_id",
+    "姓名": "name",
+    "身分證字號": "id_number",
+    "性別": "gender",
+    "出生日期": "birth_date",
+    "聯絡電話": "phone",
+    "電子郵件": "email",
+    "緊急聯絡人": "emergency_contact",
+    "緊急聯絡人電話": "emergency_phone",
+    "戶籍地址": "address",
+    "通訊地址": "mailing_address",
+    "部門": "department",
+    "職位": "position",
+    "職級": "job_level",
+    "到職日期": "hire_date",
+    "直屬主管": "supervisor",
+    "工作地點": "work_location",
+    "僱用類型": "employment_type",
+    "薪資等級": "salary_grade",
+    
+    # 考績資料
+    "年度": "year",
+    "上半年考績": "first_half",
+    "下半年考績": "second_half",
+    "年度總評": "annual_rating",
+    "備註": "remarks",
+    
+    # 出勤資料
+    "日期": "date",
+    "上班時間": "start_time",
+    "下班時間": "end_time",
+    "工作時數": "hours",
+    "狀態": "status",
+    
+    # 請假資料
+    "請假類型": "leave_type",
+    "開始日期": "start_date",
+    "結束日期": "end_date",
+    "請假天數": "days",
+    "申請日期": "apply_date",
+    "請假事由": "reason",
+    
+    # 加班資料
+    "加班日期": "overtime_date",
+    "加班時數": "hours",
+    "加班類型": "overtime_type",
+    "加班事由": "reason"
+}
+
+
+def field_key_from_header(header):
+    """根據表頭獲取欄位鍵值，不在對照表中的表頭轉成小寫並以底線取代空白"""
+    return HEADER_FIELDS.get(header, header.lower().replace(" ", "_").replace("*", ""))
+
+
+def cell_text(value):
+    """儲存格的值轉成字串：日期轉成 YYYY-MM-DD，其他值去除前後空白（空白或 0 視為空字串）"""
+    if type(value) is str:
+        return value.strip()
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return str(value).strip() if value else ""
+
+
+class RowMapper:
+    """由標題列編譯出的資料列轉換器
+
+    每個工作表只建立一次：預先算好各欄位索引對應的欄位鍵值，
+    之後每一列只需依序以 cell_text 轉換，不必再逐格查表。
+    呼叫 mapper(row) 回傳記錄字典，整列都是空值時回傳 None。
+    """
+
+    def __init__(self, header_row):
+        self.headers = [str(cell).strip() if cell is not None else f"Column_{i}"
+                        for i, cell in enumerate(header_row)]
+        self.field_keys = [field_key_from_header(header) for header in self.headers]
+
+    def __call__(self, row):
+        record = {field_key: cell_text(value) if value is not None else ""
+                  for value, field_key in zip(row, self.field_keys)}
+        if any(record.values()):
+            return record
+        return None
+
+
+class ExcelChunks:
+    """分批讀取的記錄，負責關閉唯讀活頁簿
+
+    產生器在第一次 next() 之前被關閉或捨棄時不會執行它的 finally，
+    因此由這個物件在讀完、close()、離開 with 區塊或被回收時關閉活頁簿。
+    """
+
+    def __init__(self, workbook, chunks):
+        self._workbook = workbook
+        self._chunks = chunks
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._workbook is None:
+            raise StopIteration
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """關閉活頁簿，之後不再產生記錄"""
+        workbook, self._workbook = self._workbook, None
+        if workbook is not None:
+            self._chunks.close()
+            workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        self.close()
 
 
 class ExcelHandler:
     """Excel處理類別"""
     
     def __init__(self):
+        load_openpyxl()
         self.workbook = None
         self.current_sheet = None
+        # 工作表 -> {欄號: 最寬內容的顯示寬度}，寫入時隨時更新，設定欄寬時不必再掃描整張表
+        self.column_widths = {}
         
         # 預設樣式定義
         self.styles = {
@@ -64,18 +247,47 @@ class ExcelHandler:
             }
         }
     
+    def compile_named_styles(self):
+        """將 self.styles 編譯成 NamedStyle
+
+        highlight_* 只定義底色，以 data 樣式為基礎再加上底色，
+        與先套用 data 再套用 highlight 的結果相同。
+        NamedStyle 註冊後會綁定到工作簿，因此每個工作簿各自編譯一份。
+        """
+        named_styles = {}
+        for name, style_dict in self.styles.items():
+            if name.startswith('highlight_'):
+                style_dict = dict(self.styles['data'], **style_dict)
+            named_style = NamedStyle(name=name)
+            for attr in ('font', 'fill', 'alignment', 'border'):
+                if attr in style_dict:
+                    setattr(named_style, attr, style_dict[attr])
+            named_styles[name] = named_style
+        return named_styles
+    
+    def register_named_styles(self, workbook):
+        """在工作簿中註冊尚未存在的具名樣式，儲存格只需以名稱套用"""
+        existing = set(workbook.named_styles)
+        if existing.issuperset(self.styles):
+            return
+        for name, named_style in self.compile_named_styles().items():
+            if name not in existing:
+                workbook.add_named_style(named_style)
+    
     def create_workbook(self):
         """創建新的工作簿"""
         self.workbook = openpyxl.Workbook()
         # 移除預設工作表
         if 'Sheet' in self.workbook.sheetnames:
             self.workbook.remove(self.workbook['Sheet'])
+        self.register_named_styles(self.workbook)
         return self.workbook
     
     def load_workbook(self, file_path):
         """載入現有工作簿"""
         try:
             self.workbook = openpyxl.load_workbook(file_path)
+            self.register_named_styles(self.workbook)
             return self.workbook
         except Exception as e:
             raise Exception(f"載入Excel檔案失敗: {str(e)}")
@@ -92,7 +304,9 @@ class ExcelHandler:
         # 寫入標題行
         for col, header in enumerate(headers, 1):
             cell = worksheet.cell(row=1, column=col, value=header)
-            self.apply_style(cell, self.styles['header'])
+            cell.style = 'header'
+            self.track_width(worksheet, col, header)
+        self.add_conditional_formatting(worksheet, headers)
         
         # 寫入資料
         if data:
@@ -105,24 +319,44 @@ class ExcelHandler:
     
     def write_data_to_sheet(self, worksheet, data, headers):
         """將資料寫入工作表"""
+        self.register_named_styles(worksheet.parent)
+        self.add_conditional_formatting(worksheet, headers)
+        widths = self.column_widths.setdefault(worksheet, {})
+        # 根據標題找對應的資料鍵值（每個標題只查一次）
+        columns = [(col, field_key_from_header(header)) for col, header in enumerate(headers, 1)]
         for row_num, record in enumerate(data, 2):  # 從第2行開始
-            for col, header in enumerate(headers, 1):
-                # 根據標題找對應的資料鍵值
-                field_key = self.get_field_key_from_header(header)
+            for col, field_key in columns:
                 value = record.get(field_key, "")
                 
                 # 處理日期格式
                 if isinstance(value, (date, datetime)):
                     value = value.strftime("%Y-%m-%d")
                 
+                # 狀態、考績的底色由工作表的條件格式規則決定
                 cell = worksheet.cell(row=row_num, column=col, value=value)
-                self.apply_style(cell, self.styles['data'])
+                cell.style = 'data'
                 
-                # 根據內容應用條件格式
-                self.apply_conditional_formatting(cell, header, value)
+                width = display_width(value)
+                if width > widths.get(col, 0):
+                    widths[col] = width
+        
+        self.apply_column_widths(worksheet)
+    
+    def track_width(self, worksheet, col, value):
+        """記錄寫入某欄的內容寬度"""
+        widths = self.column_widths.setdefault(worksheet, {})
+        width = display_width(value)
+        if width > widths.get(col, 0):
+            widths[col] = width
+    
+    def apply_column_widths(self, worksheet):
+        """依寫入時記錄的內容寬度設定欄寬（最小10，最大50）"""
+        for col, max_length in self.column_widths.get(worksheet, {}).items():
+            adjusted_width = min(max(max_length + 2, 10), 50)
+            worksheet.column_dimensions[get_column_letter(col)].width = adjusted_width
     
     def apply_style(self, cell, style_dict):
-        """應用樣式到儲存格"""
+        """應用樣式到儲存格（逐一設定字型、底色等屬性；一般寫入請以具名樣式套用）"""
         if 'font' in style_dict:
             cell.font = style_dict['font']
         if 'fill' in style_dict:
@@ -132,40 +366,61 @@ class ExcelHandler:
         if 'border' in style_dict:
             cell.border = style_dict['border']
     
+    def add_conditional_formatting(self, worksheet, headers):
+        """為狀態、考績欄位加入工作表層級的條件格式規則
+
+        每種底色一條規則，涵蓋標題列以下的整欄；由 Excel 依儲存格內容上色，
+        寫入時不必逐格設定底色，使用者日後修改內容顏色也會跟著改變。
+        工作表上（包括從檔案載入的）同一範圍已有相同公式的規則時不再重複加入。
+        """
+        for col, header in enumerate(headers, 1):
+            formats = CONDITIONAL_FORMATS.get(header)
+            if not formats:
+                continue
+            
+            column_letter = get_column_letter(col)
+            cell_range = f"{column_letter}2:{column_letter}{EXCEL_MAX_ROW}"
+            existing = self.conditional_formulas(worksheet, cell_range)
+            for values, style_name in formats:
+                # 公式以範圍左上角的儲存格撰寫，Excel 會依相對位置套用到每一格
+                conditions = ",".join(f'{column_letter}2="{value}"' for value in values)
+                formula = f"OR({conditions})"
+                if formula in existing:
+                    continue
+                rule = FormulaRule(formula=[formula], fill=self.styles[style_name]['fill'])
+                worksheet.conditional_formatting.add(cell_range, rule)
+    
+    @staticmethod
+    def conditional_formulas(worksheet, cell_range):
+        """工作表上某個範圍已有的條件格式公式"""
+        formulas = set()
+        for conditional_format in worksheet.conditional_formatting:
+            if str(conditional_format.sqref) == cell_range:
+                for rule in conditional_format.rules:
+                    formulas.update(rule.formula or ())
+        return formulas
+    
+    def conditional_style_name(self, header, value):
+        """依欄位與內容決定條件格式的具名樣式，不需特別標示時回傳 None"""
+        for values, style_name in CONDITIONAL_FORMATS.get(header, ()):
+            if value in values:
+                return style_name
+        return None
+    
     def apply_conditional_formatting(self, cell, header, value):
         """應用條件格式"""
-        if header in ["狀態", "Status"]:
-            if value == "已核准" or value == "Approved":
-                self.apply_style(cell, self.styles['highlight_green'])
-            elif value == "已拒絕" or value == "Rejected":
-                self.apply_style(cell, self.styles['highlight_red'])
-            elif value == "待審核" or value == "Pending":
-                self.apply_style(cell, self.styles['highlight_yellow'])
-        
-        elif header in ["考績", "Performance", "年度總評"]:
-            if value == "優" or value == "Excellent":
-                self.apply_style(cell, self.styles['highlight_green'])
-            elif value == "差" or value == "Poor":
-                self.apply_style(cell, self.styles['highlight_red'])
+        style_name = self.conditional_style_name(header, value)
+        if style_name:
+            self.register_named_styles(cell.parent.parent)
+            cell.style = style_name
     
     def format_sheet(self, worksheet, num_cols, num_rows):
         """格式化工作表"""
-        # 自動調整欄寬
+        # 自動調整欄寬：使用寫入時記錄的內容寬度，沒有記錄的欄位使用最小寬度
+        widths = self.column_widths.setdefault(worksheet, {})
         for col in range(1, num_cols + 1):
-            max_length = 0
-            column_letter = get_column_letter(col)
-            
-            for row in range(1, num_rows + 1):
-                cell = worksheet.cell(row=row, column=col)
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            # 設定欄寬（最小10，最大50）
-            adjusted_width = min(max(max_length + 2, 10), 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+            widths.setdefault(col, 0)
+        self.apply_column_widths(worksheet)
         
         # 凍結首列
         worksheet.freeze_panes = 'A2'
@@ -206,11 +461,12 @@ class ExcelHandler:
         for row_num, row_data in enumerate(summary_data, 1):
             for col_num, value in enumerate(row_data, 1):
                 cell = summary_sheet.cell(row=row_num, column=col_num, value=value)
+                self.track_width(summary_sheet, col_num, value)
                 
                 if row_num == 1:  # 標題行
-                    self.apply_style(cell, self.styles['header'])
+                    cell.style = 'header'
                 else:
-                    self.apply_style(cell, self.styles['data'])
+                    cell.style = 'data'
         
         # 格式化摘要表
         self.format_sheet(summary_sheet, 3, len(summary_data))
@@ -229,13 +485,13 @@ class ExcelHandler:
             # 寫入考績統計
             start_row = 8
             worksheet.cell(row=start_row, column=1, value="考績統計")
-            self.apply_style(worksheet.cell(row=start_row, column=1), self.styles['header'])
+            worksheet.cell(row=start_row, column=1).style = 'header'
             
             for i, (grade, count) in enumerate(performance_stats.items(), 1):
                 worksheet.cell(row=start_row + i, column=1, value=grade)
                 worksheet.cell(row=start_row + i, column=2, value=count)
-                self.apply_style(worksheet.cell(row=start_row + i, column=1), self.styles['data'])
-                self.apply_style(worksheet.cell(row=start_row + i, column=2), self.styles['data'])
+                worksheet.cell(row=start_row + i, column=1).style = 'data'
+                worksheet.cell(row=start_row + i, column=2).style = 'data'
         
         # 出勤統計
         if data_dict.get('attendance_records'):
@@ -243,13 +499,13 @@ class ExcelHandler:
             
             start_row = 15
             worksheet.cell(row=start_row, column=1, value="出勤統計")
-            self.apply_style(worksheet.cell(row=start_row, column=1), self.styles['header'])
+            worksheet.cell(row=start_row, column=1).style = 'header'
             
             for i, (status, count) in enumerate(attendance_stats.items(), 1):
                 worksheet.cell(row=start_row + i, column=1, value=status)
                 worksheet.cell(row=start_row + i, column=2, value=count)
-                self.apply_style(worksheet.cell(row=start_row + i, column=1), self.styles['data'])
-                self.apply_style(worksheet.cell(row=start_row + i, column=2), self.styles['data'])
+                worksheet.cell(row=start_row + i, column=1).style = 'data'
+                worksheet.cell(row=start_row + i, column=2).style = 'data'
     
     def calculate_performance_stats(self, performance_data):
         """計算考績統計"""
@@ -269,64 +525,23 @@ class ExcelHandler:
     
     def get_field_key_from_header(self, header):
         """根據表頭獲取欄位鍵值"""
-        header_mapping = {
-            # 基本資料
-            "員工編號": "employee_id",
-            "姓名": "name",
-            "身分證字號": "id_number",
-            "性別": "gender",
-            "出生日期": "birth_date",
-            "聯絡電話": "phone",
-            "電子郵件": "email",
-            "緊急聯絡人": "emergency_contact",
-            "緊急聯絡人電話": "emergency_phone",
-            "戶籍地址": "address",
-            "通訊地址": "mailing_address",
-            "部門": "department",
-            "職位": "position",
-            "職級": "job_level",
-            "到職日期": "hire_date",
-            "直屬主管": "supervisor",
-            "工作地點": "work_location",
-            "僱用類型": "employment_type",
-            "薪資等級": "salary_grade",
-            
-            # 考績資料
-            "年度": "year",
-            "上半年考績": "first_half",
-            "下半年考績": "second_half",
-            "年度總評": "annual_rating",
-            "備註": "remarks",
-            
-            # 出勤資料
-            "日期": "date",
-            "上班時間": "start_time",
-            "下班時間": "end_time",
-            "工作時數": "hours",
-            "狀態": "status",
-            
-            # 請假資料
-            "請假類型": "leave_type",
-            "開始日期": "start_date",
-            "結束日期": "end_date",
-            "請假天數": "days",
-            "申請日期": "apply_date",
-            "請假事由": "reason",
-            
-            # 加班資料
-            "加班日期": "overtime_date",
-            "加班時數": "hours",
-            "加班類型": "overtime_type",
-            "加班事由": "reason"
-        }
-        
-        return header_mapping.get(header, header.lower().replace(" ", "_").replace("*", ""))
+        return field_key_from_header(header)
     
-    def read_excel_data(self, file_path, sheet_name=None):
-        """讀取Excel資料"""
+    def read_excel_data(self, file_path, sheet_name=None, chunk_size=None):
+        """讀取Excel資料
+
+        以唯讀模式開啟活頁簿，標題列編譯成 RowMapper 後逐列轉換。
+        chunk_size 為 None 時一次讀完，回傳 {'headers', 'data', 'sheet_name'}；
+        指定 chunk_size 時改為產生器模式，回傳 {'headers', 'chunks', 'sheet_name'}，
+        chunks 為 ExcelChunks，每次產生最多 chunk_size 筆記錄；讀完、呼叫 close()、
+        離開 with 區塊或物件被回收時關閉活頁簿（即使一批都還沒讀取）。
+        """
+        try:
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        except Exception as e:
+            raise Exception(f"讀取Excel資料時發生錯誤: {str(e)}")
+        
         try:
-            workbook = openpyxl.load_workbook(file_path, data_only=True)
-            
             if sheet_name:
                 if sheet_name not in workbook.sheetnames:
                     raise Exception(f"工作表 '{sheet_name}' 不存在")
@@ -334,39 +549,37 @@ class ExcelHandler:
             else:
                 worksheet = workbook.active
             
-            # 讀取資料
-            data = []
-            headers = []
-            
-            for row_num, row in enumerate(worksheet.iter_rows(values_only=True), 1):
-                if row_num == 1:
-                    headers = [str(cell).strip() if cell is not None else f"Column_{i}" 
-                              for i, cell in enumerate(row)]
-                else:
-                    if any(cell is not None for cell in row):
-                        row_data = {}
-                        for i, cell in enumerate(row):
-                            if i < len(headers):
-                                field_key = self.get_field_key_from_header(headers[i])
-                                value = cell if cell is not None else ""
-                                
-                                # 處理日期格式
-                                if isinstance(value, datetime):
-                                    value = value.strftime("%Y-%m-%d")
-                                elif isinstance(value, date):
-                                    value = value.strftime("%Y-%m-%d")
-                                
-                                row_data[field_key] = str(value).strip() if value else ""
-                        
-                        if any(row_data.values()):  # 如果行中有任何非空值
-                            data.append(row_data)
-            
-            return {
-                'headers': headers,
-                'data': data,
+            rows = worksheet.iter_rows(values_only=True)
+            mapper = RowMapper(next(rows, ()))
+            result = {
+                'headers': mapper.headers,
                 'sheet_name': worksheet.title
             }
+            if chunk_size:
+                result['chunks'] = ExcelChunks(workbook, self._iter_chunks(rows, mapper, chunk_size))
+                return result
             
+            result['data'] = [record for record in map(mapper, rows) if record is not None]
+            workbook.close()
+            return result
+        
+        except Exception as e:
+            workbook.close()
+            raise Exception(f"讀取Excel資料時發生錯誤: {str(e)}")
+    
+    def _iter_chunks(self, rows, mapper, chunk_size):
+        """逐批產生轉換後的記錄"""
+        try:
+            chunk = []
+            for row in rows:
+                record = mapper(row)
+                if record is not None:
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+            if chunk:
+                yield chunk
         except Exception as e:
             raise Exception(f"讀取Excel資料時發生錯誤: {str(e)}")
     
@@ -488,6 +701,98 @@ def create_excel_template(template_type="employee", output_path="template.xlsx")
     return True
 
 
+# 批次匯入時視為 Excel 活頁簿的副檔名
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def find_workbooks(source):
+    """資料夾（不含子資料夾）或萬用字元路徑中的 Excel 檔案，依檔名排序；略過 Excel 開啟中產生的 ~$ 暫存檔"""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        import glob
+        paths = glob.glob(source, recursive=True)
+    return sorted(path for path in paths
+                  if os.path.isfile(path) and path.lower().endswith(EXCEL_EXTENSIONS)
+                  and not os.path.basename(path).startswith('~$'))
+
+
+def read_workbook_task(file_path, sheet_name=None):
+    """批次匯入中單一檔案的工作（在子行程中執行），回傳 (資料或 None, 錯誤訊息或 None, 秒數)"""
+    start = time.perf_counter()
+    try:
+        result = ExcelHandler().read_excel_data(file_path, sheet_name)
+        return result, None, time.perf_counter() - start
+    except Exception as e:
+        return None, str(e), time.perf_counter() - start
+
+
+def bulk_read_excel(source, sheet_name=None, max_workers=None):
+    """批次讀取多個 Excel 檔案，並依員工編號合併記錄
+
+    source 為資料夾或萬用字元路徑（例如 "分公司/**/*.xlsx"）；
+    各檔案交給行程池平行解析（max_workers 預設為 CPU 核心數），
+    合併時依檔名順序，同一位員工的記錄保持原本的先後順序。
+    回傳：
+    - employees：{員工編號: [記錄, ...]}
+    - files：[{'path', 'sheet_name', 'rows', 'skipped', 'seconds', 'error'}, ...]（依檔名排序）
+    - seconds：整批耗時
+    沒有員工編號的資料列無法合併，只計入該檔案的 skipped。
+    """
+    start = time.perf_counter()
+    paths = find_workbooks(source)
+    outcomes = {}
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        # 只有一個檔案或單核心時不必啟動子行程
+        for path in paths:
+            outcomes[path] = read_workbook_task(path, sheet_name)
+    else:
+        # 行程池只在批次匯入時才需要，不在模組載入時匯入
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        # 子行程啟動時先安靜地載入 openpyxl，各檔案的耗時不含載入模組的時間
+        with ProcessPoolExecutor(max_workers=workers, initializer=load_openpyxl, initargs=(True,)) as executor:
+            futures = {executor.submit(read_workbook_task, path, sheet_name): path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    outcomes[path] = future.result()
+                except Exception as e:
+                    # 子行程異常結束等無法取得結果的情況
+                    outcomes[path] = (None, str(e), 0.0)
+    
+    employees = {}
+    files = []
+    for path in paths:
+        result, error, seconds = outcomes[path]
+        report = {'path': path, 'sheet_name': None, 'rows': 0, 'skipped': 0,
+                  'seconds': seconds, 'error': error}
+        if result is not None:
+            report['sheet_name'] = result['sheet_name']
+            for record in result['data']:
+                employee_id = record.get('employee_id')
+                if employee_id:
+                    employees.setdefault(employee_id, []).append(record)
+                    report['rows'] += 1
+                else:
+                    report['skipped'] += 1
+        files.append(report)
+        
+        if error:
+            print(f"❌ {os.path.basename(path)}：{error}")
+        else:
+            skipped = f"（略過 {report['skipped']} 筆無員工編號）" if report['skipped'] else ""
+            print(f"✅ {os.path.basename(path)}：{report['rows']} 筆{skipped}，{seconds * 1000:.0f} ms")
+    
+    return {
+        'employees': employees,
+        'files': files,
+        'seconds': time.perf_counter() - start
+    }
+
+
 # 測試用主程式
 if __name__ == "__main__":
     print("Excel處理模組測試")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 串流匯入模組
+以唯讀模式逐列讀取工作表，每次只保留一批資料在記憶體中，
+檔案再大，讀取時占用的記憶體也有固定上限；
+由本系統匯出的多工作表檔案則可完整還原員工基本資料與各類記錄
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, date
+
+import openpyxl
+
+from excel_export import SHEET_FIELDS
+from record_store import new_employee_entry
+
+
+# 每批交給主執行緒處理的列數
+IMPORT_BATCH_SIZE = 500
+
+
+def cell_text(value):
+    """將儲存格的日期轉成系統使用的 YYYY-MM-DD 字串，其他值維持原樣"""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def iter_employee_batches(file_path, cancel_event=None, batch_size=IMPORT_BATCH_SIZE):
+    """逐批讀取作用中工作表的員工基本資料
+
+    第一列為欄位名稱，之後每列轉成 {欄位名稱: 值}，以 employee_id 欄為員工編號。
+    每批產出 (rows, processed, total)：
+    rows 為 [(employee_id, basic_info), ...]，processed 為已讀取的資料列數，
+    total 為工作表記載的資料列數（檔案未記載時為 None）。
+    """
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        max_row = ws.max_row
+        total = max_row - 1 if isinstance(max_row, int) and max_row > 1 else None
+
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+
+        batch = []
+        processed = 0
+        for row in rows:
+            processed += 1
+            employee_data = {key: cell_text(value) for key, value in zip(header, row)}
+            emp_id = str(employee_data.get('employee_id') or '').strip()
+            if emp_id:
+                batch.append((emp_id, employee_data))
+
+            if processed % batch_size == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield batch, processed, total
+                batch = []
+
+        if batch or processed % batch_size:
+            yield batch, processed, total
+    finally:
+        # 唯讀模式會一直開著檔案，必須明確關閉
+        wb.close()
+
+
+# === 多工作表完整匯入 ===
+def is_full_export(file_path):
+    """檔案是否為本系統匯出的格式（含「員工基本資料」工作表）"""
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        return "員工基本資料" in wb.sheetnames
+    finally:
+        wb.close()
+
+
+def parse_sheet(file_path, sheet_name):
+    """讀取匯出格式的一個工作表，回傳 [(employee_id, 資料), ...]
+
+    在子行程中執行，因此必須是模組層級函式，回傳值也只含基本型別。
+    依標題列對應欄位，欄位順序變動或缺少欄位都不影響；沒有員工編號的列會略過。
+    """
+    kind, field_map = SHEET_FIELDS[sheet_name]
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return []
+
+        id_col = list(header).index("員工編號") if "員工編號" in header else None
+        if id_col is None:
+            return []
+        columns = [(col, field_map[title]) for col, title in enumerate(header) if title in field_map]
+
+        result = []
+        for row in rows:
+            emp_id = str(row[id_col] if id_col < len(row) and row[id_col] is not None else '').strip()
+            if not emp_id:
+                continue
+            data = {}
+            for col, field in columns:
+                value = cell_text(row[col]) if col < len(row) else None
+                data[field] = '' if value is None else value
+            if kind is None:
+                data['employee_id'] = emp_id
+            result.append((emp_id, data))
+        return result
+    finally:
+        wb.close()
+
+
+def join_sheets(parsed):
+    """以員工編號合併各工作表的結果，parsed 為 {工作表名稱: [(employee_id, 資料), ...]}
+
+    員工順序依「員工基本資料」工作表；只出現在記錄工作表的員工仍會建立，
+    基本資料只帶員工編號。
+    """
+    employees = {}
+    for emp_id, basic_info in parsed.get("員工基本資料", []):
+        employees[emp_id] = new_employee_entry(basic_info)
+
+    for sheet_name, (kind, _) in SHEET_FIELDS.items():
+        if kind is None:
+            continue
+        for emp_id, record in parsed.get(sheet_name, []):
+            employee = employees.get(emp_id)
+            if employee is None:
+                employee = employees[emp_id] = new_employee_entry({'employee_id': emp_id})
+            employee[kind].append(record)
+    return employees
+
+
+def iter_full_import(file_path, cancel_event=None, max_workers=None):
+    """以多個行程同時解析各工作表，全部完成後合併
+
+    此為產生器：每完成一個工作表產出 ('sheet', 已完成數, 總數, 工作表名稱)，
+    最後產出 ('result', employees)。取消時尚未開始的工作表不會再解析。
+    """
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        sheet_names = [name for name in wb.sheetnames if name in SHEET_FIELDS]
+    finally:
+        wb.close()
+
+    parsed = {}
+    executor = ProcessPoolExecutor(max_workers=max_workers or len(sheet_names))
+    try:
+        futures = {executor.submit(parse_sheet, file_path, name): name for name in sheet_names}
+        for future in as_completed(futures):
+            name = futures[future]
+            parsed[name] = future.result()
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield 'sheet', len(parsed), len(sheet_names), name
+    finally:
+        # 取消或發生錯誤時不等待仍在執行的工作表
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    yield 'result', join_sheets(parsed)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 編解碼模組
+寫入時有安裝 orjson 或 ujson 就使用較快的套件，否則使用標準函式庫 json；
+讀取則以逐筆解析員工資料的串流方式進行（標準函式庫的 C 解析器），
+不必一次把整個檔案讀進記憶體，也能隨時取消
+"""
+
+import json
+
+try:
+    import orjson
+    BACKEND = 'orjson'
+except ImportError:
+    orjson = None
+    try:
+        import ujson
+        BACKEND = 'ujson'
+    except ImportError:
+        ujson = None
+        BACKEND = 'json'
+
+
+# 串流讀取每次讀入的字元數
+STREAM_CHUNK_SIZE = 1 << 16
+
+# 可能接在數字後面、仍屬於同一個數字的字元
+NUMBER_CHARS = frozenset('.eE0123456789+-')
+
+
+def dumps(obj, compact=True):
+    """編碼成 UTF-8 bytes；compact=False 時縮排兩格方便閱讀
+
+    非字串的鍵（例如 Excel 標題列空白欄位產生的 None）與標準函式庫 json 一樣轉成字串；
+    較快的套件無法編碼的內容（例如超過 64 位元的整數）改用標準函式庫編碼。
+    """
+    try:
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if not compact:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, option=option)
+        if BACKEND == 'ujson':
+            return ujson.dumps(obj, ensure_ascii=False, indent=0 if compact else 2).encode('utf-8')
+    except (TypeError, OverflowError):
+        pass
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def dump_file(obj, file_path, compact=True):
+    """將資料寫入 JSON 檔案"""
+    with open(file_path, 'wb') as f:
+        f.write(dumps(obj, compact))
+
+
+def _skip_whitespace(buffer, pos):
+    while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+        pos += 1
+    return pos
+
+
+def iter_object_items(file_path, chunk_size=STREAM_CHUNK_SIZE):
+    """逐一產出最外層 JSON 物件的 (鍵, 值)
+
+    每次只讀入一段檔案，解析完一個值就產出並捨棄已處理的部分，
+    員工資料檔（{employee_id: {...}, ...}）因此可以一位一位地載入。
+    值本身以標準函式庫的 C 解析器解碼；值跨越讀入範圍時會再多讀一段重試。
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+        pos = _skip_whitespace(buffer, 0)
+
+        def fill(pos):
+            # 捨棄已處理的部分並多讀一段
+            nonlocal buffer, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer = buffer[pos:] + chunk
+            return 0
+
+        while pos >= len(buffer) and not eof:
+            pos = fill(pos)
+        if pos >= len(buffer) or buffer[pos] != '{':
+            raise ValueError("JSON 檔案最外層必須是物件")
+        pos += 1
+
+        expect_comma = False
+        while True:
+            # 分隔符號與結尾
+            while True:
+                pos = _skip_whitespace(buffer, pos)
+                if pos < len(buffer) or eof:
+                    break
+                pos = fill(pos)
+            if pos >= len(buffer):
+                raise ValueError("JSON 檔案不完整")
+            if buffer[pos] == '}':
+                return
+            if expect_comma:
+                if buffer[pos] != ',':
+                    raise ValueError("JSON 格式錯誤：應為 ','")
+                pos += 1
+                expect_comma = False
+                continue
+
+            # 鍵、冒號、值必須完整位於緩衝區內，否則多讀一段重試
+            try:
+                key, end = decoder.raw_decode(buffer, pos)
+                end = _skip_whitespace(buffer, end)
+                if end >= len(buffer) and not eof:
+                    raise json.JSONDecodeError("incomplete", buffer, end)
+                if end >= len(buffer) or buffer[end] != ':':
+                    raise ValueError("JSON 格式錯誤：應為 ':'")
+                value, end = decoder.raw_decode(buffer, _skip_whitespace(buffer, end + 1))
+                # 數字可能被截斷在緩衝區結尾，例如 "-25000000000." 只讀到小數點，
+                # raw_decode 會成功解出較短的數字；後面緊接著數字的一部分時也要多讀一段重試
+                if not eof and (end >= len(buffer) or buffer[end] in NUMBER_CHARS):
+                    raise json.JSONDecodeError("incomplete", buffer, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                pos = fill(pos)
+                continue
+
+            yield key, value
+            pos = end
+            expect_comma = True
+
+
+def iter_object_batches(file_path, batch_size=200, cancel_event=None):
+    """以 {鍵: 值} 字典為單位，一批一批產出最外層物件的內容"""
+    batch = {}
+    for key, value in iter_object_items(file_path):
+        batch[key] = value
+        if len(batch) >= batch_size:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield batch
+            batch = {}
+    if batch:
+        yield batch
@@ -10,7 +10,24 @@ from tkinter import ttk, messagebox, filedialog
 import os
 import sys
 from datetime import datetime, date
-import json
+import time
+
+# 啟動計時起點（各階段耗時於視窗顯示後輸出）
+STARTUP_T0 = time.perf_counter()
+
+from record_store import RecordStore, RECORD_KINDS
+from sqlite_storage import SQLiteStorage
+from change_journal import ChangeJournal
+from virtual_tree import VirtualTreeview, sync_tree_rows
+from task_runner import ProgressDialog, BackgroundTask
+import json_codec
+from analytics import Analytics, REPORTS
+from record_types import format_number
+from search_index import EmployeeSearchIndex
+from employee_picker import EmployeePicker
+from record_sort import SortKeyCache, SortedPagedView, EMPLOYEE_ID, EMPLOYEE_NAME
+from refresh_scheduler import RefreshScheduler
+from prewarm import prewarm
 
 # 設置套件路徑
 def setup_environment():
@@ -23,26 +40,73 @@ def setup_environment():
 
 setup_environment()
 
-try:
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    print("✅ openpyxl 載入成功")
-except ImportError as e:
-    messagebox.showerror("錯誤", f"無法載入 openpyxl: {e}")
-    sys.exit(1)
+# openpyxl（excel_import、excel_export）與 NumPy 在第一次使用時才載入，
+# 視窗顯示後再於背景預先載入，縮短啟動時間
+
+# 搜尋框停止輸入多久後才開始搜尋（毫秒）
+SEARCH_DELAY_MS = 150
+
+
+class StartupTimer:
+    """記錄啟動各階段的耗時"""
+
+    def __init__(self, start=None):
+        self.start = self.last = time.perf_counter() if start is None else start
+        self.steps = []
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.steps.append((label, now - self.last))
+        self.last = now
+
+    def report(self):
+        parts = "、".join(f"{label} {seconds * 1000:.0f} ms" for label, seconds in self.steps)
+        print(f"⏱️ 啟動完成，共 {(self.last - self.start) * 1000:.0f} ms（{parts}）")
+
 
 class EmployeeFormSystem:
-    def __init__(self, root):
+    def __init__(self, root, startup_timer=None):
         self.root = root
+        self.startup_timer = startup_timer or StartupTimer()
         self.root.title("員工表單系統 v2.0")
         self.root.geometry("1400x900")
         
-        # 資料儲存 - 改為管理多個員工
-        self.employees_data = {}  # {employee_id: {basic_info: {}, performance_records: [], attendance_records: []}}
+        # 資料儲存 - 改為管理多個員工，所有異動透過 store 進行以維護索引
+        self.store = RecordStore()
+        self.employees_data = self.store.employees  # {employee_id: {basic_info: {}, performance_records: [], leave_requests: [], overtime_requests: []}}
+        # 請假／加班統計（欄式資料表，資料有異動才重建；摘要計數即時維護）
+        self.analytics = Analytics(self.store)
+        # 畫面刷新：資料異動只標記受影響的畫面，閒置時每個畫面重繪一次
+        self.views = RefreshScheduler(self.root)
+        self.store.add_listener(self.on_store_change)
+        # 員工搜尋索引（第一次搜尋時建立，之後隨異動增量更新）
+        self.search_index = EmployeeSearchIndex(self.store)
+        self.search_after_id = None
         self.current_employee_id = None
         
+        # 選用的 SQLite 資料庫，開啟後每次異動都會立即寫入
+        self.database = None
+        # 頁籤 -> 該頁籤顯示的記錄類別，用於依需要從資料庫載入
+        self.tab_record_kinds = {}
+        # 尚未建立內容的頁籤 -> (頁籤框架, 建立函式)，第一次切換到該頁籤時才建立
+        self.tab_builders = {}
+        # 各頁籤中的員工選單（頁籤建立後才加入），共用同一個搜尋索引
+        self.employee_pickers = []
+        # 儲存 JSON 時不縮排，檔案較小、寫入較快
+        self.compact_json = True
+        # 視窗顯示後在背景預先載入 openpyxl 等較慢的模組
+        self.prewarm_imports = True
+        
         # 建立GUI
         self.create_widgets()
+        self.startup_timer.mark("建立介面")
+        
+        # 異動日誌：每次異動即時追加，背景定期壓縮成快照，啟動時自動還原
+        self.journal = ChangeJournal(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'autosave'))
+        self.restore_autosave()
+        self.startup_timer.mark("還原資料")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after_idle(self.report_startup)
         
     def create_widgets(self):
         """建立主要界面"""
@@ -63,21 +127,73 @@ class EmployeeFormSystem:
         ttk.Button(toolbar_frame, text="🗑️ 清空資料", command=self.clear_all_data).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(toolbar_frame, text="💾 儲存資料", command=self.save_data).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(toolbar_frame, text="📂 載入資料", command=self.load_data).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(toolbar_frame, text="🗄️ 開啟資料庫", command=self.open_database).pack(side=tk.LEFT, padx=(0, 5))
         
         # 分頁控件
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # 建立各個頁籤
-        self.create_employee_management_tab()
-        self.create_performance_management_tab()
-        self.create_attendance_management_tab()
-        
-    def create_employee_management_tab(self):
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        
+        # 建立各個頁籤：只先建立顯示中的頁籤，其餘在第一次切換到時才建立
+        self.emp_frame = self.add_lazy_tab(self.notebook, "👥 員工管理", self.create_employee_management_tab)
+        self.add_lazy_tab(self.notebook, "📊 考績管理", self.create_performance_management_tab)
+        self.att_frame = self.add_lazy_tab(self.notebook, "⏰ 出勤管理", self.create_attendance_management_tab)
+        self.stats_frame = self.add_lazy_tab(self.notebook, "📈 統計", self.create_statistics_tab)
+        self.register_views()
+        self.build_tab(self.notebook.select())
+        
+    def add_lazy_tab(self, notebook, text, builder):
+        """加入一個頁籤，內容由 builder(頁籤框架) 在第一次顯示時建立"""
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=text)
+        self.tab_builders[str(frame)] = (frame, builder)
+        return frame
+    
+    def build_tab(self, tab):
+        """建立尚未建立的頁籤內容"""
+        pending = self.tab_builders.pop(tab, None)
+        if pending is None:
+            return
+        frame, builder = pending
+        start = time.perf_counter()
+        builder(frame)
+        print(f"⏱️ 建立頁籤「{frame.master.tab(frame, 'text')}」：{(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    def report_startup(self):
+        """視窗第一次顯示後輸出啟動耗時"""
+        self.root.update_idletasks()
+        self.startup_timer.mark("顯示視窗")
+        self.startup_timer.report()
+        if self.prewarm_imports:
+            prewarm()
+        
+    def register_views(self):
+        """登記資料異動時需要刷新的畫面（表格只在所屬頁籤顯示時刷新）"""
+        self.views.register('employees', self.refresh_employee_tree,
+                            lambda: self.notebook.select() == str(self.emp_frame))
+        self.views.register('employee_pickers', self.refresh_employee_pickers,
+                            lambda: bool(self.visible_record_kinds()))
+        for kind in RECORD_KINDS:
+            self.views.register(kind, lambda kind=kind: self.refresh_record_view(kind),
+                                lambda kind=kind: kind in self.visible_record_kinds())
+        self.views.register('summary', self.update_statistics_summary,
+                            lambda: self.notebook.select() == str(self.stats_frame))
+        self.views.mark()
+    
+    def on_store_change(self, event):
+        """依異動種類標記受影響的畫面"""
+        op = event['op']
+        kind = event.get('kind')
+        if kind is not None:
+            self.views.mark(kind, 'summary')
+        elif op in ('put_employee', 'put_employees') and not event.get('old_id'):
+            # 員工姓名、部門顯示於請假／加班表格與統計摘要
+            self.views.mark('employees', 'employee_pickers', 'leave_requests', 'overtime_requests', 'summary')
+        else:
+            self.views.mark()
+        
+    def create_employee_management_tab(self, emp_frame):
         """建立員工管理頁籤"""
-        emp_frame = ttk.Frame(self.notebook)
-        self.notebook.add(emp_frame, text="👥 員工管理")
-        
         # 分割為左右兩個區域
         paned = ttk.PanedWindow(emp_frame, orient=tk.HORIZONTAL)
         paned.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -89,6 +205,19 @@ class EmployeeFormSystem:
         # 員工列表標題
         ttk.Label(left_frame, text="員工列表", font=("Arial", 12, "bold")).pack(pady=(0, 5))
         
+        # 搜尋列：員工編號、姓名、身分證字號、電話、部門，可用空白分隔多個關鍵字
+        search_frame = ttk.Frame(left_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        ttk.Label(search_frame, text="🔍").pack(side=tk.LEFT)
+        self.employee_search_var = tk.StringVar()
+        self.employee_search_var.trace_add('write', self.schedule_employee_search)
+        search_entry = ttk.Entry(search_frame, textvariable=self.employee_search_var)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        search_entry.bind('<Escape>', lambda e: self.employee_search_var.set(""))
+        self.employee_count_var = tk.StringVar()
+        ttk.Label(search_frame, textvariable=self.employee_count_var).pack(side=tk.LEFT)
+        
         # 員工列表
         list_frame = ttk.Frame(left_frame)
         list_frame.pack(fill=tk.BOTH, expand=True)
@@ -101,14 +230,16 @@ class EmployeeFormSystem:
             self.employee_tree.heading(col, text=col)
             self.employee_tree.column(col, width=100)
         
-        emp_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.employee_tree.yview)
-        self.employee_tree.configure(yscrollcommand=emp_scrollbar.set)
+        emp_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
         
         self.employee_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         emp_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # 虛擬列表：只建立可視範圍內的列
+        self.employee_view = VirtualTreeview(self.employee_tree, emp_scrollbar, self.employee_row_values)
+        
         # 綁定選擇事件
-        self.employee_tree.bind('<<TreeviewSelect>>', self.on_employee_select)
+        self.employee_tree.bind('<<VirtualTreeSelect>>', self.on_employee_select)
         
         # 員工操作按鈕
         emp_button_frame = ttk.Frame(left_frame)
@@ -221,23 +352,21 @@ class EmployeeFormSystem:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-    def create_performance_management_tab(self):
+    def create_performance_management_tab(self, perf_frame):
         """建立考績管理頁籤"""
-        perf_frame = ttk.Frame(self.notebook)
-        self.notebook.add(perf_frame, text="📊 考績管理")
+        self.tab_record_kinds[str(perf_frame)] = 'performance_records'
         
         # 上方：員工選擇
         selection_frame = ttk.LabelFrame(perf_frame, text="選擇員工", padding=5)
         selection_frame.pack(fill=tk.X, padx=5, pady=5)
         
         ttk.Label(selection_frame, text="員工：").pack(side=tk.LEFT, padx=5)
-        self.perf_employee_var = tk.StringVar()
-        self.perf_employee_combo = ttk.Combobox(selection_frame, textvariable=self.perf_employee_var, 
-                                              width=30, state="readonly")
-        self.perf_employee_combo.pack(side=tk.LEFT, padx=5)
-        self.perf_employee_combo.bind('<<ComboboxSelected>>', self.on_perf_employee_select)
+        self.perf_employee_picker = EmployeePicker(selection_frame, self.store, self.search_index, width=30)
+        self.perf_employee_picker.pack(side=tk.LEFT, padx=5)
+        self.perf_employee_picker.bind('<<EmployeePicked>>', self.on_perf_employee_select)
+        self.employee_pickers.append(self.perf_employee_picker)
         
-        ttk.Button(selection_frame, text="🔄 重新整理", command=self.refresh_employee_combos).pack(side=tk.LEFT, padx=10)
+        ttk.Button(selection_frame, text="🔄 重新整理", command=self.refresh_employee_pickers).pack(side=tk.LEFT, padx=10)
         
         # 中間：考績記錄列表
         history_frame = ttk.LabelFrame(perf_frame, text="考績記錄", padding=5)
@@ -245,6 +374,7 @@ class EmployeeFormSystem:
         
         perf_columns = ('年度', '上半年考績', '下半年考績', '年度總評', '備註')
         self.perf_tree = ttk.Treeview(history_frame, columns=perf_columns, show='headings', height=10)
+        self.perf_row_cache = {}
         
         for col in perf_columns:
             self.perf_tree.heading(col, text=col)
@@ -293,25 +423,22 @@ class EmployeeFormSystem:
         ttk.Button(perf_button_frame, text="✏️ 編輯考績", command=self.edit_performance).pack(side=tk.LEFT, padx=5)
         ttk.Button(perf_button_frame, text="🗑️ 刪除考績", command=self.delete_performance).pack(side=tk.LEFT, padx=5)
         
-    def create_attendance_management_tab(self):
+    def create_attendance_management_tab(self, att_frame):
         """建立出勤管理頁籤"""
-        att_frame = ttk.Frame(self.notebook)
-        self.notebook.add(att_frame, text="⏰ 出勤管理")
-        
         # 分成兩個子頁籤
-        att_notebook = ttk.Notebook(att_frame)
-        att_notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.att_notebook = ttk.Notebook(att_frame)
+        self.att_notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.att_notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
         # 請假管理頁籤
-        self.create_leave_management_tab(att_notebook)
+        self.add_lazy_tab(self.att_notebook, "🏖️ 請假管理", self.create_leave_management_tab)
         
         # 加班管理頁籤
-        self.create_overtime_management_tab(att_notebook)
+        self.add_lazy_tab(self.att_notebook, "⏰ 加班管理", self.create_overtime_management_tab)
         
-    def create_leave_management_tab(self, parent):
+    def create_leave_management_tab(self, leave_frame):
         """建立請假管理頁籤"""
-        leave_frame = ttk.Frame(parent)
-        parent.add(leave_frame, text="🏖️ 請假管理")
+        self.tab_record_kinds[str(leave_frame)] = 'leave_requests'
         
         # 上方：篩選區域
         filter_frame = ttk.LabelFrame(leave_frame, text="篩選條件", padding=5)
@@ -319,10 +446,9 @@ class EmployeeFormSystem:
         
         # 員工篩選
         ttk.Label(filter_frame, text="員工：").grid(row=0, column=0, padx=5, pady=2)
-        self.leave_employee_var = tk.StringVar()
-        self.leave_employee_combo = ttk.Combobox(filter_frame, textvariable=self.leave_employee_var, 
-                                               width=20, state="readonly")
-        self.leave_employee_combo.grid(row=0, column=1, padx=5, pady=2)
+        self.leave_employee_picker = EmployeePicker(filter_frame, self.store, self.search_index, width=20)
+        self.leave_employee_picker.grid(row=0, column=1, padx=5, pady=2)
+        self.employee_pickers.append(self.leave_employee_picker)
         
         # 狀態篩選
         ttk.Label(filter_frame, text="狀態：").grid(row=0, column=2, padx=5, pady=2)
@@ -339,19 +465,28 @@ class EmployeeFormSystem:
         leave_list_frame = ttk.LabelFrame(leave_frame, text="請假記錄", padding=5)
         leave_list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        leave_columns = ('員工編號', '員工姓名', '請假類型', '開始日期', '結束日期', '請假天數', '申請日期', '狀態', '備註')
+        # 欄位標題 -> 排序依據的欄位
+        leave_sort_fields = (('員工編號', EMPLOYEE_ID), ('員工姓名', EMPLOYEE_NAME), ('請假類型', 'leave_type'),
+                             ('開始日期', 'start_date'), ('結束日期', 'end_date'), ('請假天數', 'days'),
+                             ('申請日期', 'apply_date'), ('狀態', 'status'), ('備註', 'reason'))
+        leave_columns = tuple(heading for heading, _ in leave_sort_fields)
         self.leave_tree = ttk.Treeview(leave_list_frame, columns=leave_columns, show='headings', height=10)
         
         for col in leave_columns:
             self.leave_tree.heading(col, text=col)
             self.leave_tree.column(col, width=90)
         
-        leave_scrollbar = ttk.Scrollbar(leave_list_frame, orient=tk.VERTICAL, command=self.leave_tree.yview)
-        self.leave_tree.configure(yscrollcommand=leave_scrollbar.set)
+        leave_scrollbar = ttk.Scrollbar(leave_list_frame, orient=tk.VERTICAL)
+        leave_page_frame = ttk.Frame(leave_list_frame)
+        leave_page_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
         
         self.leave_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         leave_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        self.leave_view = SortedPagedView(
+            VirtualTreeview(self.leave_tree, leave_scrollbar, self.leave_row_values),
+            SortKeyCache(self.store, 'leave_requests'), leave_sort_fields, leave_page_frame)
+        
         # 下方：新增請假申請
         add_leave_frame = ttk.LabelFrame(leave_frame, text="新增請假申請", padding=10)
         add_leave_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -363,10 +498,9 @@ class EmployeeFormSystem:
         row1_frame.pack(fill=tk.X, pady=2)
         
         ttk.Label(row1_frame, text="員工*").grid(row=0, column=0, padx=5, pady=2, sticky=tk.W)
-        self.leave_emp_var = tk.StringVar()
-        self.leave_fields['employee'] = ttk.Combobox(row1_frame, textvariable=self.leave_emp_var, 
-                                                   width=15, state="readonly")
+        self.leave_fields['employee'] = EmployeePicker(row1_frame, self.store, self.search_index, width=15)
         self.leave_fields['employee'].grid(row=0, column=1, padx=5, pady=2)
+        self.employee_pickers.append(self.leave_fields['employee'])
         
         ttk.Label(row1_frame, text="請假類型*").grid(row=0, column=2, padx=5, pady=2, sticky=tk.W)
         self.leave_fields['leave_type'] = ttk.Combobox(row1_frame, width=15, state="readonly",
@@ -412,10 +546,9 @@ class EmployeeFormSystem:
         ttk.Button(leave_button_frame, text="✅ 核准", command=lambda: self.update_leave_status("已核准")).pack(side=tk.LEFT, padx=5)
         ttk.Button(leave_button_frame, text="❌ 拒絕", command=lambda: self.update_leave_status("已拒絕")).pack(side=tk.LEFT, padx=5)
         
-    def create_overtime_management_tab(self, parent):
+    def create_overtime_management_tab(self, overtime_frame):
         """建立加班管理頁籤"""
-        overtime_frame = ttk.Frame(parent)
-        parent.add(overtime_frame, text="⏰ 加班管理")
+        self.tab_record_kinds[str(overtime_frame)] = 'overtime_requests'
         
         # 上方：篩選區域
         filter_frame = ttk.LabelFrame(overtime_frame, text="篩選條件", padding=5)
@@ -423,10 +556,9 @@ class EmployeeFormSystem:
         
         # 員工篩選
         ttk.Label(filter_frame, text="員工：").grid(row=0, column=0, padx=5, pady=2)
-        self.overtime_employee_var = tk.StringVar()
-        self.overtime_employee_combo = ttk.Combobox(filter_frame, textvariable=self.overtime_employee_var,
-                                                  width=20, state="readonly")
-        self.overtime_employee_combo.grid(row=0, column=1, padx=5, pady=2)
+        self.overtime_employee_picker = EmployeePicker(filter_frame, self.store, self.search_index, width=20)
+        self.overtime_employee_picker.grid(row=0, column=1, padx=5, pady=2)
+        self.employee_pickers.append(self.overtime_employee_picker)
         
         # 狀態篩選
         ttk.Label(filter_frame, text="狀態：").grid(row=0, column=2, padx=5, pady=2)
@@ -443,19 +575,29 @@ class EmployeeFormSystem:
         overtime_list_frame = ttk.LabelFrame(overtime_frame, text="加班記錄", padding=5)
         overtime_list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        overtime_columns = ('員工編號', '員工姓名', '加班日期', '開始時間', '結束時間', '加班時數', '加班類型', '申請日期', '狀態', '備註')
+        # 欄位標題 -> 排序依據的欄位
+        overtime_sort_fields = (('員工編號', EMPLOYEE_ID), ('員工姓名', EMPLOYEE_NAME), ('加班日期', 'overtime_date'),
+                                ('開始時間', 'start_time'), ('結束時間', 'end_time'), ('加班時數', 'hours'),
+                                ('加班類型', 'overtime_type'), ('申請日期', 'apply_date'), ('狀態', 'status'),
+                                ('備註', 'reason'))
+        overtime_columns = tuple(heading for heading, _ in overtime_sort_fields)
         self.overtime_tree = ttk.Treeview(overtime_list_frame, columns=overtime_columns, show='headings', height=10)
         
         for col in overtime_columns:
             self.overtime_tree.heading(col, text=col)
             self.overtime_tree.column(col, width=85)
         
-        overtime_scrollbar = ttk.Scrollbar(overtime_list_frame, orient=tk.VERTICAL, command=self.overtime_tree.yview)
-        self.overtime_tree.configure(yscrollcommand=overtime_scrollbar.set)
+        overtime_scrollbar = ttk.Scrollbar(overtime_list_frame, orient=tk.VERTICAL)
+        overtime_page_frame = ttk.Frame(overtime_list_frame)
+        overtime_page_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
         
         self.overtime_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         overtime_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        self.overtime_view = SortedPagedView(
+            VirtualTreeview(self.overtime_tree, overtime_scrollbar, self.overtime_row_values),
+            SortKeyCache(self.store, 'overtime_requests'), overtime_sort_fields, overtime_page_frame)
+        
         # 下方：新增加班申請
         add_overtime_frame = ttk.LabelFrame(overtime_frame, text="新增加班申請", padding=10)
         add_overtime_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -467,10 +609,9 @@ class EmployeeFormSystem:
         ot_row1_frame.pack(fill=tk.X, pady=2)
         
         ttk.Label(ot_row1_frame, text="員工*").grid(row=0, column=0, padx=5, pady=2, sticky=tk.W)
-        self.overtime_emp_var = tk.StringVar()
-        self.overtime_fields['employee'] = ttk.Combobox(ot_row1_frame, textvariable=self.overtime_emp_var, 
-                                                      width=15, state="readonly")
+        self.overtime_fields['employee'] = EmployeePicker(ot_row1_frame, self.store, self.search_index, width=15)
         self.overtime_fields['employee'].grid(row=0, column=1, padx=5, pady=2)
+        self.employee_pickers.append(self.overtime_fields['employee'])
         
         ttk.Label(ot_row1_frame, text="加班日期*").grid(row=0, column=2, padx=5, pady=2, sticky=tk.W)
         self.overtime_fields['overtime_date'] = ttk.Entry(ot_row1_frame, width=12)
@@ -525,6 +666,99 @@ class EmployeeFormSystem:
         ttk.Button(overtime_button_frame, text="✅ 核准", command=lambda: self.update_overtime_status("已核准")).pack(side=tk.LEFT, padx=5)
         ttk.Button(overtime_button_frame, text="❌ 拒絕", command=lambda: self.update_overtime_status("已拒絕")).pack(side=tk.LEFT, padx=5)
     
+    def create_statistics_tab(self, stats_frame):
+        """建立統計頁籤"""
+        # 最上方：即時摘要（由即時計數直接讀取）
+        summary_frame = ttk.LabelFrame(stats_frame, text="即時摘要", padding=5)
+        summary_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.stats_summary_var = tk.StringVar()
+        ttk.Label(summary_frame, textvariable=self.stats_summary_var).pack(anchor=tk.W, pady=(0, 5))
+        
+        rating_columns = ('部門', '優', '良', '可', '差', '其他')
+        self.rating_tree = ttk.Treeview(summary_frame, columns=rating_columns, show='headings', height=4)
+        for col in rating_columns:
+            self.rating_tree.heading(col, text=col)
+            self.rating_tree.column(col, width=80)
+        self.rating_tree.pack(fill=tk.X)
+        self.rating_row_cache = {}
+        
+        # 上方：報表選擇
+        option_frame = ttk.LabelFrame(stats_frame, text="統計條件", padding=5)
+        option_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(option_frame, text="報表：").grid(row=0, column=0, padx=5, pady=2)
+        self.stats_report_var = tk.StringVar(value=REPORTS[0][0])
+        ttk.Combobox(option_frame, textvariable=self.stats_report_var, values=[report[0] for report in REPORTS],
+                     width=25, state="readonly").grid(row=0, column=1, padx=5, pady=2)
+        
+        ttk.Label(option_frame, text="狀態：").grid(row=0, column=2, padx=5, pady=2)
+        self.stats_status_var = tk.StringVar(value="已核准")
+        ttk.Combobox(option_frame, textvariable=self.stats_status_var, values=["全部", "待審核", "已核准", "已拒絕"],
+                     width=15, state="readonly").grid(row=0, column=3, padx=5, pady=2)
+        
+        ttk.Button(option_frame, text="📈 計算", command=self.refresh_statistics).grid(row=0, column=4, padx=10, pady=2)
+        self.stats_info_var = tk.StringVar()
+        ttk.Label(option_frame, textvariable=self.stats_info_var).grid(row=0, column=5, padx=5, pady=2)
+        
+        # 下方：統計結果
+        result_frame = ttk.LabelFrame(stats_frame, text="統計結果", padding=5)
+        result_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.stats_tree = ttk.Treeview(result_frame, show='headings', height=15)
+        stats_scrollbar = ttk.Scrollbar(result_frame, orient=tk.VERTICAL)
+        
+        self.stats_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        stats_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.stats_rows = []
+        self.stats_view = VirtualTreeview(self.stats_tree, stats_scrollbar,
+                                          lambda index: self.stats_rows[index] if index < len(self.stats_rows) else None)
+    
+    def update_statistics_summary(self):
+        """更新即時摘要：請假／加班各狀態筆數、各部門考績分布"""
+        live = self.analytics.live
+        
+        parts = []
+        for kind, label in (('leave_requests', "請假"), ('overtime_requests', "加班")):
+            counts = live.status_counts[kind]
+            parts.append(f"{label}：待審核 {counts.get('待審核', 0)} 筆、"
+                         f"已核准 {counts.get('已核准', 0)} 筆、已拒絕 {counts.get('已拒絕', 0)} 筆")
+        self.stats_summary_var.set("　　".join(parts))
+        
+        rows = []
+        for department in sorted(live.rating_distribution):
+            distribution = live.rating_distribution[department]
+            ratings = [distribution.get(rating, 0) for rating in ("優", "良", "可", "差")]
+            others = sum(distribution.values()) - sum(ratings)
+            rows.append((department, (department, *ratings, others)))
+        sync_tree_rows(self.rating_tree, rows, self.rating_row_cache)
+    
+    def refresh_statistics(self):
+        """依選擇的報表重新計算統計結果"""
+        # 延遲載入的記錄會發出 load_records 通知，統計資料表隨之更新
+        self.ensure_records_loaded('leave_requests', 'overtime_requests')
+        
+        title = self.stats_report_var.get()
+        status = self.stats_status_var.get()
+        _, method, group_headers, value_header = next(report for report in REPORTS if report[0] == title)
+        
+        start = time.perf_counter()
+        results = getattr(self.analytics, method)(None if status == "全部" else status)
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        # 先清空再換欄位，避免舊內容套到新欄位
+        self.stats_view.set_keys([])
+        columns = group_headers + (value_header, "筆數")
+        self.stats_tree.configure(columns=columns)
+        for col in columns:
+            self.stats_tree.heading(col, text=col)
+            self.stats_tree.column(col, width=120)
+        
+        self.stats_rows = [labels + (format_number(round(total, 2)), count) for labels, total, count in results]
+        self.stats_view.set_keys(range(len(self.stats_rows)))
+        self.stats_info_var.set(f"共 {len(self.stats_rows)} 筆，計算耗時 {elapsed:.1f} ms")
+    
     # === 工具方法 ===
     def get_widget_value(self, widget):
         """獲取控件的值"""
@@ -557,6 +791,57 @@ class EmployeeFormSystem:
             return False
         return True
     
+    def record_filter(self, employee_id, selected_status):
+        """將篩選條件轉換為 store.query 的查詢條件（employee_id 為 None 表示全部員工）"""
+        conditions = {}
+        if employee_id:
+            conditions['employee_id'] = employee_id
+        if selected_status and selected_status != "全部":
+            conditions['status'] = selected_status
+        return conditions
+    
+    def on_tab_changed(self, event):
+        """切換頁籤時，建立尚未建立的頁籤、從資料庫載入該頁籤需要的記錄，並刷新切換前累積的異動"""
+        self.build_tab(self.notebook.select())
+        if self.notebook.select() == str(self.att_frame):
+            self.build_tab(self.att_notebook.select())
+        
+        if self.notebook.select() == str(self.stats_frame):
+            self.ensure_records_loaded()
+        else:
+            kinds = self.visible_record_kinds()
+            if kinds:
+                self.ensure_records_loaded(*kinds)
+        self.views.schedule()
+    
+    def visible_record_kinds(self):
+        """目前顯示中的頁籤所對應的記錄類別"""
+        tabs = [self.notebook.select()]
+        if tabs[0] == str(self.att_frame):
+            tabs.append(self.att_notebook.select())
+        return [self.tab_record_kinds[tab] for tab in tabs if tab in self.tab_record_kinds]
+    
+    def ensure_records_loaded(self, *kinds):
+        """確保指定類別（預設全部）的記錄已從資料庫載入，回傳是否有新載入"""
+        if not self.database:
+            return False
+        
+        loaded = False
+        for kind in kinds or RECORD_KINDS:
+            if kind in self.database.pending_kinds:
+                self.store.load_records(kind, self.database.load_records(kind))
+                loaded = True
+        return loaded
+    
+    def refresh_record_view(self, kind):
+        """刷新顯示指定記錄類別的表格"""
+        if kind == 'performance_records':
+            self.refresh_performance_tree(self.perf_employee_picker.employee_id())
+        elif kind == 'leave_requests':
+            self.refresh_leave_records()
+        elif kind == 'overtime_requests':
+            self.refresh_overtime_records()
+    
     # === 員工管理相關方法 ===
     def new_employee(self):
         """新增員工"""
@@ -565,28 +850,20 @@ class EmployeeFormSystem:
     
     def delete_employee(self):
         """刪除員工"""
-        selection = self.employee_tree.selection()
-        if not selection:
+        employee_id = self.employee_view.selected_key()
+        if employee_id is None:
             messagebox.showwarning("警告", "請先選擇要刪除的員工！")
             return
         
-        item = self.employee_tree.selection()[0]
-        employee_id = self.employee_tree.item(item)['values'][0]
-        
         if messagebox.askyesno("確認", f"確定要刪除員工 {employee_id} 的所有資料嗎？此操作無法復原！"):
-            if employee_id in self.employees_data:
-                del self.employees_data[employee_id]
-            self.refresh_employee_tree()
-            self.refresh_employee_combos()
+            self.store.delete_employee(employee_id)
             self.clear_employee_form()
             messagebox.showinfo("成功", "員工資料已刪除！")
     
     def on_employee_select(self, event):
         """當選擇員工時"""
-        selection = self.employee_tree.selection()
-        if selection:
-            item = selection[0]
-            employee_id = self.employee_tree.item(item)['values'][0]
+        employee_id = self.employee_view.selected_key()
+        if employee_id is not None:
             self.current_employee_id = employee_id
             self.load_employee_data(employee_id)
     
@@ -622,30 +899,10 @@ class EmployeeFormSystem:
         for field_key, config in self.basic_fields.items():
             basic_data[field_key] = self.get_widget_value(config['widget'])
         
-        # 初始化員工資料結構
-        if employee_id not in self.employees_data:
-            self.employees_data[employee_id] = {
-                'basic_info': {},
-                'performance_records': [],
-                'leave_requests': [],
-                'overtime_requests': []
-            }
-        
-        # 如果是修改員工編號
-        if self.current_employee_id and self.current_employee_id != employee_id:
-            # 複製舊資料到新編號
-            self.employees_data[employee_id] = self.employees_data[self.current_employee_id].copy()
-            # 刪除舊資料
-            del self.employees_data[self.current_employee_id]
-        
-        # 儲存基本資料
-        self.employees_data[employee_id]['basic_info'] = basic_data
+        # 儲存基本資料（修改員工編號時一併搬移既有記錄）
+        self.store.put_employee(employee_id, basic_data, old_id=self.current_employee_id)
         self.current_employee_id = employee_id
         
-        # 刷新顯示
-        self.refresh_employee_tree()
-        self.refresh_employee_combos()
-        
         messagebox.showinfo("成功", "員工資料已儲存！")
     
     def clear_employee_form(self):
@@ -654,78 +911,75 @@ class EmployeeFormSystem:
             self.set_widget_value(config['widget'], "")
     
     def refresh_employee_tree(self):
-        """刷新員工列表"""
-        # 清空現有項目
-        for item in self.employee_tree.get_children():
-            self.employee_tree.delete(item)
-        
-        # 重新載入資料
-        for employee_id, employee_data in self.employees_data.items():
-            basic_info = employee_data.get('basic_info', {})
-            values = (
-                employee_id,
-                basic_info.get('name', ''),
-                basic_info.get('department', ''),
-                basic_info.get('position', ''),
-                basic_info.get('hire_date', '')
-            )
-            self.employee_tree.insert('', 'end', values=values)
+        """刷新員工列表（虛擬列表只會建立可視範圍內的列），有輸入搜尋條件時只顯示符合的員工"""
+        query = self.employee_search_var.get().strip()
+        if query:
+            keys = self.search_index.search(query)
+            self.employee_count_var.set(f"{len(keys)}/{len(self.employees_data)}")
+        else:
+            keys = self.employees_data.keys()
+            self.employee_count_var.set(f"{len(self.employees_data)}")
+        self.employee_view.set_keys(keys)
     
-    def refresh_employee_combos(self):
-        """刷新所有員工下拉選單"""
-        employee_list = [f"{emp_id} - {data['basic_info'].get('name', '')}" 
-                        for emp_id, data in self.employees_data.items()]
-        
-        # 更新考績管理的員工選單
-        self.perf_employee_combo['values'] = employee_list
-        
-        # 更新請假管理的員工選單
-        self.leave_employee_combo['values'] = employee_list
-        self.leave_fields['employee']['values'] = employee_list
-        
-        # 更新加班管理的員工選單
-        self.overtime_employee_combo['values'] = employee_list
-        self.overtime_fields['employee']['values'] = employee_list
+    def schedule_employee_search(self, *args):
+        """搜尋框輸入時延遲搜尋，連續輸入只在停頓後搜尋一次"""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DELAY_MS, self.run_employee_search)
+    
+    def run_employee_search(self):
+        self.search_after_id = None
+        self.refresh_employee_tree()
+    
+    def employee_row_values(self, employee_id):
+        """員工列表中一列的內容"""
+        employee = self.employees_data.get(employee_id)
+        if employee is None:
+            return None
+        basic_info = employee.get('basic_info', {})
+        return (
+            employee_id,
+            basic_info.get('name', ''),
+            basic_info.get('department', ''),
+            basic_info.get('position', ''),
+            basic_info.get('hire_date', '')
+        )
+    
+    def refresh_employee_pickers(self):
+        """刷新所有員工選單（選項由搜尋索引即時提供，這裡只更新已選定員工的顯示）"""
+        # 考績、請假、加班管理中已建立的員工選單
+        for picker in self.employee_pickers:
+            picker.refresh()
     
     # === 考績管理相關方法 ===
     def on_perf_employee_select(self, event):
         """當選擇考績管理的員工時"""
-        selected = self.perf_employee_var.get()
-        if selected:
-            employee_id = selected.split(' - ')[0]
+        employee_id = self.perf_employee_picker.employee_id()
+        if employee_id:
             self.refresh_performance_tree(employee_id)
     
     def refresh_performance_tree(self, employee_id=None):
         """刷新考績記錄表格"""
-        # 清空現有項目
-        for item in self.perf_tree.get_children():
-            self.perf_tree.delete(item)
-        
-        if not employee_id:
-            return
-        
-        # 重新載入資料
-        if employee_id in self.employees_data:
-            records = self.employees_data[employee_id].get('performance_records', [])
-            for record in records:
-                values = (
-                    record.get('year', ''),
-                    record.get('first_half', ''),
-                    record.get('second_half', ''),
-                    record.get('annual_rating', ''),
-                    record.get('remarks', '')
-                )
-                self.perf_tree.insert('', 'end', values=values)
+        # 每列以記錄鍵值為 iid，只異動有變化的項目
+        rows = []
+        for record in self.store.records_of('performance_records', employee_id):
+            values = (
+                record.get('year', ''),
+                record.get('first_half', ''),
+                record.get('second_half', ''),
+                record.get('annual_rating', ''),
+                record.get('remarks', '')
+            )
+            rows.append((self.store.record_key(record), values))
+        sync_tree_rows(self.perf_tree, rows, self.perf_row_cache)
     
     def add_performance(self):
         """新增考績記錄"""
-        selected = self.perf_employee_var.get()
-        if not selected:
+        employee_id = self.perf_employee_picker.employee_id()
+        if not employee_id:
             messagebox.showerror("錯誤", "請先選擇員工！")
             return
         
-        employee_id = selected.split(' - ')[0]
-        
         # 驗證必填欄位
         required_fields = ['year', 'annual_rating']
         for field in required_fields:
@@ -740,10 +994,7 @@ class EmployeeFormSystem:
         
         # 加入到記錄中
         if employee_id in self.employees_data:
-            self.employees_data[employee_id]['performance_records'].append(perf_data)
-            
-            # 更新表格顯示
-            self.refresh_performance_tree(employee_id)
+            self.store.add_record('performance_records', employee_id, perf_data)
             
             # 清空輸入欄位
             for widget in self.perf_fields.values():
@@ -758,23 +1009,24 @@ class EmployeeFormSystem:
             messagebox.showwarning("警告", "請先選擇要編輯的考績記錄！")
             return
         
-        selected_emp = self.perf_employee_var.get()
-        if not selected_emp:
+        employee_id = self.perf_employee_picker.employee_id()
+        if not employee_id:
             return
         
-        employee_id = selected_emp.split(' - ')[0]
-        item = self.perf_tree.selection()[0]
-        index = self.perf_tree.index(item)
+        # 表格項目的 iid 即為記錄編號
+        key = self.perf_tree.selection()[0]
+        found = self.store.get_record('performance_records', key)
+        if found is None:
+            return
+        record = found[1]
         
         # 將資料填入輸入欄位
-        record = self.employees_data[employee_id]['performance_records'][index]
         for field_key, widget in self.perf_fields.items():
             if field_key in record:
                 self.set_widget_value(widget, record[field_key])
         
         # 刪除舊記錄
-        del self.employees_data[employee_id]['performance_records'][index]
-        self.refresh_performance_tree(employee_id)
+        self.store.delete_record('performance_records', key)
     
     def delete_performance(self):
         """刪除考績記錄"""
@@ -784,13 +1036,10 @@ class EmployeeFormSystem:
             return
         
         if messagebox.askyesno("確認", "確定要刪除選中的考績記錄嗎？"):
-            selected_emp = self.perf_employee_var.get()
-            if selected_emp:
-                employee_id = selected_emp.split(' - ')[0]
-                item = self.perf_tree.selection()[0]
-                index = self.perf_tree.index(item)
-                del self.employees_data[employee_id]['performance_records'][index]
-                self.refresh_performance_tree(employee_id)
+            if self.perf_employee_picker.employee_id():
+                key = self.perf_tree.selection()[0]
+                if self.store.get_record('performance_records', key) is not None:
+                    self.store.delete_record('performance_records', key)
                 messagebox.showinfo("成功", "考績記錄已刪除！")
     
     # === 請假管理相關方法 ===
@@ -800,53 +1049,39 @@ class EmployeeFormSystem:
     
     def filter_leave_records(self):
         """篩選請假記錄"""
-        # 清空現有項目
-        for item in self.leave_tree.get_children():
-            self.leave_tree.delete(item)
-        
         # 獲取篩選條件
-        selected_emp = self.leave_employee_var.get()
+        employee_id = self.leave_employee_picker.employee_id()
         selected_status = self.leave_status_var.get()
         
-        # 載入資料
-        for employee_id, employee_data in self.employees_data.items():
-            # 員工篩選
-            if selected_emp and not selected_emp.startswith("全部"):
-                if selected_emp and selected_emp.split(' - ')[0] != employee_id:
-                    continue
-            
-            basic_info = employee_data.get('basic_info', {})
-            employee_name = basic_info.get('name', '')
-            
-            records = employee_data.get('leave_requests', [])
-            for record in records:
-                # 狀態篩選
-                if selected_status and selected_status != "全部":
-                    if record.get('status', '') != selected_status:
-                        continue
-                
-                values = (
-                    employee_id,
-                    employee_name,
-                    record.get('leave_type', ''),
-                    record.get('start_date', ''),
-                    record.get('end_date', ''),
-                    record.get('days', ''),
-                    record.get('apply_date', ''),
-                    record.get('status', ''),
-                    record.get('reason', '')
-                )
-                self.leave_tree.insert('', 'end', values=values)
+        # 透過索引只取出符合條件的記錄，排序後分頁，虛擬列表只建立可視範圍內的列
+        keys = self.store.query_keys('leave_requests', **self.record_filter(employee_id, selected_status))
+        self.leave_view.set_keys(keys)
+    
+    def leave_row_values(self, key):
+        """請假記錄表格中一列的內容"""
+        found = self.store.get_record('leave_requests', key)
+        if found is None:
+            return None
+        employee_id, record = found
+        return (
+            employee_id,
+            self.store.employee_name(employee_id),
+            record.get('leave_type', ''),
+            record.get('start_date', ''),
+            record.get('end_date', ''),
+            record.get('days', ''),
+            record.get('apply_date', ''),
+            record.get('status', ''),
+            record.get('reason', '')
+        )
     
     def add_leave_request(self):
         """新增請假申請"""
-        selected_emp = self.leave_emp_var.get()
-        if not selected_emp:
+        employee_id = self.leave_fields['employee'].employee_id()
+        if not employee_id:
             messagebox.showerror("錯誤", "請先選擇員工！")
             return
         
-        employee_id = selected_emp.split(' - ')[0]
-        
         # 驗證必填欄位
         required_fields = ['leave_type', 'start_date', 'end_date', 'days', 'status', 'reason']
         for field in required_fields:
@@ -868,12 +1103,7 @@ class EmployeeFormSystem:
         
         # 加入到記錄中
         if employee_id in self.employees_data:
-            if 'leave_requests' not in self.employees_data[employee_id]:
-                self.employees_data[employee_id]['leave_requests'] = []
-            self.employees_data[employee_id]['leave_requests'].append(leave_data)
-            
-            # 更新表格顯示
-            self.refresh_leave_records()
+            self.store.add_record('leave_requests', employee_id, leave_data)
             
             # 清空輸入欄位
             for field_key, widget in self.leave_fields.items():
@@ -884,93 +1114,50 @@ class EmployeeFormSystem:
     
     def edit_leave_request(self):
         """編輯請假申請"""
-        selection = self.leave_tree.selection()
-        if not selection:
+        key = self.leave_view.selected_key()
+        if key is None:
             messagebox.showwarning("警告", "請先選擇要編輯的請假申請！")
             return
         
-        item = self.leave_tree.selection()[0]
-        values = self.leave_tree.item(item)['values']
-        employee_id = values[0]
+        # 依記錄編號直接取得記錄
+        found = self.store.get_record('leave_requests', key)
+        if found is None:
+            return
+        employee_id, record = found
         
-        # 找到對應的記錄
-        if employee_id in self.employees_data:
-            records = self.employees_data[employee_id].get('leave_requests', [])
-            # 這裡簡化處理，實際應該用更精確的方法找到記錄
-            for i, record in enumerate(records):
-                if (record.get('leave_type') == values[2] and 
-                    record.get('start_date') == values[3]):
-                    
-                    # 設置員工選擇
-                    for emp_option in self.leave_fields['employee']['values']:
-                        if emp_option.startswith(employee_id):
-                            self.leave_emp_var.set(emp_option)
-                            break
-                    
-                    # 填充其他欄位
-                    field_mapping = {
-                        'leave_type': values[2],
-                        'start_date': values[3],
-                        'end_date': values[4],
-                        'days': values[5],
-                        'status': values[7],
-                        'reason': values[8]
-                    }
-                    
-                    for field_key, value in field_mapping.items():
-                        if field_key in self.leave_fields:
-                            self.set_widget_value(self.leave_fields[field_key], value)
-                    
-                    # 刪除舊記錄
-                    del records[i]
-                    self.refresh_leave_records()
-                    break
+        # 設置員工選擇
+        self.leave_fields['employee'].set_employee(employee_id)
+        
+        # 填充其他欄位
+        for field_key in ('leave_type', 'start_date', 'end_date', 'days', 'status', 'reason'):
+            self.set_widget_value(self.leave_fields[field_key], record.get(field_key, ''))
+        
+        # 刪除舊記錄
+        self.store.delete_record('leave_requests', key)
     
     def delete_leave_request(self):
         """刪除請假申請"""
-        selection = self.leave_tree.selection()
-        if not selection:
+        key = self.leave_view.selected_key()
+        if key is None:
             messagebox.showwarning("警告", "請先選擇要刪除的請假申請！")
             return
         
         if messagebox.askyesno("確認", "確定要刪除選中的請假申請嗎？"):
-            item = self.leave_tree.selection()[0]
-            values = self.leave_tree.item(item)['values']
-            employee_id = values[0]
+            if self.store.get_record('leave_requests', key) is not None:
+                self.store.delete_record('leave_requests', key)
             
-            # 找到並刪除記錄
-            if employee_id in self.employees_data:
-                records = self.employees_data[employee_id].get('leave_requests', [])
-                for i, record in enumerate(records):
-                    if (record.get('leave_type') == values[2] and 
-                        record.get('start_date') == values[3]):
-                        del records[i]
-                        break
-                
-                self.refresh_leave_records()
-                messagebox.showinfo("成功", "請假申請已刪除！")
+            messagebox.showinfo("成功", "請假申請已刪除！")
     
     def update_leave_status(self, new_status):
         """更新請假狀態"""
-        selection = self.leave_tree.selection()
-        if not selection:
+        key = self.leave_view.selected_key()
+        if key is None:
             messagebox.showwarning("警告", "請先選擇要更新的請假申請！")
             return
         
-        item = self.leave_tree.selection()[0]
-        values = self.leave_tree.item(item)['values']
-        employee_id = values[0]
-        
-        # 找到並更新記錄
-        if employee_id in self.employees_data:
-            records = self.employees_data[employee_id].get('leave_requests', [])
-            for record in records:
-                if (record.get('leave_type') == values[2] and 
-                    record.get('start_date') == values[3]):
-                    record['status'] = new_status
-                    break
+        if self.store.get_record('leave_requests', key) is not None:
+            self.store.set_status('leave_requests', key, new_status)
             
-            self.refresh_leave_records()
             messagebox.showinfo("成功", f"請假狀態已更新為：{new_status}")
     
     # === 加班管理相關方法 ===
@@ -980,54 +1167,40 @@ class EmployeeFormSystem:
     
     def filter_overtime_records(self):
         """篩選加班記錄"""
-        # 清空現有項目
-        for item in self.overtime_tree.get_children():
-            self.overtime_tree.delete(item)
-        
         # 獲取篩選條件
-        selected_emp = self.overtime_employee_var.get()
+        employee_id = self.overtime_employee_picker.employee_id()
         selected_status = self.overtime_status_var.get()
         
-        # 載入資料
-        for employee_id, employee_data in self.employees_data.items():
-            # 員工篩選
-            if selected_emp and not selected_emp.startswith("全部"):
-                if selected_emp and selected_emp.split(' - ')[0] != employee_id:
-                    continue
-            
-            basic_info = employee_data.get('basic_info', {})
-            employee_name = basic_info.get('name', '')
-            
-            records = employee_data.get('overtime_requests', [])
-            for record in records:
-                # 狀態篩選
-                if selected_status and selected_status != "全部":
-                    if record.get('status', '') != selected_status:
-                        continue
-                
-                values = (
-                    employee_id,
-                    employee_name,
-                    record.get('overtime_date', ''),
-                    record.get('start_time', ''),
-                    record.get('end_time', ''),
-                    record.get('hours', ''),
-                    record.get('overtime_type', ''),
-                    record.get('apply_date', ''),
-                    record.get('status', ''),
-                    record.get('reason', '')
-                )
-                self.overtime_tree.insert('', 'end', values=values)
+        # 透過索引只取出符合條件的記錄，排序後分頁，虛擬列表只建立可視範圍內的列
+        keys = self.store.query_keys('overtime_requests', **self.record_filter(employee_id, selected_status))
+        self.overtime_view.set_keys(keys)
+    
+    def overtime_row_values(self, key):
+        """加班記錄表格中一列的內容"""
+        found = self.store.get_record('overtime_requests', key)
+        if found is None:
+            return None
+        employee_id, record = found
+        return (
+            employee_id,
+            self.store.employee_name(employee_id),
+            record.get('overtime_date', ''),
+            record.get('start_time', ''),
+            record.get('end_time', ''),
+            record.get('hours', ''),
+            record.get('overtime_type', ''),
+            record.get('apply_date', ''),
+            record.get('status', ''),
+            record.get('reason', '')
+        )
     
     def add_overtime_request(self):
         """新增加班申請"""
-        selected_emp = self.overtime_emp_var.get()
-        if not selected_emp:
+        employee_id = self.overtime_fields['employee'].employee_id()
+        if not employee_id:
             messagebox.showerror("錯誤", "請先選擇員工！")
             return
         
-        employee_id = selected_emp.split(' - ')[0]
-        
         # 驗證必填欄位
         required_fields = ['overtime_date', 'start_time', 'end_time', 'hours', 'overtime_type', 'status', 'reason']
         for field in required_fields:
@@ -1046,12 +1219,7 @@ class EmployeeFormSystem:
         
         # 加入到記錄中
         if employee_id in self.employees_data:
-            if 'overtime_requests' not in self.employees_data[employee_id]:
-                self.employees_data[employee_id]['overtime_requests'] = []
-            self.employees_data[employee_id]['overtime_requests'].append(overtime_data)
-            
-            # 更新表格顯示
-            self.refresh_overtime_records()
+            self.store.add_record('overtime_requests', employee_id, overtime_data)
             
             # 清空輸入欄位
             for field_key, widget in self.overtime_fields.items():
@@ -1065,105 +1233,58 @@ class EmployeeFormSystem:
     
     def edit_overtime_request(self):
         """編輯加班申請"""
-        selection = self.overtime_tree.selection()
-        if not selection:
+        key = self.overtime_view.selected_key()
+        if key is None:
             messagebox.showwarning("警告", "請先選擇要編輯的加班申請！")
             return
         
-        item = self.overtime_tree.selection()[0]
-        values = self.overtime_tree.item(item)['values']
-        employee_id = values[0]
-        
-        # 找到對應的記錄
-        if employee_id in self.employees_data:
-            records = self.employees_data[employee_id].get('overtime_requests', [])
-            for i, record in enumerate(records):
-                if (record.get('overtime_date') == values[2] and 
-                    record.get('start_time') == values[3]):
-                    
-                    # 設置員工選擇
-                    for emp_option in self.overtime_fields['employee']['values']:
-                        if emp_option.startswith(employee_id):
-                            self.overtime_emp_var.set(emp_option)
-                            break
-
-                    # 填充其他欄位
-                    field_mapping = {
-                        'overtime_date': values[2],
-                        'start_time': values[3],
-                        'end_time': values[4],
-                        'hours': values[5],
-                        'overtime_type': values[6],
-                        'status': values[8],
-                        'reason': values[9]
-                    }
-                    for field_key, value in field_mapping.items():
-                        if field_key in self.overtime_fields:
-                            self.set_widget_value(self.overtime_fields[field_key], value)
-
-                    # 刪除舊記錄
-                    del records[i]
-                    self.refresh_overtime_records()
-                    break
+        # 依記錄編號直接取得記錄
+        found = self.store.get_record('overtime_requests', key)
+        if found is None:
+            return
+        employee_id, record = found
+
+        # 設置員工選擇
+        self.overtime_fields['employee'].set_employee(employee_id)
+
+        # 填充其他欄位
+        for field_key in ('overtime_date', 'start_time', 'end_time', 'hours', 'overtime_type', 'status', 'reason'):
+            self.set_widget_value(self.overtime_fields[field_key], record.get(field_key, ''))
+
+        # 刪除舊記錄
+        self.store.delete_record('overtime_requests', key)
 
     def delete_overtime_request(self):
         """刪除加班申請"""
-        selection = self.overtime_tree.selection()
-        if not selection:
+        key = self.overtime_view.selected_key()
+        if key is None:
             messagebox.showwarning("警告", "請先選擇要刪除的加班申請！")
             return
 
         if messagebox.askyesno("確認", "確定要刪除選中的加班申請嗎？"):
-            item = self.overtime_tree.selection()[0]
-            values = self.overtime_tree.item(item)['values']
-            employee_id = values[0]
-
-            # 找到並刪除記錄
-            if employee_id in self.employees_data:
-                records = self.employees_data[employee_id].get('overtime_requests', [])
-                for i, record in enumerate(records):
-                    if (record.get('overtime_date') == values[2] and
-                        record.get('start_time') == values[3]):
-                        del records[i]
-                        break
-
-                self.refresh_overtime_records()
-                messagebox.showinfo("成功", "加班申請已刪除！")
+            if self.store.get_record('overtime_requests', key) is not None:
+                self.store.delete_record('overtime_requests', key)
+
+            messagebox.showinfo("成功", "加班申請已刪除！")
 
     def update_overtime_status(self, new_status):
         """更新加班狀態"""
-        selection = self.overtime_tree.selection()
-        if not selection:
+        key = self.overtime_view.selected_key()
+        if key is None:
             messagebox.showwarning("警告", "請先選擇要更新的加班申請！")
             return
 
-        item = self.overtime_tree.selection()[0]
-        values = self.overtime_tree.item(item)['values']
-        employee_id = values[0]
+        if self.store.get_record('overtime_requests', key) is not None:
+            self.store.set_status('overtime_requests', key, new_status)
 
-        # 找到並更新記錄
-        if employee_id in self.employees_data:
-            records = self.employees_data[employee_id].get('overtime_requests', [])
-            for record in records:
-                if (record.get('overtime_date') == values[2] and
-                    record.get('start_time') == values[3]):
-                    record['status'] = new_status
-                    break
-
-            self.refresh_overtime_records()
             messagebox.showinfo("成功", f"加班狀態已更新為：{new_status}")
 
     # === 檔案與資料處理 ===
     def clear_all_data(self):
         """清空所有資料"""
         if messagebox.askyesno("確認", "確定要清空所有員工資料與申請紀錄嗎？此操作無法復原！"):
-            self.employees_data.clear()
+            self.store.clear()
             self.current_employee_id = None
-            self.refresh_employee_tree()
-            self.refresh_employee_combos()
-            self.refresh_performance_tree()
-            self.refresh_leave_records()
-            self.refresh_overtime_records()
             self.clear_employee_form()
             messagebox.showinfo("成功", "所有資料已清空！")
 
@@ -1178,14 +1299,20 @@ class EmployeeFormSystem:
             return
 
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(self.employees_data, f, ensure_ascii=False, indent=2)
+            self.ensure_records_loaded()
+            json_codec.dump_file(self.store.to_dict(), file_path, compact=self.compact_json)
             messagebox.showinfo("成功", "資料已儲存至檔案！")
         except Exception as e:
             messagebox.showerror("錯誤", f"儲存檔案失敗：{e}")
 
     def load_data(self):
-        """從本地 JSON 檔案載入資料"""
+        """從本地 JSON 檔案載入資料
+
+        背景執行緒逐位員工解析檔案，每解析出一批就加入 store，
+        員工列表會在第一批載入後立即顯示，之後定期更新。
+        載入以暫時性方式進行：讀完才寫入自動儲存或資料庫，
+        取消載入或檔案格式錯誤時還原成原本的資料。
+        """
         file_path = filedialog.askopenfilename(
             defaultextension=".json",
             filetypes=[("JSON檔案", "*.json")],
@@ -1194,21 +1321,122 @@ class EmployeeFormSystem:
         if not file_path:
             return
 
+        # 資料庫中尚未載入的記錄先讀進來，還原時才是完整的資料
+        self.ensure_records_loaded()
+
+        loaded = {'count': 0, 'refreshed': None}
+        dialog = ProgressDialog(self.root, "載入資料", "正在載入資料...")
+        # 載入期間只定期更新員工列表，其他畫面等載入結束後各刷新一次
+        self.views.hold()
+        self.store.begin_provisional()
+        self.clear_employee_form()
+
+        def on_batch(batch):
+            self.store.extend(batch)
+            loaded['count'] += len(batch)
+            dialog.update(message=f"已載入 {loaded['count']} 位員工")
+            # 重新整理員工列表的成本與資料量成正比，因此限制更新頻率
+            now = time.monotonic()
+            if loaded['refreshed'] is None or now - loaded['refreshed'] >= 0.5:
+                self.refresh_employee_tree()
+                loaded['refreshed'] = now
+
+        def finish():
+            dialog.close()
+            self.views.release()
+
+        def on_done(cancelled):
+            if cancelled:
+                self.store.rollback_provisional()
+            else:
+                self.store.commit_provisional()
+            finish()
+            if cancelled:
+                messagebox.showinfo("已取消", "已取消載入，已還原原本的資料")
+            else:
+                messagebox.showinfo("成功", "資料已載入！")
+
+        def on_error(e):
+            self.store.rollback_provisional()
+            finish()
+            messagebox.showerror("錯誤", f"載入檔案失敗（已還原原本的資料）：{e}")
+
+        task = BackgroundTask(self.root,
+                              lambda cancel_event: json_codec.iter_object_batches(file_path, cancel_event=cancel_event),
+                              on_item=on_batch, on_done=on_done, on_error=on_error)
+        dialog.on_cancel = task.cancel
+        task.start()
+
+    def restore_autosave(self):
+        """從自動儲存的快照與日誌還原資料，並開始記錄之後的異動"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                self.employees_data = json.load(f)
-            self.refresh_employee_tree()
-            self.refresh_employee_combos()
-            self.refresh_performance_tree()
-            self.refresh_leave_records()
-            self.refresh_overtime_records()
+            employees = self.journal.recover()
+            if employees:
+                self.store.load(employees)
+        except Exception as e:
+            messagebox.showerror("錯誤", f"還原自動儲存資料失敗：{e}\n"
+                                       f"原本的自動儲存檔案已改名保留在 {self.journal.directory}")
+        
+        self.store.add_listener(self.journal.record_change, persistent=True)
+        self.journal.start_autosave()
+
+    def on_close(self):
+        """關閉視窗前完成最後一次自動儲存"""
+        try:
+            self.journal.close()
+        except Exception as e:
+            messagebox.showerror("錯誤", f"自動儲存失敗：{e}")
+        if self.database:
+            self.database.close()
+        self.root.destroy()
+
+    def open_database(self):
+        """開啟或建立 SQLite 資料庫，之後每次異動都以小交易立即寫入"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".db",
+            filetypes=[("SQLite資料庫", "*.db")],
+            title="開啟資料庫",
+            confirmoverwrite=False
+        )
+        if not file_path:
+            return
+
+        try:
+            database = SQLiteStorage(file_path)
+            
+            # 資料庫模式下每次異動已直接寫入資料庫，停用自動儲存日誌
+            self.store.remove_listener(self.journal.record_change)
+            self.journal.discard()
+            
+            if self.database:
+                self.store.remove_listener(self.database.apply_change)
+                self.database.close()
+                self.database = None
+
+            if database.is_empty():
+                # 新資料庫：寫入目前畫面上的資料
+                self.ensure_records_loaded()
+                database.replace_all(self.store.to_dict())
+            else:
+                # 既有資料庫：先只載入員工基本資料，記錄待頁籤顯示時再載入
+                self.store.load(database.load_employees())
+
+            self.database = database
+            self.store.add_listener(database.apply_change, persistent=True)
+
+            self.current_employee_id = None
             self.clear_employee_form()
-            messagebox.showinfo("成功", "資料已載入！")
+            self.on_tab_changed(None)
+            messagebox.showinfo("成功", f"已開啟資料庫：{file_path}")
         except Exception as e:
-            messagebox.showerror("錯誤", f"載入檔案失敗：{e}")
+            messagebox.showerror("錯誤", f"開啟資料庫失敗：{e}")
 
     def import_excel(self):
-        """從 Excel 匯入員工資料（僅支援格式示範）"""
+        """從 Excel 匯入員工資料
+
+        本系統匯出的檔案（含「員工基本資料」等工作表）會完整還原所有資料，
+        其他檔案則只由作用中工作表匯入基本資料。
+        """
         file_path = filedialog.askopenfilename(
             defaultextension=".xlsx",
             filetypes=[("Excel檔案", "*.xlsx")],
@@ -1218,33 +1446,120 @@ class EmployeeFormSystem:
             return
 
         try:
-            wb = openpyxl.load_workbook(file_path)
-            ws = wb.active
-            # 假設第一列是欄位名稱
-            rows = list(ws.iter_rows(values_only=True))
-            if not rows or len(rows) < 2:
-                messagebox.showerror("錯誤", "Excel檔案內容不足")
-                return
+            from excel_import import is_full_export
+        except ImportError as e:
+            messagebox.showerror("錯誤", f"無法載入 openpyxl: {e}")
+            return
 
-            header = rows[0]
-            for row in rows[1:]:
-                employee_data = dict(zip(header, row))
-                emp_id = str(employee_data.get('employee_id', '')).strip()
-                if emp_id:
-                    self.employees_data[emp_id] = self.employees_data.get(emp_id, {
-                        'basic_info': {}, 'performance_records': [], 'leave_requests': [], 'overtime_requests': []
-                    })
-                    # 只匯入基本資料
-                    self.employees_data[emp_id]['basic_info'] = employee_data
-
-            self.refresh_employee_tree()
-            self.refresh_employee_combos()
-            messagebox.showinfo("成功", "Excel匯入完成（僅匯入基本資料）！")
+        try:
+            full_export = is_full_export(file_path)
         except Exception as e:
             messagebox.showerror("錯誤", f"Excel匯入失敗：{e}")
+            return
+
+        if full_export:
+            self.import_full_excel(file_path)
+        else:
+            self.import_basic_excel(file_path)
+
+    def import_full_excel(self, file_path):
+        """由匯出格式的 Excel 還原員工基本資料、考績、請假、加班記錄
+
+        各工作表由子行程同時解析，依員工編號合併後一次載入 store，
+        匯入的內容會取代目前所有資料。
+        """
+        from excel_import import iter_full_import
+        if self.employees_data and not messagebox.askyesno(
+                "確認", "匯入完整備份將取代目前所有資料，確定要繼續嗎？"):
+            return
+
+        imported = {'employees': None}
+        dialog = ProgressDialog(self.root, "匯入Excel", "正在解析工作表...")
+        self.views.hold()
+
+        def on_item(item):
+            if item[0] == 'sheet':
+                _, done, total, sheet_name = item
+                if str(dialog.progress.cget('mode')) != 'determinate':
+                    dialog.set_maximum(total)
+                dialog.update(done, f"已解析「{sheet_name}」（{done}/{total}）")
+            else:
+                dialog.update(message="正在載入資料...")
+                self.store.load(item[1])
+                imported['employees'] = item[1]
+
+        def finish():
+            dialog.close()
+            self.views.release()
+
+        def on_done(cancelled):
+            finish()
+            # 取消可能在資料已載入 store 之後才送達，此時匯入其實已完成
+            if imported['employees'] is not None:
+                messagebox.showinfo("成功", f"Excel匯入完成，共 {len(imported['employees'])} 位員工！")
+            else:
+                messagebox.showinfo("已取消", "已取消匯入，資料未變更")
+
+        def on_error(e):
+            finish()
+            messagebox.showerror("錯誤", f"Excel匯入失敗：{e}")
+
+        task = BackgroundTask(self.root,
+                              lambda cancel_event: iter_full_import(file_path, cancel_event),
+                              on_item=on_item, on_done=on_done, on_error=on_error)
+        dialog.on_cancel = task.cancel
+        task.start()
+
+    def import_basic_excel(self, file_path):
+        """由作用中工作表匯入員工基本資料
+
+        以唯讀模式在背景執行緒逐批讀取，主執行緒每收到一批就寫入 store，
+        並更新進度視窗；使用者可隨時取消，已匯入的批次會保留。
+        """
+        from excel_import import iter_employee_batches
+        imported = {'count': 0, 'rows': 0}
+        dialog = ProgressDialog(self.root, "匯入Excel", "正在讀取Excel檔案...")
+        # 每批寫入 store 都會標記畫面，匯入完成後才各刷新一次
+        self.views.hold()
+
+        def on_batch(batch):
+            rows, processed, total = batch
+            if total and str(dialog.progress.cget('mode')) != 'determinate':
+                dialog.set_maximum(total)
+            self.store.put_employees(rows)
+            imported['count'] += len(rows)
+            imported['rows'] = processed
+            dialog.update(processed, f"已讀取 {processed} 列，匯入 {imported['count']} 位員工")
+
+        def finish():
+            dialog.close()
+            self.views.release()
+
+        def on_done(cancelled):
+            finish()
+            if cancelled:
+                messagebox.showinfo("已取消", f"已取消匯入，已匯入 {imported['count']} 位員工的基本資料")
+            elif not imported['rows']:
+                messagebox.showerror("錯誤", "Excel檔案內容不足")
+            else:
+                messagebox.showinfo("成功", f"Excel匯入完成（僅匯入基本資料），共 {imported['count']} 位員工！")
+
+        def on_error(e):
+            finish()
+            messagebox.showerror("錯誤", f"Excel匯入失敗：{e}")
+
+        task = BackgroundTask(self.root,
+                              lambda cancel_event: iter_employee_batches(file_path, cancel_event),
+                              on_item=on_batch, on_done=on_done, on_error=on_error)
+        dialog.on_cancel = task.cancel
+        task.start()
 
     def export_excel(self):
-        """匯出所有員工資料為分頁、多樣式的Excel"""
+        """匯出所有員工資料為分頁、多樣式的Excel
+
+        先在主執行緒複製一份資料快照，再由背景執行緒寫檔，
+        匯出期間仍可繼續編輯，匯出內容固定為按下匯出當下的資料。
+        """
         file_path = filedialog.asksaveasfilename(
             title="儲存Excel檔案",
             defaultextension=".xlsx",
@@ -1254,153 +1569,45 @@ class EmployeeFormSystem:
             return
 
         try:
-            wb = openpyxl.Workbook()
-            # 預設sheet刪除
-            wb.remove(wb.active)
-
-            # 1. 員工基本資料
-            self.export_basic_info_sheet(wb)
-            # 2. 員工考績
-            self.export_performance_sheet(wb)
-            # 3. 員工請假
-            self.export_leave_sheet(wb)
-            # 4. 員工加班
-            self.export_overtime_sheet(wb)
-
-            wb.save(file_path)
-            messagebox.showinfo("成功", f"資料已匯出到：{file_path}")
+            from excel_export import export_workbook, count_rows
+        except ImportError as e:
+            messagebox.showerror("錯誤", f"無法載入 openpyxl: {e}")
+            return
+
+        try:
+            self.ensure_records_loaded()
+            snapshot = self.store.snapshot()
         except Exception as e:
             messagebox.showerror("錯誤", f"匯出失敗：{e}")
+            return
 
-    def export_basic_info_sheet(self, wb):
-        ws = wb.create_sheet("員工基本資料")
-        # 決定所有欄位
-        headers = [
-            "員工編號", "姓名", "身分證字號", "性別", "出生日期", "聯絡電話", "電子郵件",
-            "緊急聯絡人", "緊急聯絡人電話", "戶籍地址", "通訊地址",
-            "部門", "職位", "職級", "到職日期", "直屬主管", "工作地點", "僱用類型", "薪資等級"
-        ]
-        self.write_styled_sheet(ws, headers, [
-            [
-                emp_id,
-                info.get("name", ""),
-                info.get("id_number", ""),
-                info.get("gender", ""),
-                info.get("birth_date", ""),
-                info.get("phone", ""),
-                info.get("email", ""),
-                info.get("emergency_contact", ""),
-                info.get("emergency_phone", ""),
-                info.get("address", ""),
-                info.get("mailing_address", ""),
-                info.get("department", ""),
-                info.get("position", ""),
-                info.get("job_level", ""),
-                info.get("hire_date", ""),
-                info.get("supervisor", ""),
-                info.get("work_location", ""),
-                info.get("employment_type", ""),
-                info.get("salary_grade", ""),
-            ]
-            for emp_id, data in self.employees_data.items()
-            for info in [data.get('basic_info', {})]
-        ])
-
-    def export_performance_sheet(self, wb):
-        ws = wb.create_sheet("考績管理")
-        headers = ["員工編號", "姓名", "年度", "上半年考績", "下半年考績", "年度總評", "備註"]
-        data = []
-        for emp_id, emp_data in self.employees_data.items():
-            name = emp_data.get("basic_info", {}).get("name", "")
-            for perf in emp_data.get("performance_records", []):
-                data.append([
-                    emp_id,
-                    name,
-                    perf.get("year", ""),
-                    perf.get("first_half", ""),
-                    perf.get("second_half", ""),
-                    perf.get("annual_rating", ""),
-                    perf.get("remarks", ""),
-                ])
-        self.write_styled_sheet(ws, headers, data)
-
-    def export_leave_sheet(self, wb):
-        ws = wb.create_sheet("請假管理")
-        headers = ["員工編號", "姓名", "請假類型", "開始日期", "結束日期", "請假天數", "申請日期", "狀態", "請假事由"]
-        data = []
-        for emp_id, emp_data in self.employees_data.items():
-            name = emp_data.get("basic_info", {}).get("name", "")
-            for leave in emp_data.get("leave_requests", []):
-                data.append([
-                    emp_id,
-                    name,
-                    leave.get("leave_type", ""),
-                    leave.get("start_date", ""),
-                    leave.get("end_date", ""),
-                    leave.get("days", ""),
-                    leave.get("apply_date", ""),
-                    leave.get("status", ""),
-                    leave.get("reason", ""),
-                ])
-        self.write_styled_sheet(ws, headers, data)
-
-    def export_overtime_sheet(self, wb):
-        ws = wb.create_sheet("加班管理")
-        headers = ["員工編號", "姓名", "加班日期", "開始時間", "結束時間", "加班時數", "加班類型", "申請日期", "狀態", "加班事由"]
-        data = []
-        for emp_id, emp_data in self.employees_data.items():
-            name = emp_data.get("basic_info", {}).get("name", "")
-            for ot in emp_data.get("overtime_requests", []):
-                data.append([
-                    emp_id,
-                    name,
-                    ot.get("overtime_date", ""),
-                    ot.get("start_time", ""),
-                    ot.get("end_time", ""),
-                    ot.get("hours", ""),
-                    ot.get("overtime_type", ""),
-                    ot.get("apply_date", ""),
-                    ot.get("status", ""),
-                    ot.get("reason", ""),
-                ])
-        self.write_styled_sheet(ws, headers, data)
-
-    def write_styled_sheet(self, ws, headers, data_rows):
-        """寫入標題和資料, 標題有顏色，凍結首列，加上filter，自動欄寬"""
-        # 標題樣式
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-        border = Border(left=Side(style='thin'), right=Side(style='thin'), 
-                        top=Side(style='thin'), bottom=Side(style='thin'))
-
-        # 標題列
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-
-        # 資料列
-        for row_idx, row_data in enumerate(data_rows, 2):
-            for col, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_idx, column=col, value=value)
-                cell.border = border
-
-        # filter
-        ws.auto_filter.ref = ws.dimensions
-
-        # 凍結首列
-        ws.freeze_panes = "A2"
-
-        # 自動欄寬
-        for col in ws.columns:
-            max_length = max([len(str(cell.value)) if cell.value else 0 for cell in col] + [len(str(col[0].value))])
-            col_letter = col[0].column_letter
-            ws.column_dimensions[col_letter].width = min(max_length + 2, 40)
+        dialog = ProgressDialog(self.root, "匯出Excel", "正在準備匯出...", maximum=count_rows(snapshot))
+
+        def on_progress(progress):
+            done, total, message = progress
+            dialog.update(done, message)
+
+        def on_done(cancelled):
+            dialog.close()
+            if cancelled:
+                messagebox.showinfo("已取消", "已取消匯出，未寫入檔案")
+            else:
+                messagebox.showinfo("成功", f"資料已匯出到：{file_path}")
+
+        def on_error(e):
+            dialog.close()
+            messagebox.showerror("錯誤", f"匯出失敗：{e}")
+
+        task = BackgroundTask(self.root,
+                              lambda cancel_event: export_workbook(snapshot, file_path, cancel_event),
+                              on_item=on_progress, on_done=on_done, on_error=on_error)
+        dialog.on_cancel = task.cancel
+        task.start()
 
 # 主程式執行
 if __name__ == '__main__':
+    startup_timer = StartupTimer(STARTUP_T0)
+    startup_timer.mark("載入模組")
     root = tk.Tk()
-    app = EmployeeFormSystem(root)
+    app = EmployeeFormSystem(root, startup_timer)
     root.mainloop()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+背景預先載入模組
+openpyxl、NumPy 等載入較慢的套件都改在第一次使用時才匯入，
+主視窗顯示後可在背景執行緒先把它們匯入，使用者第一次匯入／匯出時就不必等待
+"""
+
+import importlib
+import threading
+import time
+
+
+# 預先載入的模組（依序載入，未安裝的略過）
+PREWARM_MODULES = ('openpyxl', 'excel_import', 'excel_export', 'numpy')
+
+
+def prewarm(modules=PREWARM_MODULES):
+    """在背景執行緒依序匯入模組，回傳該執行緒"""
+    def run():
+        start = time.perf_counter()
+        loaded = []
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+            loaded.append(name)
+        print(f"✅ 背景預先載入完成（{'、'.join(loaded)}）：{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    thread = threading.Thread(target=run, name='prewarm', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記錄排序與分頁模組
+請假、加班表格點選欄位標題即可排序：每筆記錄每個欄位的排序鍵只計算一次並快取，
+日期與數字直接使用記錄物件中已轉換好的序數與浮點數，不必再解析字串；
+排序後的結果分頁顯示，每頁再交給虛擬列表只建立可視範圍內的列
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import unicodedata
+
+from record_types import RECORD_TYPES, DATE, NUMBER
+
+
+# 每頁顯示的筆數
+PAGE_SIZE = 500
+
+# 不是記錄欄位、由 store 提供的欄位
+EMPLOYEE_ID = 'employee_id'
+EMPLOYEE_NAME = 'employee_name'
+
+# 排序鍵的第一個元素：正常值在前，無法轉換的原值次之，空白最後（遞增、遞減皆然）
+VALUE, RAW, EMPTY = 0, 1, 2
+
+
+def text_sort_key(value):
+    """文字的排序鍵
+
+    只保證排序穩定、不分大小寫（全形英數字視同半形），
+    中文字僅依 Unicode 碼位排列，並非姓名的筆畫或注音順序。
+    """
+    if value is None or value == '':
+        return (EMPTY, '')
+    return (VALUE, unicodedata.normalize('NFKC', str(value)).casefold())
+
+
+class SortKeyCache:
+    """記錄排序鍵快取
+
+    {欄位: {記錄鍵值: 排序鍵}}，排序時才計算缺少的排序鍵；
+    掛在 RecordStore 的異動監聽上，記錄或員工姓名異動時只捨棄受影響的排序鍵。
+    """
+
+    def __init__(self, store, kind):
+        self.store = store
+        self.kind = kind
+        self._field_kinds = RECORD_TYPES[kind]._KINDS
+        self._keys = {}
+        store.add_listener(self._on_change)
+
+    def sort_key(self, field, key):
+        """計算一筆記錄某個欄位的排序鍵"""
+        found = self.store.get_record(self.kind, key)
+        if found is None:
+            return (EMPTY, '')
+        employee_id, record = found
+        if field == EMPLOYEE_ID:
+            return text_sort_key(employee_id)
+        if field == EMPLOYEE_NAME:
+            return text_sort_key(self.store.employee_name(employee_id))
+
+        field_kind = self._field_kinds.get(field)
+        if field_kind in (DATE, NUMBER):
+            typed = record.typed(field)
+            if typed is not None:
+                return (VALUE, typed)
+            # 不標準的日期或數字（例如空白、'3.50'）排在正常值之後
+            raw = record.get(field)
+            return (RAW, str(raw)) if raw else (EMPTY, '')
+        return text_sort_key(record.get(field))
+
+    def sorted_keys(self, keys, field, reverse=False):
+        """依欄位排序記錄鍵值（相同的值保持原本的順序）
+
+        reverse 只反轉同一類值之間的順序，無法轉換的原值與空白仍排在正常值之後。
+        """
+        cache = self._keys.get(field)
+        if cache is None:
+            cache = self._keys[field] = {}
+        groups = ([], [], [])
+        for key in keys:
+            sort_key = cache.get(key)
+            if sort_key is None:
+                sort_key = cache[key] = self.sort_key(field, key)
+            groups[sort_key[0]].append(key)
+        ordered = sorted(groups[VALUE], key=cache.__getitem__, reverse=reverse)
+        ordered += sorted(groups[RAW], key=cache.__getitem__, reverse=reverse)
+        ordered += groups[EMPTY]
+        return ordered
+
+    def _discard(self, keys, fields=None):
+        for field, cache in self._keys.items():
+            if fields is None or field in fields:
+                for key in keys:
+                    cache.pop(key, None)
+
+    def _on_change(self, event):
+        op = event['op']
+        kind = event.get('kind')
+        if kind is not None:
+            if kind != self.kind:
+                return
+            if op == 'load_records':
+                self._keys.clear()
+            else:
+                self._discard((event['key'],))
+        elif op == 'put_employee' and not event['old_id']:
+            # 只有姓名可能改變，捨棄該員工記錄的姓名排序鍵
+            self._discard(self.store.query_keys(self.kind, employee_id=event['employee_id']), (EMPLOYEE_NAME,))
+        elif op == 'put_employees':
+            for employee_id, _ in event['employees']:
+                self._discard(self.store.query_keys(self.kind, employee_id=employee_id), (EMPLOYEE_NAME,))
+        else:
+            self._keys.clear()
+
+
+class SortedPagedView:
+    """可排序、分頁的記錄表格
+
+    columns 為 ((欄位標題, 欄位名稱), ...)，點選欄位標題依該欄排序，再點一次反向排序。
+    set_keys() 設定篩選後的記錄鍵值；排序後只把目前這一頁交給 VirtualTreeview。
+    page_frame 中會建立上一頁、下一頁按鈕與頁數說明。
+    """
+
+    def __init__(self, view, sort_keys, columns, page_frame, page_size=PAGE_SIZE):
+        self.view = view
+        self.sort_keys = sort_keys
+        self.columns = dict(columns)
+        self.page_size = page_size
+
+        self.keys = []
+        self.sorted = []
+        self.page = 0
+        self.sort_column = None
+        self.reverse = False
+
+        for heading in self.columns:
+            view.tree.heading(heading, command=lambda heading=heading: self.sort_by(heading))
+
+        self.prev_button = ttk.Button(page_frame, text="◀ 上一頁", command=lambda: self.go_to(self.page - 1))
+        self.prev_button.pack(side=tk.LEFT, padx=5)
+        self.page_var = tk.StringVar()
+        ttk.Label(page_frame, textvariable=self.page_var).pack(side=tk.LEFT, padx=5)
+        self.next_button = ttk.Button(page_frame, text="下一頁 ▶", command=lambda: self.go_to(self.page + 1))
+        self.next_button.pack(side=tk.LEFT, padx=5)
+
+    def page_count(self):
+        return max(1, -(-len(self.sorted) // self.page_size))
+
+    def set_keys(self, keys):
+        """設定篩選後的記錄鍵值，保持目前的排序與頁數"""
+        self.keys = list(keys)
+        self._sort()
+        self.go_to(self.page)
+
+    def sort_by(self, heading):
+        """依欄位排序，點選同一欄時切換遞增／遞減"""
+        if heading == self.sort_column:
+            self.reverse = not self.reverse
+        else:
+            self.sort_column = heading
+            self.reverse = False
+        for other in self.columns:
+            mark = (" ▼" if self.reverse else " ▲") if other == heading else ""
+            self.view.tree.heading(other, text=other + mark)
+        self._sort()
+        self.go_to(0)
+        self.view.scroll_to(0)
+
+    def _sort(self):
+        if self.sort_column is None:
+            self.sorted = self.keys
+        else:
+            self.sorted = self.sort_keys.sorted_keys(self.keys, self.columns[self.sort_column], self.reverse)
+
+    def go_to(self, page):
+        """顯示指定的頁數"""
+        page = max(0, min(page, self.page_count() - 1))
+        changed = page != self.page
+        self.page = page
+        start = page * self.page_size
+        self.view.set_keys(self.sorted[start:start + self.page_size])
+        if changed:
+            self.view.scroll_to(0)
+        self.page_var.set(f"第 {self.page + 1} / {self.page_count()} 頁（共 {len(self.sorted)} 筆）")
+        self.prev_button.state(['!disabled'] if self.page > 0 else ['disabled'])
+        self.next_button.state(['!disabled'] if self.page < self.page_count() - 1 else ['disabled'])
+
+    def selected_key(self):
+        return self.view.selected_key()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+員工資料儲存模組
+以 employees_data 為主體，額外維護狀態、員工、日期三種次要索引，
+讓請假／加班／考績的篩選只需處理符合條件的記錄；
+每筆記錄都帶有唯一的 record_id，查詢、修改、刪除皆可直接定位
+"""
+
+import gc
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+
+from record_types import to_record
+
+
+# 各類記錄在員工資料中的鍵值
+RECORD_KINDS = ('performance_records', 'leave_requests', 'overtime_requests')
+
+# 各類記錄用來建立日期索引的欄位
+DATE_FIELDS = {
+    'performance_records': 'year',
+    'leave_requests': 'start_date',
+    'overtime_requests': 'overtime_date',
+}
+
+# 記錄唯一編號的欄位名稱
+RECORD_ID_FIELD = 'record_id'
+
+
+def new_record_id():
+    """產生記錄的唯一編號"""
+    return uuid.uuid4().hex
+
+
+def new_employee_entry(basic_info=None):
+    """建立空白的員工資料結構"""
+    entry = {'basic_info': basic_info if basic_info is not None else {}}
+    for kind in RECORD_KINDS:
+        entry[kind] = []
+    return entry
+
+
+@contextmanager
+def gc_paused():
+    """暫停循環垃圾回收
+
+    整批建立數十萬個記錄物件時，回收器會因配置次數一再啟動，
+    反覆掃描剛解析出來的大量字典；這些物件不會形成循環，建立完再恢復即可。
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class RecordStore:
+    """員工資料儲存區
+
+    employees 與原本的 employees_data 結構相同：
+    {employee_id: {basic_info: {}, performance_records: [], leave_requests: [], overtime_requests: []}}
+    所有新增、修改、刪除都必須透過本類別的方法進行，索引才會保持一致。
+    記錄進入 store 時會轉成 record_types 中的記錄物件，存取方式與字典相同。
+    記錄以 record_id 為鍵值，舊資料中沒有編號（或編號重複）的記錄會在載入時補上。
+    每次異動也會通知已註冊的監聽器（例如 SQLite 儲存後端）。
+    begin_provisional() 之後的整批載入在 commit 前不會寫入儲存後端，可整個還原。
+    """
+
+    def __init__(self):
+        self.employees = {}
+        self._listeners = []
+        # 會把異動寫入儲存後端的監聽器（日誌、資料庫），暫時性載入期間不通知
+        self._persistent = []
+        # 暫時性載入開始前的員工資料，不在暫時性載入中時為 None
+        self._rollback = None
+        self._reset_indexes()
+
+    # === 異動通知 ===
+    def add_listener(self, callback, persistent=False):
+        """註冊異動監聽器，callback(event) 會收到描述異動的字典
+
+        persistent=True 表示監聽器會把異動寫入儲存後端，暫時性載入期間不會收到通知。
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+        if persistent and callback not in self._persistent:
+            self._persistent.append(callback)
+
+    def remove_listener(self, callback):
+        """移除異動監聽器"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+        if callback in self._persistent:
+            self._persistent.remove(callback)
+
+    def _notify(self, op, **event):
+        if not self._listeners:
+            return
+        event['op'] = op
+        for callback in list(self._listeners):
+            if self._rollback is None or callback not in self._persistent:
+                callback(event)
+
+    # === 暫時性載入 ===
+    @property
+    def provisional(self):
+        """是否正在暫時性載入"""
+        return self._rollback is not None
+
+    def begin_provisional(self):
+        """開始暫時性的整批載入（例如串流讀取 JSON 檔案）
+
+        清空目前資料，之後以 extend 逐批加入，畫面可先顯示已讀到的員工；
+        期間的異動只通知一般監聽器，儲存後端維持原本的內容。
+        """
+        if self._rollback is not None:
+            raise RuntimeError("已在暫時性載入中")
+        # extend 只會換掉員工資料，不會修改原本的物件，保留淺層複本即可還原
+        self._rollback = self.employees.copy()
+        self.clear()
+
+    def commit_provisional(self):
+        """確認暫時性載入：以一次 load 通知讓儲存後端寫入載入後的資料"""
+        self._rollback = None
+        event = {'op': 'load', 'employees': self.employees}
+        for callback in list(self._persistent):
+            callback(event)
+
+    def rollback_provisional(self):
+        """放棄暫時性載入，還原開始前的資料（儲存後端未曾變動，不必寫入）"""
+        self.employees.clear()
+        self.employees.update(self._rollback)
+        self._rebuild_indexes()
+        self._notify('load', employees=self.employees)
+        self._rollback = None
+
+    def _reset_indexes(self):
+        """清空所有索引"""
+        # record_id -> (employee_id, record)
+        self._records = {kind: {} for kind in RECORD_KINDS}
+        # employee_id -> {key: record}
+        self._by_employee = {kind: {} for kind in RECORD_KINDS}
+        # status -> {key: record}
+        self._by_status = {kind: {} for kind in RECORD_KINDS}
+        # date -> {key: record}，另外保留排序後的日期清單供區間查詢
+        self._by_date = {kind: {} for kind in RECORD_KINDS}
+        self._sorted_dates = {kind: [] for kind in RECORD_KINDS}
+
+    # === 索引維護 ===
+    @staticmethod
+    def record_key(record):
+        """取得記錄在索引中的鍵值（record_id）"""
+        return record[RECORD_ID_FIELD]
+
+    @staticmethod
+    def _bucket_add(index, value, key, record):
+        bucket = index.get(value)
+        if bucket is None:
+            bucket = index[value] = {}
+        bucket[key] = record
+
+    @staticmethod
+    def _bucket_remove(index, value, key):
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del index[value]
+                return True
+        return False
+
+    def _date_add(self, kind, date_value, key, record):
+        if date_value not in self._by_date[kind]:
+            insort(self._sorted_dates[kind], date_value)
+        self._bucket_add(self._by_date[kind], date_value, key, record)
+
+    def _date_remove(self, kind, date_value, key):
+        if self._bucket_remove(self._by_date[kind], date_value, key):
+            dates = self._sorted_dates[kind]
+            pos = bisect_left(dates, date_value)
+            if pos < len(dates) and dates[pos] == date_value:
+                del dates[pos]
+
+    def _index_record(self, kind, employee_id, record):
+        # 舊檔案的記錄沒有編號，或複製而來的記錄編號重複時，補發新編號
+        key = record.get(RECORD_ID_FIELD)
+        if not key or key in self._records[kind]:
+            key = record[RECORD_ID_FIELD] = new_record_id()
+        self._records[kind][key] = (employee_id, record)
+        self._bucket_add(self._by_employee[kind], employee_id, key, record)
+        self._bucket_add(self._by_status[kind], record.get('status', ''), key, record)
+        self._date_add(kind, str(record.get(DATE_FIELDS[kind], '')), key, record)
+        return key
+
+    def _unindex_record(self, kind, key):
+        employee_id, record = self._records[kind].pop(key)
+        self._bucket_remove(self._by_employee[kind], employee_id, key)
+        self._bucket_remove(self._by_status[kind], record.get('status', ''), key)
+        self._date_remove(kind, str(record.get(DATE_FIELDS[kind], '')), key)
+        return employee_id, record
+
+    def _rebuild_indexes(self):
+        """依照目前的 employees 重建所有索引"""
+        self._reset_indexes()
+        for employee_id, employee_data in self.employees.items():
+            for kind in RECORD_KINDS:
+                for record in employee_data.get(kind, []):
+                    self._index_record(kind, employee_id, record)
+
+    # === 整批操作 ===
+    def load(self, employees):
+        """以新的資料取代目前內容，並補齊缺少的記錄清單"""
+        self.employees.clear()
+        with gc_paused():
+            for employee_id, employee_data in employees.items():
+                entry = new_employee_entry(employee_data.get('basic_info', {}))
+                for kind in RECORD_KINDS:
+                    entry[kind] = [to_record(kind, record) for record in employee_data.get(kind, [])]
+                self.employees[str(employee_id)] = entry
+            self._rebuild_indexes()
+        self._notify('load', employees=self.employees)
+
+    def extend(self, employees):
+        """整批加入完整的員工資料（含各類記錄），已存在的員工整筆取代
+
+        用於串流載入：每解析出一批員工就加入，不必等整個檔案讀完。
+        """
+        batch = {}
+        replaced = {}
+        with gc_paused():
+            for employee_id, employee_data in employees.items():
+                employee_id = str(employee_id)
+                old = self.employees.get(employee_id)
+                if old is not None:
+                    replaced[employee_id] = old
+                    for kind in RECORD_KINDS:
+                        for record in old.get(kind, []):
+                            self._unindex_record(kind, self.record_key(record))
+
+                entry = new_employee_entry(employee_data.get('basic_info', {}))
+                for kind in RECORD_KINDS:
+                    entry[kind] = [to_record(kind, record) for record in employee_data.get(kind, [])]
+                    for record in entry[kind]:
+                        self._index_record(kind, employee_id, record)
+                self.employees[employee_id] = entry
+                batch[employee_id] = entry
+        if batch:
+            self._notify('extend', employees=batch, replaced=replaced)
+
+    def load_records(self, kind, rows):
+        """附加從儲存後端延遲載入的記錄，rows 為 [(employee_id, record), ...]
+
+        這些記錄原本就存在於後端，因此發出的是 load_records 通知，
+        儲存後端與日誌不會把它們當成新的異動寫回。
+        """
+        loaded = []
+        with gc_paused():
+            for employee_id, record in rows:
+                employee = self.employees.get(employee_id)
+                if employee is None:
+                    continue
+                record = to_record(kind, record)
+                employee.setdefault(kind, []).append(record)
+                self._index_record(kind, employee_id, record)
+                loaded.append((employee_id, record))
+        self._notify('load_records', kind=kind, rows=loaded)
+
+    def clear(self):
+        """清空所有資料"""
+        self.employees.clear()
+        self._reset_indexes()
+        self._notify('clear')
+
+    def to_dict(self):
+        """取得可直接序列化為 JSON 的資料
+
+        記錄轉回只含字串與數字的平面字典，基本資料也另外複製一份，
+        回傳的內容與 store 不共用任何可變物件。
+        """
+        return {
+            employee_id: {
+                'basic_info': dict(entry.get('basic_info', {})),
+                **{kind: [record.to_dict() for record in entry.get(kind, [])] for kind in RECORD_KINDS},
+            }
+            for employee_id, entry in self.employees.items()
+        }
+
+    def snapshot(self):
+        """複製目前的資料，供背景執行緒使用（例如匯出）
+
+        之後主執行緒繼續修改也不會影響快照內容。
+        """
+        return self.to_dict()
+
+    # === 員工 ===
+    def put_employee(self, employee_id, basic_info, old_id=None):
+        """新增或更新員工基本資料；old_id 與 employee_id 不同時視為變更員工編號"""
+        if old_id and old_id != employee_id and old_id in self.employees:
+            entry = self.employees.pop(old_id)
+            self.employees[employee_id] = entry
+            for kind in RECORD_KINDS:
+                for record in entry[kind]:
+                    key = self.record_key(record)
+                    self._bucket_remove(self._by_employee[kind], old_id, key)
+                    self._bucket_add(self._by_employee[kind], employee_id, key, record)
+                    self._records[kind][key] = (employee_id, record)
+        else:
+            old_id = None
+            if employee_id not in self.employees:
+                self.employees[employee_id] = new_employee_entry()
+
+        self.employees[employee_id]['basic_info'] = basic_info
+        self._notify('put_employee', employee_id=employee_id, old_id=old_id, basic_info=basic_info)
+
+    def put_employees(self, items):
+        """整批新增或更新員工基本資料，items 為 [(employee_id, basic_info), ...]
+
+        只發出一次異動通知，儲存後端可以用單一交易寫入整批資料。
+        """
+        items = list(items)
+        if not items:
+            return
+        for employee_id, basic_info in items:
+            if employee_id not in self.employees:
+                self.employees[employee_id] = new_employee_entry()
+            self.employees[employee_id]['basic_info'] = basic_info
+        self._notify('put_employees', employees=items)
+
+    def delete_employee(self, employee_id):
+        """刪除員工及其所有記錄"""
+        entry = self.employees.pop(employee_id, None)
+        if entry is None:
+            return False
+        for kind in RECORD_KINDS:
+            for record in entry.get(kind, []):
+                self._unindex_record(kind, self.record_key(record))
+        self._notify('delete_employee', employee_id=employee_id, entry=entry)
+        return True
+
+    def employee_name(self, employee_id):
+        """取得員工姓名"""
+        employee = self.employees.get(employee_id)
+        if not employee:
+            return ''
+        return employee.get('basic_info', {}).get('name', '')
+
+    # === 記錄 ===
+    def add_record(self, kind, employee_id, record):
+        """新增一筆記錄，回傳索引鍵值"""
+        employee = self.employees.get(employee_id)
+        if employee is None:
+            raise KeyError(employee_id)
+        record = to_record(kind, record)
+        employee.setdefault(kind, []).append(record)
+        key = self._index_record(kind, employee_id, record)
+        self._notify('add_record', kind=kind, employee_id=employee_id, key=key, record=record)
+        return key
+
+    def get_record(self, kind, key):
+        """依鍵值取得 (employee_id, record)"""
+        return self._records[kind].get(key)
+
+    def update_record(self, kind, key, changes):
+        """修改記錄欄位並更新索引"""
+        employee_id, record = self._records[kind][key]
+        old_status = record.get('status', '')
+        date_field = DATE_FIELDS[kind]
+        old_date = str(record.get(date_field, ''))
+        old_record = dict(record)
+
+        record.update(changes)
+
+        new_status = record.get('status', '')
+        if new_status != old_status:
+            self._bucket_remove(self._by_status[kind], old_status, key)
+            self._bucket_add(self._by_status[kind], new_status, key, record)
+
+        new_date = str(record.get(date_field, ''))
+        if new_date != old_date:
+            self._date_remove(kind, old_date, key)
+            self._date_add(kind, new_date, key, record)
+
+        self._notify('update_record', kind=kind, employee_id=employee_id, key=key,
+                     record=record, old_record=old_record)
+        return key
+
+    def set_status(self, kind, key, status):
+        """更新記錄狀態"""
+        return self.update_record(kind, key, {'status': status})
+
+    def delete_record(self, kind, key):
+        """刪除一筆記錄"""
+        employee_id, record = self._unindex_record(kind, key)
+        index = self._position(kind, employee_id, record)
+        if index is not None:
+            del self.employees[employee_id][kind][index]
+        self._notify('delete_record', kind=kind, employee_id=employee_id, key=key,
+                     index=index, record=record)
+        return employee_id, record
+
+    def _position(self, kind, employee_id, record):
+        """記錄在員工記錄清單中的位置"""
+        for i, item in enumerate(self.employees[employee_id][kind]):
+            if item is record:
+                return i
+        return None
+
+    def records_of(self, kind, employee_id):
+        """取得某位員工的記錄清單（依新增順序）"""
+        employee = self.employees.get(employee_id)
+        if not employee:
+            return []
+        return employee.get(kind, [])
+
+    # === 查詢 ===
+    def _date_range_bucket(self, kind, date_from, date_to):
+        dates = self._sorted_dates[kind]
+        lo = bisect_left(dates, date_from) if date_from else 0
+        hi = bisect_right(dates, date_to) if date_to else len(dates)
+        result = {}
+        for date_value in dates[lo:hi]:
+            result.update(self._by_date[kind][date_value])
+        return result
+
+    def query(self, kind, employee_id=None, status=None, date_from=None, date_to=None):
+        """依條件查詢記錄，回傳 [(employee_id, record), ...]"""
+        records = self._records[kind]
+        return [records[key] for key in
+                self.query_keys(kind, employee_id, status, date_from, date_to)]
+
+    def query_keys(self, kind, employee_id=None, status=None, date_from=None, date_to=None):
+        """依條件查詢記錄鍵值
+
+        各條件先取對應的索引，從最小的候選集合開始比對其他條件，
+        不再逐一掃描所有員工的所有記錄。
+        """
+        candidates = []
+        if employee_id is not None:
+            candidates.append(self._by_employee[kind].get(employee_id, {}))
+        if status is not None:
+            candidates.append(self._by_status[kind].get(status, {}))
+        if date_from or date_to:
+            candidates.append(self._date_range_bucket(kind, date_from, date_to))
+
+        if not candidates:
+            return list(self._records[kind])
+
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        return [key for key in smallest if all(key in other for other in others)]
+
+    def count(self, kind, employee_id=None, status=None):
+        """計算符合條件的記錄筆數"""
+        if employee_id is None and status is None:
+            return len(self._records[kind])
+        return len(self.query_keys(kind, employee_id=employee_id, status=status))
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記錄型別模組
+考績、請假、加班記錄改用 __slots__ 類別保存：日期存成序數（date.toordinal），
+天數／時數存成浮點數，統計時不必再解析字串；
+同時提供與原本字典相同的存取方式，並可無損地轉回原本的 JSON 結構
+"""
+
+from datetime import date
+from functools import lru_cache
+
+
+# 欄位型別
+TEXT = 'text'
+DATE = 'date'
+NUMBER = 'number'
+
+# 欄位不存在的標記（欄位值本身可能是 None）
+_MISSING = object()
+
+
+def parse_date(value):
+    """'YYYY-MM-DD' 字串轉成序數，無法轉換或格式不標準時回傳 None"""
+    if type(value) is not str or len(value) != 10:
+        return None
+    return _parse_date_text(value)
+
+
+# 同一天的記錄很多，日期字串與序數的轉換結果重複使用
+@lru_cache(maxsize=16384)
+def _parse_date_text(value):
+    try:
+        parsed = date.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed.toordinal()
+
+
+@lru_cache(maxsize=16384)
+def format_date(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+def parse_number(value):
+    """數字字串轉成浮點數，轉回字串後與原值不同時回傳 None（保留原值）"""
+    if type(value) is not str:
+        return None
+    return _parse_number_text(value)
+
+
+# 天數、時數的寫法種類很少，轉換結果重複使用
+@lru_cache(maxsize=4096)
+def _parse_number_text(value):
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    if number != number or format_number(number) != value:
+        return None
+    return number
+
+
+def format_number(number):
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+# 欄位型別 -> 轉換函式（文字欄位不轉換）
+PARSERS = {TEXT: None, DATE: parse_date, NUMBER: parse_number}
+
+
+def field_parsers(fields):
+    """由 FIELDS 產生 from_dict 使用的 ((欄位名稱, 轉換函式), ...)"""
+    return tuple((field, PARSERS[kind]) for field, kind in fields)
+
+
+class TypedRecord:
+    """記錄基底類別
+
+    FIELDS 為 ((欄位名稱, 型別), ...)，每個欄位各佔一個 slot：
+    - TEXT：原值
+    - DATE：日期序數
+    - NUMBER：浮點數
+    沒有出現在原始資料中的欄位，其 slot 保持未設定；
+    日期或數字無法以標準格式還原的值（例如空字串、'3.50'）原樣存在 _raw，
+    FIELDS 以外的欄位存在 _extra，因此 to_dict() 一定與原始資料相同。
+
+    get / [] / in / keys / items / update 的行為與原本的字典相同，
+    取得的是 JSON 結構中的值；typed() 則取得型別化的值供統計使用。
+    """
+
+    __slots__ = ('_raw', '_extra')
+    FIELDS = ()
+    _KINDS = {}
+    _PARSERS = ()
+
+    def __init__(self, data=None):
+        self._raw = None
+        self._extra = None
+        if data:
+            self.update(data)
+
+    @classmethod
+    def from_dict(cls, data):
+        """由 JSON 結構的字典建立記錄（已是記錄物件時直接回傳）
+
+        載入大量記錄時使用：依 FIELDS 逐欄直接設定 slot，
+        不經過 __setitem__ 的逐欄判斷，結果與 cls(data) 相同。
+        """
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, dict):
+            return cls(data)
+
+        record = cls.__new__(cls)
+        raw = None
+        found = 0
+        get = data.get
+        for field, parse in cls._PARSERS:
+            value = get(field, _MISSING)
+            if value is _MISSING:
+                continue
+            found += 1
+            if parse is None:
+                setattr(record, field, value)
+                continue
+            parsed = parse(value)
+            if parsed is None:
+                if raw is None:
+                    raw = {}
+                raw[field] = value
+            else:
+                setattr(record, field, parsed)
+        record._raw = raw
+        record._extra = None
+        if found < len(data):
+            kinds = cls._KINDS
+            record._extra = {field: value for field, value in data.items() if field not in kinds}
+        return record
+
+    def to_dict(self):
+        """轉回 JSON 結構的字典"""
+        return {key: self[key] for key in self.keys()}
+
+    # === 型別化存取 ===
+    def typed(self, field, default=None):
+        """取得欄位的型別化值（日期為序數、數字為浮點數），沒有值時回傳 default"""
+        if self._KINDS.get(field) is None:
+            return self.get(field, default)
+        return getattr(self, field, default)
+
+    # === 與字典相同的介面 ===
+    def __setitem__(self, field, value):
+        kind = self._KINDS.get(field)
+        if kind is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[field] = value
+            return
+
+        if self._raw is not None:
+            self._raw.pop(field, None)
+        if kind == TEXT:
+            setattr(self, field, value)
+            return
+
+        parsed = parse_date(value) if kind == DATE else parse_number(value)
+        if parsed is None:
+            # 無法以標準格式還原的值保留原樣
+            if hasattr(self, field):
+                delattr(self, field)
+            if self._raw is None:
+                self._raw = {}
+            self._raw[field] = value
+        else:
+            setattr(self, field, parsed)
+
+    def __getitem__(self, field):
+        kind = self._KINDS.get(field)
+        if kind is None:
+            if self._extra is None:
+                raise KeyError(field)
+            return self._extra[field]
+        if self._raw is not None and field in self._raw:
+            return self._raw[field]
+        try:
+            value = getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+        if kind == DATE:
+            return format_date(value)
+        if kind == NUMBER:
+            return format_number(value)
+        return value
+
+    def get(self, field, default=None):
+        # 文字欄位直接讀 slot（索引維護時大量呼叫）
+        if self._KINDS.get(field) == TEXT:
+            return getattr(self, field, default)
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def __contains__(self, field):
+        kind = self._KINDS.get(field)
+        if kind is None:
+            return self._extra is not None and field in self._extra
+        return hasattr(self, field) or (self._raw is not None and field in self._raw)
+
+    def keys(self):
+        keys = [field for field, _ in self.FIELDS if field in self]
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def update(self, data):
+        for field, value in data.items():
+            self[field] = value
+
+    def copy(self):
+        return type(self)(self.to_dict())
+
+    def __eq__(self, other):
+        if isinstance(other, TypedRecord):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class PerformanceRecord(TypedRecord):
+    """考績記錄"""
+    FIELDS = (
+        ('record_id', TEXT),
+        ('year', TEXT),
+        ('first_half', TEXT),
+        ('second_half', TEXT),
+        ('annual_rating', TEXT),
+        ('remarks', TEXT),
+    )
+    __slots__ = tuple(field for field, _ in FIELDS)
+    _KINDS = dict(FIELDS)
+    _PARSERS = field_parsers(FIELDS)
+
+
+class LeaveRequest(TypedRecord):
+    """請假申請"""
+    FIELDS = (
+        ('record_id', TEXT),
+        ('leave_type', TEXT),
+        ('start_date', DATE),
+        ('end_date', DATE),
+        ('days', NUMBER),
+        ('apply_date', DATE),
+        ('status', TEXT),
+        ('reason', TEXT),
+    )
+    __slots__ = tuple(field for field, _ in FIELDS)
+    _KINDS = dict(FIELDS)
+    _PARSERS = field_parsers(FIELDS)
+
+
+class OvertimeRequest(TypedRecord):
+    """加班申請"""
+    FIELDS = (
+        ('record_id', TEXT),
+        ('overtime_date', DATE),
+        ('start_time', TEXT),
+        ('end_time', TEXT),
+        ('hours', NUMBER),
+        ('overtime_type', TEXT),
+        ('apply_date', DATE),
+        ('status', TEXT),
+        ('reason', TEXT),
+    )
+    __slots__ = tuple(field for field, _ in FIELDS)
+    _KINDS = dict(FIELDS)
+    _PARSERS = field_parsers(FIELDS)
+
+
+# 記錄類別 -> 記錄型別
+RECORD_TYPES = {
+    'performance_records': PerformanceRecord,
+    'leave_requests': LeaveRequest,
+    'overtime_requests': OvertimeRequest,
+}
+
+
+def to_record(kind, data):
+    """將 JSON 結構的字典轉成對應的記錄物件"""
+    return RECORD_TYPES[kind].from_dict(data)
+
+
+def to_json(value):
+    """供 json.dumps(default=...) 使用，將記錄物件轉回字典"""
+    if isinstance(value, TypedRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
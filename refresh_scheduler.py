@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+畫面刷新排程模組
+資料異動時只把受影響的畫面標記為需要刷新，
+等 Tk 事件佇列清空（after_idle）時每個畫面只重繪一次；
+連續多筆異動或整批匯入因此不會重複重建同一個表格
+"""
+
+
+class RefreshScheduler:
+    """合併畫面刷新
+
+    register() 登記畫面名稱與刷新函式，可另給 is_visible 判斷畫面目前是否顯示；
+    看不到的畫面保持待刷新，切換到該頁籤時再呼叫 schedule() 刷新。
+    hold() / release() 之間（例如背景匯入進行中）只累積標記，release 後才刷新。
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._views = {}          # 名稱 -> (刷新函式, is_visible)，依登記順序刷新
+        self._dirty = set()
+        self._scheduled = False
+        self._held = 0
+
+    def register(self, name, refresh, is_visible=None):
+        self._views[name] = (refresh, is_visible)
+
+    def mark(self, *names):
+        """標記畫面需要刷新（未指定名稱時標記全部）"""
+        self._dirty.update(names or self._views)
+        self.schedule()
+
+    def schedule(self):
+        """有待刷新的畫面時，安排在閒置時刷新一次"""
+        if self._dirty and not self._scheduled and not self._held:
+            self._scheduled = True
+            self.root.after_idle(self.flush)
+
+    def hold(self):
+        self._held += 1
+
+    def release(self):
+        self._held = max(self._held - 1, 0)
+        self.schedule()
+
+    def flush(self):
+        """立即刷新所有待刷新且目前顯示中的畫面"""
+        self._scheduled = False
+        if self._held:
+            return
+        for name, (refresh, is_visible) in self._views.items():
+            if name in self._dirty and (is_visible is None or is_visible()):
+                self._dirty.discard(name)
+                refresh()
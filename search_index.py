@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+員工搜尋索引模組
+對員工編號、姓名、身分證字號、電話、部門做前綴與任意子字串搜尋（不分大小寫），
+中文欄位另建單字與雙字（n-gram）索引縮小比對範圍；
+掛在 RecordStore 的異動監聽上隨資料增量更新
+"""
+
+from array import array
+
+
+# 納入搜尋的基本資料欄位（員工編號取自 store 的鍵）
+SEARCH_FIELDS = ('name', 'id_number', 'phone', 'department')
+
+# 欄位之間的分隔字元，不會出現在查詢字串中，因此比對不會跨欄位
+SEPARATOR = '\x1f'
+
+
+def search_text(employee_id, basic_info):
+    """員工的搜尋字串：各欄位轉小寫後以分隔字元串接（開頭也有分隔字元，方便判斷前綴）"""
+    values = [str(employee_id)] + [str(basic_info.get(field) or '') for field in SEARCH_FIELDS]
+    return SEPARATOR + SEPARATOR.join(value.casefold() for value in values)
+
+
+def indexed_grams(text):
+    """字串中需要建索引的單字與雙字
+
+    只取含非 ASCII 字元的欄位（姓名、部門等中文欄位）：
+    員工編號、身分證字號、電話幾乎每個人都含有相同的英數字組合，
+    這些字組的文件清單涵蓋全部員工，建索引也無法縮小範圍，直接逐筆比對即可。
+    """
+    grams = set()
+    for value in text.split(SEPARATOR):
+        if not value.isascii():
+            grams.update(value)
+            grams.update(map(str.__add__, value, value[1:]))
+    return grams
+
+
+class EmployeeSearchIndex:
+    """員工搜尋索引
+
+    每位員工對應一個文件編號，索引為 {單字或雙字: array(文件編號)}。
+    查詢字串含中文時，取出現次數最少的單字或雙字，只比對它的文件清單；
+    純英數字的查詢則逐筆比對所有搜尋字串（Python 的子字串比對夠快）。
+    員工資料異動時舊文件只標記作廢、新文件附加到尾端，
+    作廢的文件過多時下次查詢前整個重建。索引在第一次查詢時才建立。
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._dirty = True
+        store.add_listener(self._on_change)
+
+    # === 建立與維護 ===
+    def rebuild(self):
+        self._texts = []          # 文件編號 -> 搜尋字串（作廢為空字串）
+        self._owners = []         # 文件編號 -> 員工編號
+        self._ranks = []          # 文件編號 -> 員工在 store 中的先後順序
+        self._doc_of = {}         # 員工編號 -> 文件編號
+        self._postings = {}
+        self._next_rank = 0
+        self._dead = 0
+        self._in_order = True     # 文件順序是否與 store 中的順序一致
+        for employee_id, entry in self.store.employees.items():
+            self._add(employee_id, entry.get('basic_info', {}))
+        self._dirty = False
+
+    def _add(self, employee_id, basic_info):
+        old = self._doc_of.get(employee_id)
+        if old is None:
+            rank = self._next_rank
+            self._next_rank += 1
+        else:
+            # 更新既有員工：store 中的位置不變，但新文件排在尾端
+            rank = self._ranks[old]
+            self._texts[old] = ''
+            self._dead += 1
+            self._in_order = False
+
+        doc = len(self._texts)
+        text = search_text(employee_id, basic_info)
+        self._texts.append(text)
+        self._owners.append(employee_id)
+        self._ranks.append(rank)
+        self._doc_of[employee_id] = doc
+        postings = self._postings
+        for gram in indexed_grams(text):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array('i')
+            posting.append(doc)
+
+    def _remove(self, employee_id):
+        doc = self._doc_of.pop(employee_id, None)
+        if doc is not None:
+            self._texts[doc] = ''
+            self._dead += 1
+
+    def _put(self, employee_id):
+        entry = self.store.employees.get(employee_id)
+        if entry is None:
+            self._remove(employee_id)
+        else:
+            self._add(employee_id, entry.get('basic_info', {}))
+
+    def _on_change(self, event):
+        if event.get('kind') is not None or self._dirty:
+            # 記錄異動不影響搜尋欄位；索引尚未建立時等查詢時再整個建立
+            return
+        op = event['op']
+        if op in ('load', 'clear'):
+            self._dirty = True
+        elif op == 'extend':
+            for employee_id in event['employees']:
+                self._put(employee_id)
+        elif op == 'put_employee':
+            if event['old_id']:
+                self._remove(event['old_id'])
+            self._put(event['employee_id'])
+        elif op == 'put_employees':
+            for employee_id, _ in event['employees']:
+                self._put(employee_id)
+        elif op == 'delete_employee':
+            self._remove(event['employee_id'])
+
+        if self._dead > 1000 and self._dead * 2 > len(self._texts):
+            self._dirty = True
+
+    # === 查詢 ===
+    def _candidates(self, terms):
+        """需要比對的文件編號：查詢含中文時為出現次數最少的字組的文件清單，否則為 None（全部比對）"""
+        best = None
+        for term in terms:
+            for gram in indexed_grams(term):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return ()
+                if best is None or len(posting) < len(best):
+                    best = posting
+        return best
+
+    def search(self, query, within=None):
+        """搜尋員工，回傳符合的員工編號清單
+
+        query 以空白分隔多個字詞時，每個字詞都必須符合；
+        任一欄位以第一個字詞開頭的員工排在前面，其餘依 store 中的順序。
+        query 為空白時回傳全部員工。
+        within 為上一次查詢的結果時只在其中比對：使用者接著輸入時，
+        較長的查詢字串的結果必定包含在較短字串的結果中，不必再掃描全部員工。
+        """
+        terms = query.casefold().split()
+        if not terms:
+            return list(self.store.employees)
+        if self._dirty:
+            self.rebuild()
+
+        texts = self._texts
+        term = terms[0]
+        candidates = self._candidates(terms)
+        if within is not None:
+            doc_of = self._doc_of
+            docs = [doc_of[employee_id] for employee_id in within if employee_id in doc_of]
+            docs = [doc for doc in docs if term in texts[doc]]
+        elif candidates is None:
+            docs = [doc for doc, text in enumerate(texts) if term in text]
+        else:
+            docs = [doc for doc in candidates if term in texts[doc]]
+        for term in terms[1:]:
+            docs = [doc for doc in docs if term in texts[doc]]
+
+        prefix = SEPARATOR + terms[0]
+        first = [doc for doc in docs if prefix in texts[doc]]
+        rest = [doc for doc in docs if prefix not in texts[doc]] if len(first) < len(docs) else []
+        if not self._in_order or within is not None:
+            first.sort(key=self._ranks.__getitem__)
+            rest.sort(key=self._ranks.__getitem__)
+
+        owners = self._owners
+        return [owners[doc] for doc in first] + [owners[doc] for doc in rest]
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 儲存後端
+以 WAL 模式的 SQLite 資料庫保存員工資料，每次異動只寫入一個小交易，
+並可依頁籤需要分批載入各類記錄
+"""
+
+import json
+import sqlite3
+
+from record_store import RECORD_KINDS, DATE_FIELDS, RECORD_ID_FIELD, new_employee_entry, new_record_id
+from record_types import to_json
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS basic_info (
+    employee_id TEXT PRIMARY KEY,
+    data        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS performance_records (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id   TEXT,
+    employee_id TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT '',
+    year        TEXT NOT NULL DEFAULT '',
+    data        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leave_requests (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id   TEXT,
+    employee_id TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT '',
+    start_date  TEXT NOT NULL DEFAULT '',
+    data        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS overtime_requests (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id     TEXT,
+    employee_id   TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT '',
+    overtime_date TEXT NOT NULL DEFAULT '',
+    data          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_perf_employee ON performance_records(employee_id);
+CREATE INDEX IF NOT EXISTS idx_leave_employee ON leave_requests(employee_id);
+CREATE INDEX IF NOT EXISTS idx_leave_status ON leave_requests(status);
+CREATE INDEX IF NOT EXISTS idx_overtime_employee ON overtime_requests(employee_id);
+CREATE INDEX IF NOT EXISTS idx_overtime_status ON overtime_requests(status);
+"""
+
+# 需在補齊 record_id 之後才能建立的唯一索引
+RECORD_ID_INDEXES = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_perf_record ON performance_records(record_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_leave_record ON leave_requests(record_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_overtime_record ON overtime_requests(record_id);
+"""
+
+# PRAGMA user_version：0 = 記錄沒有 record_id 的舊版資料庫
+SCHEMA_VERSION = 1
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=to_json)
+
+
+class SQLiteStorage:
+    """SQLite 儲存後端
+
+    透過 RecordStore.add_listener(storage.apply_change) 掛上後，
+    store 的每一次異動都會以單一交易寫入資料庫。
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.conn = sqlite3.connect(file_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._migrate()
+        self.conn.executescript(RECORD_ID_INDEXES)
+        self.conn.commit()
+
+        # 尚未載入到 store 的記錄類別
+        self.pending_kinds = set(RECORD_KINDS)
+
+    def _migrate(self):
+        """將舊版資料庫升級：補上 record_id 欄位，並為每筆記錄產生編號"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        with self.conn:
+            for kind in RECORD_KINDS:
+                columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({kind})")}
+                if 'record_id' not in columns:
+                    self.conn.execute(f"ALTER TABLE {kind} ADD COLUMN record_id TEXT")
+
+                rows = self.conn.execute(
+                    f"SELECT id, data FROM {kind} WHERE record_id IS NULL").fetchall()
+                for row_id, data in rows:
+                    record = json.loads(data)
+                    record[RECORD_ID_FIELD] = new_record_id()
+                    self.conn.execute(f"UPDATE {kind} SET record_id = ?, data = ? WHERE id = ?",
+                                      (record[RECORD_ID_FIELD], _dumps(record), row_id))
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        """關閉資料庫連線"""
+        self.conn.close()
+
+    def is_empty(self):
+        """資料庫中是否沒有任何員工"""
+        return self.conn.execute("SELECT 1 FROM basic_info LIMIT 1").fetchone() is None
+
+    # === 載入 ===
+    def load_employees(self):
+        """只載入員工基本資料，各類記錄留待 load_records 依需要載入"""
+        employees = {}
+        for employee_id, data in self.conn.execute(
+                "SELECT employee_id, data FROM basic_info ORDER BY rowid"):
+            employees[employee_id] = new_employee_entry(json.loads(data))
+        self.pending_kinds = set(RECORD_KINDS)
+        return employees
+
+    def load_records(self, kind):
+        """載入某一類記錄，回傳 [(employee_id, record), ...]"""
+        rows = [(employee_id, json.loads(data)) for employee_id, data in self.conn.execute(
+            f"SELECT employee_id, data FROM {kind} ORDER BY id")]
+        self.pending_kinds.discard(kind)
+        return rows
+
+    # === 寫入 ===
+    def apply_change(self, event):
+        """RecordStore 異動監聽器：將一筆異動寫成一個交易"""
+        handler = getattr(self, '_on_' + event['op'], None)
+        if handler is None:
+            return
+        with self.conn:
+            handler(event)
+
+    def _upsert_record(self, kind, employee_id, record):
+        date_field = DATE_FIELDS[kind]
+        self.conn.execute(
+            f"INSERT INTO {kind} (record_id, employee_id, status, {date_field}, data) VALUES (?, ?, ?, ?, ?) "
+            f"ON CONFLICT(record_id) DO UPDATE SET employee_id = excluded.employee_id, "
+            f"status = excluded.status, {date_field} = excluded.{date_field}, data = excluded.data",
+            (record[RECORD_ID_FIELD], employee_id, record.get('status', ''),
+             str(record.get(date_field, '')), _dumps(record)))
+
+    def _on_put_employee(self, event):
+        employee_id, old_id = event['employee_id'], event['old_id']
+        if old_id:
+            self.conn.execute("UPDATE basic_info SET employee_id = ? WHERE employee_id = ?",
+                              (employee_id, old_id))
+            for kind in RECORD_KINDS:
+                self.conn.execute(f"UPDATE {kind} SET employee_id = ? WHERE employee_id = ?",
+                                  (employee_id, old_id))
+        self.conn.execute(
+            "INSERT INTO basic_info (employee_id, data) VALUES (?, ?) "
+            "ON CONFLICT(employee_id) DO UPDATE SET data = excluded.data",
+            (employee_id, _dumps(event['basic_info'])))
+
+    def _on_put_employees(self, event):
+        self.conn.executemany(
+            "INSERT INTO basic_info (employee_id, data) VALUES (?, ?) "
+            "ON CONFLICT(employee_id) DO UPDATE SET data = excluded.data",
+            ((employee_id, _dumps(basic_info)) for employee_id, basic_info in event['employees']))
+
+    def _on_extend(self, event):
+        employees = event['employees']
+        for kind in RECORD_KINDS:
+            self.conn.executemany(f"DELETE FROM {kind} WHERE employee_id = ?",
+                                  ((employee_id,) for employee_id in employees))
+        self._write_all(employees)
+
+    def _on_delete_employee(self, event):
+        employee_id = event['employee_id']
+        self.conn.execute("DELETE FROM basic_info WHERE employee_id = ?", (employee_id,))
+        for kind in RECORD_KINDS:
+            self.conn.execute(f"DELETE FROM {kind} WHERE employee_id = ?", (employee_id,))
+
+    def _on_add_record(self, event):
+        self._upsert_record(event['kind'], event['employee_id'], event['record'])
+
+    def _on_update_record(self, event):
+        self._upsert_record(event['kind'], event['employee_id'], event['record'])
+
+    def _on_delete_record(self, event):
+        self.conn.execute(f"DELETE FROM {event['kind']} WHERE record_id = ?", (event['key'],))
+
+    def _on_clear(self, event):
+        self._delete_all()
+
+    def _on_load(self, event):
+        # 整批載入（例如從 JSON 檔案載入）時以新資料取代資料庫內容
+        self._delete_all()
+        self._write_all(event['employees'])
+
+    def _delete_all(self):
+        self.conn.execute("DELETE FROM basic_info")
+        for kind in RECORD_KINDS:
+            self.conn.execute(f"DELETE FROM {kind}")
+        self.pending_kinds.clear()
+
+    def _write_all(self, employees):
+        self.conn.executemany(
+            "INSERT INTO basic_info (employee_id, data) VALUES (?, ?) "
+            "ON CONFLICT(employee_id) DO UPDATE SET data = excluded.data",
+            ((employee_id, _dumps(data.get('basic_info', {}))) for employee_id, data in employees.items()))
+        for employee_id, data in employees.items():
+            for kind in RECORD_KINDS:
+                for record in data.get(kind, []):
+                    self._upsert_record(kind, employee_id, record)
+
+    def replace_all(self, employees):
+        """以目前記憶體中的資料覆寫整個資料庫"""
+        with self.conn:
+            self._delete_all()
+            self._write_all(employees)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批次匯入多個 Excel 檔案
+以行程池平行解析資料夾（或萬用字元路徑）中的活頁簿，依員工編號合併後列出各檔案的耗時與錯誤；
+加上 --compare 時另以單一行程執行一次，比較平行處理的加速倍數
+
+用法：
+    python support/bulk_import.py 分公司資料夾 [--sheet 請假記錄] [--workers 4] [--compare]
+    python support/bulk_import.py --generate 16 --rows 20000 --compare   （產生測試檔案後匯入）
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_PATH)
+
+from excel_handler import bulk_read_excel
+
+
+def generate_workbooks(directory, count, rows):
+    """產生 count 個各有 rows 列請假記錄的測試檔案"""
+    import openpyxl
+
+    random.seed(0)
+    for index in range(count):
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.title = "請假記錄"
+        worksheet.append(["員工編號", "姓名", "請假類型", "開始日期", "請假天數", "狀態"])
+        for row in range(rows):
+            employee = random.randint(1, 5000)
+            worksheet.append([f"EMP{employee:05d}", f"員工{employee}", random.choice(["年假", "病假", "事假"]),
+                              f"2024-{row % 12 + 1:02d}-{row % 28 + 1:02d}", random.choice([0.5, 1, 2]),
+                              random.choice(["待審核", "已核准", "已拒絕"])])
+        workbook.save(os.path.join(directory, f"分公司_{index + 1:02d}.xlsx"))
+
+
+def run(source, sheet_name, workers):
+    result = bulk_read_excel(source, sheet_name, max_workers=workers)
+    files = result['files']
+    failed = [report for report in files if report['error']]
+    rows = sum(report['rows'] for report in files)
+    busy = sum(report['seconds'] for report in files)
+    print(f"📊 {len(files)} 個檔案（失敗 {len(failed)} 個），{rows} 筆記錄，{len(result['employees'])} 位員工")
+    print(f"⏱️ 總耗時 {result['seconds']:.2f} 秒（各檔案解析時間合計 {busy:.2f} 秒）")
+    return result['seconds']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="平行批次匯入 Excel 檔案")
+    parser.add_argument('source', nargs='?', help="資料夾或萬用字元路徑")
+    parser.add_argument('--sheet', help="工作表名稱（預設為作用中的工作表）")
+    parser.add_argument('--workers', type=int, default=None, help="行程數（預設為 CPU 核心數）")
+    parser.add_argument('--compare', action='store_true', help="另以單一行程執行一次並比較")
+    parser.add_argument('--generate', type=int, default=0, help="產生指定數量的測試檔案後匯入")
+    parser.add_argument('--rows', type=int, default=20000, help="每個測試檔案的資料列數")
+    args = parser.parse_args()
+
+    temp_dir = None
+    source = args.source
+    if args.generate:
+        temp_dir = tempfile.mkdtemp(prefix='bulk_import_')
+        print(f"產生 {args.generate} 個測試檔案（每個 {args.rows} 列）：{temp_dir}")
+        generate_workbooks(temp_dir, args.generate, args.rows)
+        source = temp_dir
+    elif not source:
+        parser.error("請指定資料夾或萬用字元路徑，或使用 --generate")
+
+    try:
+        print(f"\n── 平行處理（{args.workers or os.cpu_count()} 個行程）──")
+        parallel = run(source, args.sheet, args.workers)
+        if args.compare:
+            print("\n── 單一行程 ──")
+            serial = run(source, args.sheet, 1)
+            print(f"\n🚀 加速 {serial / parallel:.1f} 倍")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+冷啟動效能測試
+每次以新的 Python 行程匯入主程式模組（python -X importtime），
+列出匯入總耗時、最慢的模組，並檢查 openpyxl、NumPy 等較慢的套件是否已延遲載入
+
+用法：python support/cold_start_benchmark.py [--runs 5] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (名稱, 匯入的模組, 執行目錄)
+TARGETS = (
+    ("員工表單系統 main2.py", 'main2', BASE_PATH),
+    ("Excel處理模組 excel_handler.py", 'excel_handler', BASE_PATH),
+    ("ETEsys main.py", 'main', os.path.join(BASE_PATH, 'ETEsys')),
+)
+
+# 應該延遲到第一次使用才載入的套件
+DEFERRED = ('openpyxl', 'numpy')
+
+# 作為對照：延遲載入的模組本身需要多少時間
+REFERENCE = (
+    ("openpyxl", 'openpyxl', BASE_PATH),
+    ("excel_export（含 openpyxl）", 'excel_export', BASE_PATH),
+    ("numpy", 'numpy', BASE_PATH),
+)
+
+
+def run_importtime(module, cwd):
+    """以新行程匯入模組，回傳 [(模組, 自身微秒, 累計微秒, 層級)]；匯入失敗時丟出 RuntimeError"""
+    env = dict(os.environ, PYTHONPATH=cwd)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True, encoding='utf-8', errors='replace'
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def direct_imports(entries, module):
+    """模組本身與它直接匯入的模組：importtime 先列出子模組再列出上層模組"""
+    for index in range(len(entries) - 1, -1, -1):
+        name, _, _, depth = entries[index]
+        if name == module and depth == 0:
+            break
+    else:
+        return None, []
+    children = []
+    for entry in reversed(entries[:index]):
+        if entry[3] == 0:
+            break
+        if entry[3] == 1:
+            children.append(entry)
+    return entries[index], children
+
+
+def measure(module, cwd, runs):
+    """執行多次，回傳 (每次匯入該模組的累計耗時（毫秒，不含直譯器啟動）, 最後一次的明細)"""
+    totals = []
+    entries = []
+    for _ in range(runs):
+        entries = run_importtime(module, cwd)
+        target, _ = direct_imports(entries, module)
+        totals.append(target[2] / 1000 if target else 0.0)
+    return totals, entries
+
+
+def report(title, module, cwd, runs, top):
+    try:
+        totals, entries = measure(module, cwd, runs)
+    except RuntimeError as e:
+        print(f"❌ {title}：匯入失敗（{e}）")
+        return
+
+    print(f"\n📦 {title}")
+    print(f"   匯入總耗時：中位數 {statistics.median(totals):.1f} ms"
+          f"（最短 {min(totals):.1f} ms，最長 {max(totals):.1f} ms，共 {runs} 次）")
+
+    _, children = direct_imports(entries, module)
+    packages = sorted(children, key=lambda entry: -entry[2])
+    print(f"   最慢的 {top} 個直接匯入（累計）：")
+    for name, _, cumulative_us, _ in packages[:top]:
+        print(f"     {cumulative_us / 1000:8.1f} ms  {name}")
+
+    loaded = {name.split('.')[0] for name, _, _, _ in entries}
+    for package in DEFERRED:
+        status = "⚠️ 啟動時已載入" if package in loaded else "✅ 已延遲載入"
+        print(f"   {package}：{status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="冷啟動匯入時間測試")
+    parser.add_argument('--runs', type=int, default=5, help="每個模組執行的次數")
+    parser.add_argument('--top', type=int, default=15, help="列出最慢的模組數量")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}：{sys.executable}")
+    for title, module, cwd in TARGETS:
+        report(title, module, cwd, args.runs, args.top)
+
+    print("\n── 對照：延遲載入的模組 ──")
+    for title, module, cwd in REFERENCE:
+        try:
+            totals, _ = measure(module, cwd, args.runs)
+        except RuntimeError as e:
+            print(f"❌ {title}：匯入失敗（{e}）")
+            continue
+        print(f"   {title}：中位數 {statistics.median(totals):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
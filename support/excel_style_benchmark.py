@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 樣式效能測試
+比較 ExcelHandler 寫入大量資料列時，逐格設定 Font/Fill/Alignment/Border（舊作法）
+與以註冊好的具名樣式（NamedStyle）套用、狀態底色改由工作表條件格式規則決定的耗時，
+以及存檔後的檔案與 styles.xml 大小
+
+用法：python support/excel_style_benchmark.py [--rows 200000] [--no-save]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_PATH)
+
+from excel_handler import ExcelHandler
+
+
+HEADERS = ["請假類型", "開始日期", "結束日期", "請假天數", "申請日期", "狀態", "請假事由"]
+
+
+def make_rows(count):
+    """產生請假記錄測試資料"""
+    random.seed(0)
+    rows = []
+    for i in range(count):
+        day = f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+        rows.append({
+            'leave_type': random.choice(["年假", "病假", "事假"]),
+            'start_date': day,
+            'end_date': day,
+            'days': str(random.choice([0.5, 1, 2, 3])),
+            'apply_date': day,
+            'status': random.choice(["待審核", "已核准", "已拒絕"]),
+            'reason': f"測試事由 {i}",
+        })
+    return rows
+
+
+def write_per_cell(handler, worksheet, rows):
+    """舊作法：每個儲存格逐一指定字型、底色、對齊、框線"""
+    for row_num, record in enumerate(rows, 2):
+        for col, header in enumerate(HEADERS, 1):
+            value = record.get(handler.get_field_key_from_header(header), "")
+            cell = worksheet.cell(row=row_num, column=col, value=value)
+            handler.apply_style(cell, handler.styles['data'])
+            style_name = handler.conditional_style_name(header, value)
+            if style_name:
+                handler.apply_style(cell, handler.styles[style_name])
+
+
+def write_named(handler, worksheet, rows):
+    """新作法：ExcelHandler.write_data_to_sheet 以具名樣式套用，底色由條件格式規則決定"""
+    handler.write_data_to_sheet(worksheet, rows, HEADERS)
+
+
+def run(title, writer, rows, save):
+    handler = ExcelHandler()
+    handler.create_workbook()
+    worksheet = handler.workbook.create_sheet("請假記錄")
+
+    start = time.perf_counter()
+    writer(handler, worksheet, rows)
+    write_seconds = time.perf_counter() - start
+
+    print(f"\n📊 {title}")
+    print(f"   寫入 {len(rows)} 列：{write_seconds:.2f} 秒")
+    if not save:
+        return
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        handler.save_workbook(path)
+        print(f"   存檔：{time.perf_counter() - start:.2f} 秒，檔案 {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        with zipfile.ZipFile(path) as archive:
+            print(f"   styles.xml：{archive.getinfo('xl/styles.xml').file_size} bytes")
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel 樣式套用效能測試")
+    parser.add_argument('--rows', type=int, default=200000, help="資料列數")
+    parser.add_argument('--no-save', action='store_true', help="只測寫入，不存檔")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"資料：{args.rows} 列 × {len(HEADERS)} 欄")
+    run("逐格設定樣式（舊作法）", write_per_cell, rows, not args.no_save)
+    run("具名樣式＋條件格式規則", write_named, rows, not args.no_save)
+
+
+if __name__ == '__main__':
+    main()
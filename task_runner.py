@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+背景工作模組
+耗時的讀寫工作放到背景執行緒執行，主執行緒以 after 輪詢結果並更新進度視窗，
+介面在工作期間仍可正常回應，也能隨時取消
+"""
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+
+class ProgressDialog:
+    """進度視窗
+
+    maximum 為 None 時進度條以往返動畫顯示（無法預知總量時使用）。
+    按下「取消」或關閉視窗會呼叫 on_cancel。
+    """
+
+    def __init__(self, parent, title, message="", maximum=None, on_cancel=None):
+        self.on_cancel = on_cancel
+        self.cancelled = False
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        frame = ttk.Frame(self.window, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        self.message_var = tk.StringVar(value=message)
+        ttk.Label(frame, textvariable=self.message_var, width=40).pack(fill=tk.X, pady=(0, 8))
+
+        self.progress = ttk.Progressbar(frame, length=320)
+        self.progress.pack(fill=tk.X)
+        self.set_maximum(maximum)
+
+        self.cancel_button = ttk.Button(frame, text="取消", command=self.cancel)
+        self.cancel_button.pack(pady=(10, 0))
+
+        self.window.grab_set()
+
+    def set_maximum(self, maximum):
+        """設定進度總量，None 表示未知"""
+        if maximum:
+            self.progress.stop()
+            self.progress.configure(mode='determinate', maximum=maximum, value=0)
+        else:
+            self.progress.configure(mode='indeterminate')
+            self.progress.start(15)
+
+    def update(self, value=None, message=None):
+        """更新進度與說明文字"""
+        if value is not None and str(self.progress.cget('mode')) == 'determinate':
+            self.progress.configure(value=value)
+        if message is not None:
+            self.message_var.set(message)
+
+    def cancel(self):
+        """要求取消工作（視窗會在工作真正停止後才關閉）"""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self.cancel_button.configure(state='disabled')
+        self.message_var.set("正在取消...")
+        if self.on_cancel:
+            self.on_cancel()
+
+    def close(self):
+        """關閉進度視窗"""
+        self.progress.stop()
+        self.window.grab_release()
+        self.window.destroy()
+
+
+class BackgroundTask:
+    """在背景執行緒執行產生器，並把每個產出交回主執行緒處理
+
+    work(cancel_event) 必須是產生器函式，在背景執行緒中執行，
+    應定期檢查 cancel_event 並盡早結束；每次 yield 的內容會交給
+    on_item(item) 在主執行緒處理（可以安全地操作 Tk 與 RecordStore）。
+    結束時呼叫 on_done(cancelled)，發生例外時呼叫 on_error(exception)。
+
+    佇列長度有上限，主執行緒來不及處理時背景執行緒會暫停，
+    已讀取但尚未處理的資料量因此有固定上限。
+    """
+
+    def __init__(self, root, work, on_item=None, on_done=None, on_error=None,
+                 poll_interval=50, max_pending=4):
+        self.root = root
+        self.work = work
+        self.on_item = on_item
+        self.on_done = on_done
+        self.on_error = on_error
+        self.poll_interval = poll_interval
+
+        self.cancel_event = threading.Event()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+
+    def start(self):
+        """啟動背景執行緒並開始輪詢"""
+        self._thread = threading.Thread(target=self._run, name='background-task', daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_interval, self._poll)
+
+    def cancel(self):
+        """要求背景工作停止"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    # === 背景執行緒 ===
+    def _put(self, message):
+        # 取消後主執行緒仍會持續清空佇列，因此最後的結束訊息一定送得出去
+        while True:
+            if message[0] == 'item' and self.cancel_event.is_set():
+                return
+            try:
+                self._queue.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self):
+        try:
+            for item in self.work(self.cancel_event):
+                if self.cancel_event.is_set():
+                    break
+                self._put(('item', item))
+            self._put(('done', None))
+        except Exception as e:
+            self._put(('error', e))
+
+    # === 主執行緒 ===
+    def _poll(self):
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'item':
+                if self.cancel_event.is_set() or self.on_item is None:
+                    continue
+                try:
+                    self.on_item(payload)
+                except Exception as e:
+                    # 主執行緒處理失敗時停止背景工作，並等它結束
+                    self.cancel_event.set()
+                    self._finish_with_error(e)
+                    return
+            elif kind == 'done':
+                if self.on_done:
+                    self.on_done(self.cancel_event.is_set())
+                return
+            else:
+                if self.on_error:
+                    self.on_error(payload)
+                return
+
+        self.root.after(self.poll_interval, self._poll)
+
+    def _finish_with_error(self, error):
+        """主執行緒發生錯誤時，先等背景執行緒結束再回報"""
+        def wait():
+            # 清空佇列讓背景執行緒不會卡在 put
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if self._thread.is_alive():
+                self.root.after(self.poll_interval, wait)
+            elif self.on_error:
+                self.on_error(error)
+        wait()
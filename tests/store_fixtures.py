@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RecordStore 測試共用的隨機資料與隨機異動
+每個異動同時套用到 RecordStore 與只用一般字典的參考資料，
+測試再比對兩者（或日誌、資料庫的內容）是否一致
+"""
+
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record_store import RECORD_KINDS, RECORD_ID_FIELD, DATE_FIELDS, new_employee_entry
+
+
+STATUSES = ("待審核", "已核准", "已拒絕", "")
+DEPARTMENTS = ("人事部", "資訊部", "業務部", "")
+NAMES = ("王小明", "李大華", "Alice Chen", "陳美玲", "ＡＢＣ")
+DATES = ("2023-12-31", "2024-01-05", "2024-02-29", "2024-07-15", "2025-01-01", "", "2024/1/5")
+NUMBERS = ("1", "0.5", "2", "3.50", "", "8")
+
+
+def random_basic_info(rng):
+    return {
+        'name': rng.choice(NAMES),
+        'department': rng.choice(DEPARTMENTS),
+        'phone': f"09{rng.randrange(10 ** 8):08d}",
+    }
+
+
+def random_record(kind, rng):
+    """產生一筆含唯一 record_id 的記錄（含空白與不標準的日期、數字）"""
+    record = {RECORD_ID_FIELD: uuid.UUID(int=rng.getrandbits(128)).hex}
+    if kind == 'performance_records':
+        record.update(year=rng.choice(("2023", "2024")), annual_rating=rng.choice(("優", "良", "可", "差", "")))
+    elif kind == 'leave_requests':
+        record.update(leave_type=rng.choice(("年假", "病假", "事假")), start_date=rng.choice(DATES),
+                      end_date=rng.choice(DATES), days=rng.choice(NUMBERS), status=rng.choice(STATUSES))
+    else:
+        record.update(overtime_date=rng.choice(DATES), hours=rng.choice(NUMBERS),
+                      overtime_type=rng.choice(("平日", "假日")), status=rng.choice(STATUSES))
+    if rng.random() < 0.1:
+        record['note'] = "不在欄位定義中的欄位"
+    return record
+
+
+def random_employee(rng, records=3):
+    entry = new_employee_entry(random_basic_info(rng))
+    for kind in RECORD_KINDS:
+        entry[kind] = [random_record(kind, rng) for _ in range(rng.randrange(records + 1))]
+    return entry
+
+
+def random_employees(rng, count=20):
+    return {f"E{i:03d}": random_employee(rng) for i in range(count)}
+
+
+class RandomOperations:
+    """對 store 套用隨機異動，並同步更新參考資料 reference（一般字典）"""
+
+    def __init__(self, store, rng, employees):
+        self.store = store
+        self.rng = rng
+        self.reference = {employee_id: _copy_entry(entry) for employee_id, entry in employees.items()}
+        self._next_id = len(employees)
+        store.load(employees)
+
+    def new_employee_id(self):
+        """尚未使用過的員工編號"""
+        while True:
+            self._next_id += 1
+            employee_id = f"N{self._next_id:03d}"
+            if employee_id not in self.reference:
+                return employee_id
+
+    def find(self, kind, key):
+        for employee_id, entry in self.reference.items():
+            for index, record in enumerate(entry[kind]):
+                if record[RECORD_ID_FIELD] == key:
+                    return employee_id, index
+        raise KeyError(key)
+
+    def step(self):
+        rng = self.rng
+        store, reference = self.store, self.reference
+        kind = rng.choice(RECORD_KINDS)
+        keys = store.query_keys(kind)
+        employee_ids = list(store.employees)
+        choice = rng.randrange(10)
+
+        if choice <= 2 and employee_ids:
+            employee_id = rng.choice(employee_ids)
+            record = random_record(kind, rng)
+            store.add_record(kind, employee_id, record)
+            reference[employee_id][kind].append(dict(record))
+        elif choice == 3 and keys:
+            key = rng.choice(keys)
+            changes = {'status': rng.choice(STATUSES), DATE_FIELDS[kind]: rng.choice(DATES)}
+            store.update_record(kind, key, changes)
+            employee_id, index = self.find(kind, key)
+            reference[employee_id][kind][index].update(changes)
+        elif choice == 4 and keys:
+            key = rng.choice(keys)
+            store.delete_record(kind, key)
+            employee_id, index = self.find(kind, key)
+            del reference[employee_id][kind][index]
+        elif choice == 5:
+            if employee_ids and rng.random() < 0.7:
+                employee_id = rng.choice(employee_ids)
+            else:
+                employee_id = self.new_employee_id()
+            basic_info = random_basic_info(rng)
+            store.put_employee(employee_id, basic_info)
+            reference.setdefault(employee_id, new_employee_entry())['basic_info'] = dict(basic_info)
+        elif choice == 6 and employee_ids:
+            # 變更員工編號
+            old_id, employee_id = rng.choice(employee_ids), self.new_employee_id()
+            basic_info = random_basic_info(rng)
+            store.put_employee(employee_id, basic_info, old_id=old_id)
+            reference[employee_id] = reference.pop(old_id)
+            reference[employee_id]['basic_info'] = dict(basic_info)
+        elif choice == 7:
+            items = [(rng.choice(employee_ids) if employee_ids and rng.random() < 0.5 else self.new_employee_id(),
+                      random_basic_info(rng)) for _ in range(3)]
+            store.put_employees(items)
+            for employee_id, basic_info in items:
+                reference.setdefault(employee_id, new_employee_entry())['basic_info'] = dict(basic_info)
+        elif choice == 8 and employee_ids:
+            employee_id = rng.choice(employee_ids)
+            store.delete_employee(employee_id)
+            del reference[employee_id]
+        else:
+            batch = {}
+            for _ in range(2):
+                employee_id = (rng.choice(employee_ids) if employee_ids and rng.random() < 0.5
+                               else self.new_employee_id())
+                batch[employee_id] = random_employee(rng)
+            store.extend(batch)
+            for employee_id, entry in batch.items():
+                reference[employee_id] = _copy_entry(entry)
+
+    def run(self, steps):
+        for _ in range(steps):
+            self.step()
+
+
+def _copy_entry(entry):
+    copied = {'basic_info': dict(entry.get('basic_info', {}))}
+    for kind in RECORD_KINDS:
+        copied[kind] = [dict(record) for record in entry.get(kind, [])]
+    return copied
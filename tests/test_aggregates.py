@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+即時統計測試
+隨機異動後逐筆調整的計數，必須與直接掃描參考資料、以及重新計算的結果相同
+"""
+
+import os
+import random
+import sys
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import LiveAggregates, APPROVED, UNKNOWN_DEPARTMENT, UNKNOWN_RATING
+from record_store import RecordStore
+from record_types import parse_date, parse_number
+from store_fixtures import RandomOperations, random_employees
+
+
+def expected_counts(reference):
+    """直接掃描參考資料計算各項計數"""
+    days, counts = {}, {}
+    status_counts = {'leave_requests': {}, 'overtime_requests': {}}
+    ratings = {}
+    for employee_id, entry in reference.items():
+        department = entry['basic_info'].get('department') or UNKNOWN_DEPARTMENT
+        for record in entry['performance_records']:
+            distribution = ratings.setdefault(department, {})
+            rating = record.get('annual_rating') or UNKNOWN_RATING
+            distribution[rating] = distribution.get(rating, 0) + 1
+        for kind in status_counts:
+            for record in entry[kind]:
+                status = record.get('status', '')
+                status_counts[kind][status] = status_counts[kind].get(status, 0) + 1
+        for record in entry['leave_requests']:
+            ordinal = parse_date(record.get('start_date'))
+            number = parse_number(record.get('days'))
+            if record.get('status', '') != APPROVED or ordinal is None or number is None:
+                continue
+            key = (employee_id, date.fromordinal(ordinal).year)
+            days[key] = days.get(key, 0.0) + number
+            counts[key] = counts.get(key, 0) + 1
+    return days, counts, status_counts, ratings
+
+
+class LiveAggregatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(1)
+        self.store = RecordStore()
+        self.live = LiveAggregates(self.store)
+        self.ops = RandomOperations(self.store, self.rng, random_employees(self.rng, 30))
+
+    @staticmethod
+    def counts_of(live):
+        return live.approved_leave_days, live.approved_leave_counts, live.status_counts, live.rating_distribution
+
+    def assert_counts_match(self):
+        fresh = LiveAggregates(self.store)
+        self.store.remove_listener(fresh._on_change)
+        self.assertEqual(self.counts_of(self.live), self.counts_of(fresh))
+        self.assertEqual(self.counts_of(self.live), expected_counts(self.ops.reference))
+
+    def test_random_operations(self):
+        self.assert_counts_match()
+        for _ in range(20):
+            self.ops.run(30)
+            self.assert_counts_match()
+
+    def test_queries(self):
+        self.store.load({})
+        self.store.put_employee('E1', {'name': '王小明'})
+        key = self.store.add_record('leave_requests', 'E1',
+                                    {'start_date': '2024-03-01', 'days': '1.5', 'status': '待審核'})
+        self.assertEqual(self.live.pending_count('leave_requests'), 1)
+        self.assertEqual(self.live.approved_leave_days_of('E1', '2024'), 0.0)
+        self.store.set_status('leave_requests', key, APPROVED)
+        self.assertEqual(self.live.pending_count('leave_requests'), 0)
+        self.assertEqual(self.live.approved_leave_days_of('E1', '2024'), 1.5)
+        self.store.put_employee('E2', {'name': '王小明'}, old_id='E1')
+        self.assertEqual(self.live.approved_leave_days_of('E1', 2024), 0.0)
+        self.assertEqual(self.live.approved_leave_days_of('E2', 2024), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+統計分析測試
+欄式資料表隨異動逐筆更新後，NumPy 與純 Python 兩種計算方式的報表
+都必須與直接掃描參考資料的結果相同
+"""
+
+import os
+import random
+import sys
+import unittest
+from datetime import date
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+from record_store import RecordStore
+from record_types import parse_date, parse_number
+from store_fixtures import RandomOperations, random_employees
+
+
+# 報表方法 -> (記錄類別, 日期欄位, 數值欄位, 分組方式)
+REPORTS = {
+    'leave_days_by_employee_type_year': ('leave_requests', 'start_date', 'days', ('employee', 'year', 'leave_type')),
+    'leave_days_by_department_month': ('leave_requests', 'start_date', 'days', ('department', 'month')),
+    'overtime_hours_by_department_month': ('overtime_requests', 'overtime_date', 'hours', ('department', 'month')),
+    'overtime_hours_by_employee_month': ('overtime_requests', 'overtime_date', 'hours', ('employee', 'month')),
+}
+
+
+def expected_report(reference, method, status=None):
+    """直接掃描參考資料計算報表"""
+    kind, date_field, value_field, keys = REPORTS[method]
+    sums = {}
+    counts = {}
+    for employee_id, entry in reference.items():
+        department = entry['basic_info'].get('department') or '未分類'
+        for record in entry[kind]:
+            if status and record.get('status', '') != status:
+                continue
+            ordinal = parse_date(record.get(date_field))
+            if ordinal is None:
+                continue
+            day = date.fromordinal(ordinal)
+            labels = {
+                'employee': employee_id,
+                'department': department,
+                'year': str(day.year),
+                'month': f"{day.year}-{day.month:02d}",
+                'leave_type': record.get('leave_type', ''),
+            }
+            group = tuple(labels[name] for name in keys)
+            sums[group] = sums.get(group, 0.0) + (parse_number(record.get(value_field)) or 0.0)
+            counts[group] = counts.get(group, 0) + 1
+    return sorted((group, sums[group], counts[group]) for group in sums)
+
+
+class AnalyticsTest(unittest.TestCase):
+
+    def setUp(self):
+        analytics.load_numpy()
+        self.rng = random.Random(1)
+        self.store = RecordStore()
+        self.analytics = analytics.Analytics(self.store)
+        self.ops = RandomOperations(self.store, self.rng, random_employees(self.rng, 30))
+
+    def assert_reports_match(self):
+        for method in REPORTS:
+            for status in (None, '已核准', '待審核'):
+                with self.subTest(method=method, status=status):
+                    expected = expected_report(self.ops.reference, method, status)
+                    self.assertEqual(getattr(self.analytics, method)(status), expected)
+                    with mock.patch.object(analytics, 'np', None):
+                        self.assertEqual(getattr(self.analytics, method)(status), expected)
+
+    def test_incremental_updates(self):
+        self.assert_reports_match()
+        for _ in range(15):
+            self.ops.run(30)
+            self.assert_reports_match()
+        # 逐筆更新後的資料表與重建的資料表結果相同
+        rows = {kind: len(self.analytics.table(kind).row_of) for kind in ('leave_requests', 'overtime_requests')}
+        self.analytics.invalidate()
+        self.assert_reports_match()
+        for kind, count in rows.items():
+            self.assertEqual(len(self.analytics.table(kind)), count)
+
+    def test_reload_rebuilds_tables(self):
+        self.assert_reports_match()
+        employees = random_employees(self.rng, 10)
+        self.ops = RandomOperations(self.store, self.rng, employees)
+        self.assert_reports_match()
+        self.store.clear()
+        self.ops.reference.clear()
+        self.assert_reports_match()
+
+    def test_unknown_filter_value(self):
+        self.assertEqual(self.analytics.leave_days_by_department_month('不存在的狀態'), [])
+        with mock.patch.object(analytics, 'np', None):
+            self.assertEqual(self.analytics.leave_days_by_department_month('不存在的狀態'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+異動日誌測試
+隨機異動（中途壓縮、模擬異常結束）後，以「快照 + 日誌」還原的資料必須與參考資料相同；
+還原失敗時原檔案須改名保留，序號接續舊檔案
+"""
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from change_journal import ChangeJournal, apply_change
+from record_store import RecordStore
+from store_fixtures import RandomOperations, random_employees
+
+
+class ChangeJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def open_journal(self):
+        journal = ChangeJournal(self.directory)
+        employees = journal.recover()
+        journal.open()
+        self.addCleanup(self.crash, journal)
+        return journal, employees
+
+    @staticmethod
+    def crash(journal):
+        """模擬異常結束：關閉日誌檔但不做最後一次壓縮"""
+        if journal._file is not None:
+            journal._file.close()
+            journal._file = None
+
+    def recover(self):
+        return ChangeJournal(self.directory).recover()
+
+    def test_replay_matches_reference(self):
+        rng = random.Random(1)
+        journal, _ = self.open_journal()
+        store = RecordStore()
+        store.add_listener(journal.record_change)
+        ops = RandomOperations(store, rng, random_employees(rng))
+        for round_ in range(6):
+            ops.run(40)
+            if round_ % 2:
+                self.assertTrue(journal.compact())
+        self.crash(journal)
+
+        employees = self.recover()
+        self.assertEqual(employees, ops.reference)
+        self.assertEqual(list(employees), list(ops.reference))
+        # 還原時已併入快照，再還原一次結果相同
+        self.assertEqual(self.recover(), ops.reference)
+
+    def test_truncated_last_line_is_ignored(self):
+        journal, _ = self.open_journal()
+        store = RecordStore()
+        store.add_listener(journal.record_change)
+        store.put_employee('E1', {'name': '王小明'})
+        store.add_record('leave_requests', 'E1', {'start_date': '2024-01-02', 'days': '1'})
+        expected = store.to_dict()
+        journal._file.write('{"op":"delete_employee","employee_id":"E1","se')
+        self.crash(journal)
+        self.assertEqual(self.recover(), expected)
+
+    def test_legacy_entries_use_index(self):
+        employees = {'E1': {'basic_info': {}, 'leave_requests': [{'days': '1'}, {'days': '2'}, {'days': '3'}]}}
+        apply_change(employees, {'op': 'update_record', 'kind': 'leave_requests', 'employee_id': 'E1',
+                                 'index': 1, 'record': {'days': '5'}})
+        apply_change(employees, {'op': 'delete_record', 'kind': 'leave_requests', 'employee_id': 'E1',
+                                 'index': 0})
+        self.assertEqual(employees['E1']['leave_requests'], [{'days': '5'}, {'days': '3'}])
+
+    def test_failed_recover_sets_files_aside(self):
+        journal, _ = self.open_journal()
+        store = RecordStore()
+        store.add_listener(journal.record_change)
+        for i in range(5):
+            store.put_employee(f"E{i}", {'name': str(i)})
+        self.crash(journal)
+        # 日誌中指向不存在員工的異動會讓重播失敗
+        with open(journal.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'op': 'add_record', 'kind': 'leave_requests', 'employee_id': '不存在',
+                                'record': {}, 'seq': 6}) + '\n')
+
+        journal = ChangeJournal(self.directory)
+        with self.assertRaises(KeyError):
+            journal.recover()
+        names = os.listdir(self.directory)
+        self.assertNotIn(os.path.basename(journal.journal_path), names)
+        self.assertTrue(any(name.startswith('journal.jsonl.broken-') for name in names))
+        self.assertEqual(journal._seq, 6)
+
+        # 之後的異動從空白重新記錄，序號接續
+        journal.open()
+        self.addCleanup(self.crash, journal)
+        store = RecordStore()
+        store.add_listener(journal.record_change)
+        store.put_employee('N1', {'name': '新'})
+        self.crash(journal)
+        with open(journal.journal_path, 'r', encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)['seq'] for line in f], [7])
+        self.assertEqual(list(self.recover()), ['N1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
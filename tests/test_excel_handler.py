@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 讀取測試
+RowMapper 的轉換結果必須與原本逐格轉換的寫法相同；
+分批讀取時不論讀完、close()、離開 with 區塊或直接捨棄，都要關閉活頁簿
+"""
+
+import contextlib
+import gc
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import excel_handler
+from excel_handler import ExcelHandler, RowMapper, bulk_read_excel, field_key_from_header
+
+
+CELL_VALUES = (None, "", "  王小明  ", "E001", 0, 0.0, 1, 1.5, -3, 45000, True, False,
+               date(2024, 1, 5), datetime(2024, 1, 5, 13, 30), time(8, 30), "2024/1/5", "0")
+HEADERS = ("員工編號", "姓名", "開始日期", "請假天數", None, " Foo Bar* ", "狀態", "姓名")
+
+
+def baseline_row(headers, row):
+    """原本 read_excel_data 逐格轉換的寫法，回傳記錄字典或 None"""
+    if not any(cell is not None for cell in row):
+        return None
+    row_data = {}
+    for i, cell in enumerate(row):
+        if i < len(headers):
+            field_key = field_key_from_header(headers[i])
+            value = cell if cell is not None else ""
+            if isinstance(value, datetime):
+                value = value.strftime("%Y-%m-%d")
+            elif isinstance(value, date):
+                value = value.strftime("%Y-%m-%d")
+            row_data[field_key] = str(value).strip() if value else ""
+    return row_data if any(row_data.values()) else None
+
+
+class RowMapperTest(unittest.TestCase):
+
+    def test_matches_baseline_conversion(self):
+        rng = random.Random(1)
+        mapper = RowMapper(HEADERS)
+        headers = [str(cell).strip() if cell is not None else f"Column_{i}" for i, cell in enumerate(HEADERS)]
+        self.assertEqual(mapper.headers, headers)
+        for _ in range(500):
+            row = tuple(rng.choice(CELL_VALUES) for _ in range(rng.randrange(len(HEADERS) + 3)))
+            with self.subTest(row=row):
+                self.assertEqual(mapper(row), baseline_row(headers, row))
+
+
+class ExcelChunksTest(unittest.TestCase):
+
+    ROWS = 25
+
+    def setUp(self):
+        self.handler = ExcelHandler()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'employees.xlsx')
+        workbook = excel_handler.openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.title = "請假"
+        worksheet.append(["員工編號", "姓名", "開始日期", "請假天數"])
+        for i in range(self.ROWS):
+            worksheet.append([f"E{i:03d}", f"員工{i}", date(2024, 1, 1 + i % 28), i % 3 or None])
+            if i % 10 == 0:
+                worksheet.append([None, None, None, None])
+        workbook.save(self.path)
+
+    def read_chunks(self, chunk_size=10):
+        chunks = self.handler.read_excel_data(self.path, chunk_size=chunk_size)['chunks']
+        workbook = chunks._workbook
+        self.assertIsNotNone(workbook._archive.fp)
+        return chunks, workbook
+
+    def assert_closed(self, workbook):
+        self.assertIsNone(workbook._archive.fp)
+
+    def test_chunks_match_full_read(self):
+        full = self.handler.read_excel_data(self.path)
+        self.assertEqual(full['sheet_name'], "請假")
+        self.assertEqual(len(full['data']), self.ROWS)
+        self.assertEqual(full['data'][1], {'employee_id': 'E001', 'name': '員工1',
+                                           'start_date': '2024-01-02', 'days': '1'})
+        chunks, workbook = self.read_chunks()
+        data = list(chunks)
+        self.assertEqual([len(chunk) for chunk in data], [10, 10, 5])
+        self.assertEqual([record for chunk in data for record in chunk], full['data'])
+        self.assert_closed(workbook)
+
+    def test_close_before_first_chunk(self):
+        chunks, workbook = self.read_chunks()
+        chunks.close()
+        self.assert_closed(workbook)
+        self.assertEqual(list(chunks), [])
+
+    def test_with_block_closes(self):
+        chunks, workbook = self.read_chunks()
+        with chunks:
+            next(chunks)
+        self.assert_closed(workbook)
+
+    def test_dropped_chunks_close(self):
+        chunks, workbook = self.read_chunks()
+        del chunks
+        gc.collect()
+        self.assert_closed(workbook)
+
+    def test_missing_sheet(self):
+        with self.assertRaises(Exception) as context:
+            self.handler.read_excel_data(self.path, sheet_name="不存在")
+        self.assertIn("不存在", str(context.exception))
+
+
+class BulkReadExcelTest(unittest.TestCase):
+
+    def setUp(self):
+        ExcelHandler()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        # 檔名順序：a、b、c（損毀）；~$ 暫存檔與非 Excel 檔案不讀取
+        self.write_workbook('b.xlsx', [("E1", "2024-02-01"), ("E2", "2024-02-02"), (None, "2024-02-03")])
+        self.write_workbook('a.xlsx', [("E1", "2024-01-01"), ("E3", "2024-01-03")])
+        self.write_workbook('~$a.xlsx', [("E9", "2024-09-09")])
+        with open(os.path.join(self.directory, 'c.xlsx'), 'w', encoding='utf-8') as f:
+            f.write("不是 Excel 檔案")
+        with open(os.path.join(self.directory, 'readme.txt'), 'w', encoding='utf-8') as f:
+            f.write("略過")
+        subdirectory = os.path.join(self.directory, '分公司')
+        os.mkdir(subdirectory)
+        self.write_workbook(os.path.join('分公司', 'd.xlsx'), [("E4", "2024-04-04")])
+
+    def write_workbook(self, name, rows):
+        workbook = excel_handler.openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.append(["員工編號", "開始日期"])
+        for row in rows:
+            worksheet.append(row)
+        workbook.save(os.path.join(self.directory, name))
+
+    def bulk_read(self, source, max_workers):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return bulk_read_excel(source, max_workers=max_workers)
+
+    def test_merges_in_file_order(self):
+        for max_workers in (1, 2):
+            with self.subTest(max_workers=max_workers):
+                result = self.bulk_read(self.directory, max_workers)
+                self.assertEqual([os.path.basename(report['path']) for report in result['files']],
+                                 ['a.xlsx', 'b.xlsx', 'c.xlsx'])
+                self.assertEqual([(report['rows'], report['skipped']) for report in result['files']],
+                                 [(2, 0), (2, 1), (0, 0)])
+                self.assertIsNone(result['files'][0]['error'])
+                self.assertIsNotNone(result['files'][2]['error'])
+                self.assertEqual({employee_id: [record['start_date'] for record in records]
+                                  for employee_id, records in result['employees'].items()},
+                                 {'E1': ['2024-01-01', '2024-02-01'], 'E3': ['2024-01-03'], 'E2': ['2024-02-02']})
+
+    def test_glob_pattern(self):
+        result = self.bulk_read(os.path.join(self.directory, '**', '*.xlsx'), 2)
+        self.assertEqual([os.path.basename(report['path']) for report in result['files']],
+                         ['a.xlsx', 'b.xlsx', 'c.xlsx', 'd.xlsx'])
+        self.assertEqual(result['employees']['E4'][0]['start_date'], '2024-04-04')
+        self.assertEqual(self.bulk_read(os.path.join(self.directory, '*.xls'), 2)['files'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
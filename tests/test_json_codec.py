@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+json_codec 串流讀取測試
+以每一種讀入大小（1 到整個檔案長度）逐筆讀取同一份資料，結果都必須與 json.loads 相同
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec
+
+
+FIXTURE = {
+    "E0": -25000000000.0,
+    "E1": {"basic_info": {"name": "王小明", "note": "引號\"與\\反斜線\n換行"},
+           "leave_requests": [{"days": "1.5", "start_date": "2024-01-02"}]},
+    "E2": 1.5e-10,
+    "E3": [1, -2, 3.25, 4E+2, 0, -0.5e3],
+    "E4": True,
+    "E5": None,
+    "E6": False,
+    "E7": 12345678901234567890,
+    "E8": "",
+    "E9": {},
+}
+
+
+class IterObjectItemsTest(unittest.TestCase):
+
+    def write_fixture(self, text):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def assert_every_chunk_size(self, text):
+        path = self.write_fixture(text)
+        expected = list(json.loads(text).items())
+        for chunk_size in range(1, len(text) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(json_codec.iter_object_items(path, chunk_size)), expected)
+
+    def test_compact(self):
+        self.assert_every_chunk_size(json.dumps(FIXTURE, ensure_ascii=False, separators=(',', ':')))
+
+    def test_indented(self):
+        self.assert_every_chunk_size(json.dumps(FIXTURE, ensure_ascii=False, indent=2))
+
+    def test_number_split_after_decimal_point(self):
+        self.assert_every_chunk_size('{"E0": -25000000000.0}')
+
+    def test_malformed_file_raises(self):
+        path = self.write_fixture('{"E0": 1 "E1": 2}')
+        with self.assertRaises(ValueError):
+            list(json_codec.iter_object_items(path, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記錄排序測試
+隨機異動後快取的排序鍵必須仍然正確：正常值依大小排序，
+無法轉換的原值次之，空白不論遞增、遞減都排在最後，相同的值保持原本的順序
+"""
+
+import os
+import random
+import sys
+import unicodedata
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record_sort import SortKeyCache, EMPLOYEE_ID, EMPLOYEE_NAME, text_sort_key
+from record_store import RecordStore, RECORD_ID_FIELD
+from record_types import parse_date, parse_number
+from store_fixtures import RandomOperations, random_employees
+
+
+FIELDS = {
+    'leave_requests': (EMPLOYEE_ID, EMPLOYEE_NAME, 'leave_type', 'start_date', 'days', 'status', 'reason'),
+    'overtime_requests': (EMPLOYEE_NAME, 'overtime_date', 'hours', 'overtime_type', 'status'),
+}
+PARSERS = {'start_date': parse_date, 'overtime_date': parse_date, 'days': parse_number, 'hours': parse_number}
+
+
+def expected_order(reference, kind, keys, field, reverse):
+    """依參考資料分成正常值、原值、空白三組後各自排序"""
+    rows = {}
+    for employee_id, entry in reference.items():
+        for record in entry[kind]:
+            rows[record[RECORD_ID_FIELD]] = (employee_id, entry['basic_info'], record)
+
+    values, raws, empties = [], [], []
+    for key in keys:
+        employee_id, basic_info, record = rows[key]
+        if field == EMPLOYEE_ID:
+            value = employee_id
+        elif field == EMPLOYEE_NAME:
+            value = basic_info.get('name', '')
+        else:
+            value = record.get(field)
+        parse = PARSERS.get(field)
+        if parse is not None and parse(value) is not None:
+            values.append((parse(value), key))
+        elif parse is not None and value:
+            raws.append((str(value), key))
+        elif value:
+            values.append((unicodedata.normalize('NFKC', value).casefold(), key))
+        else:
+            empties.append(key)
+
+    def by_value(items):
+        return [key for _, key in sorted(items, key=lambda item: item[0], reverse=reverse)]
+    return by_value(values) + by_value(raws) + empties
+
+
+class SortKeyCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(1)
+        self.store = RecordStore()
+        self.caches = {kind: SortKeyCache(self.store, kind) for kind in FIELDS}
+        self.ops = RandomOperations(self.store, self.rng, random_employees(self.rng, 30))
+
+    def assert_sorted(self):
+        for kind, fields in FIELDS.items():
+            keys = self.store.query_keys(kind)
+            for field in fields:
+                for reverse in (False, True):
+                    with self.subTest(kind=kind, field=field, reverse=reverse):
+                        self.assertEqual(self.caches[kind].sorted_keys(keys, field, reverse),
+                                         expected_order(self.ops.reference, kind, keys, field, reverse))
+
+    def test_random_operations(self):
+        self.assert_sorted()
+        for _ in range(15):
+            self.ops.run(30)
+            self.assert_sorted()
+
+    def test_blanks_last_in_both_directions(self):
+        self.store.load({'E1': {'basic_info': {'name': '王小明'}, 'leave_requests': [
+            {'record_id': 'a', 'days': ''},
+            {'record_id': 'b', 'days': '2'},
+            {'record_id': 'c', 'days': '3.50'},
+            {'record_id': 'd', 'days': '0.5'},
+            {'record_id': 'e'},
+        ]}})
+        cache = self.caches['leave_requests']
+        keys = self.store.query_keys('leave_requests')
+        self.assertEqual(cache.sorted_keys(keys, 'days'), ['d', 'b', 'c', 'a', 'e'])
+        self.assertEqual(cache.sorted_keys(keys, 'days', reverse=True), ['b', 'd', 'c', 'a', 'e'])
+
+    def test_text_sort_key(self):
+        self.assertEqual(text_sort_key('ＡＢＣ'), text_sort_key('abc'))
+        self.assertEqual(text_sort_key(None), text_sort_key(''))
+        self.assertLess(text_sort_key('zzz'), text_sort_key(''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RecordStore 索引測試
+隨機新增、修改、刪除員工與記錄後，資料必須與一般字典的參考資料相同，
+各索引與 query_keys 的結果也必須與逐筆掃描的結果相同
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record_store import RecordStore, RECORD_KINDS, RECORD_ID_FIELD, DATE_FIELDS
+from store_fixtures import RandomOperations, random_employees, STATUSES, DATES
+
+
+def scan(reference, kind, employee_id=None, status=None, date_from=None, date_to=None):
+    """逐筆掃描參考資料，回傳符合條件的記錄編號"""
+    keys = []
+    for emp_id, entry in reference.items():
+        for record in entry[kind]:
+            date_value = str(record.get(DATE_FIELDS[kind], ''))
+            if employee_id is not None and emp_id != employee_id:
+                continue
+            if status is not None and record.get('status', '') != status:
+                continue
+            if date_from and date_value < date_from:
+                continue
+            if date_to and date_value > date_to:
+                continue
+            keys.append(record[RECORD_ID_FIELD])
+    return keys
+
+
+class RecordStoreIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(1)
+        self.store = RecordStore()
+        self.ops = RandomOperations(self.store, self.rng, random_employees(self.rng))
+
+    def assert_matches_reference(self):
+        store, reference = self.store, self.ops.reference
+        self.assertEqual(store.to_dict(), reference)
+        self.assertEqual(list(store.employees), list(reference))
+        for kind in RECORD_KINDS:
+            expected = scan(reference, kind)
+            self.assertEqual(sorted(store._records[kind]), sorted(expected))
+            for key, (employee_id, record) in store._records[kind].items():
+                self.assertIs(store.get_record(kind, key)[1], record)
+                self.assertTrue(any(item is record for item in store.records_of(kind, employee_id)))
+            self.assertEqual(store._sorted_dates[kind], sorted(store._by_date[kind]))
+            for index in (store._by_employee[kind], store._by_status[kind], store._by_date[kind]):
+                self.assertTrue(all(index.values()), "索引中不應留下空的分組")
+
+    def assert_queries_match(self):
+        reference = self.ops.reference
+        employee_ids = list(reference) + ['不存在']
+        for kind in RECORD_KINDS:
+            for _ in range(20):
+                conditions = {
+                    'employee_id': self.rng.choice(employee_ids + [None] * 3),
+                    'status': self.rng.choice(STATUSES + (None, None)),
+                    'date_from': self.rng.choice(DATES + (None, None)),
+                    'date_to': self.rng.choice(DATES + (None, None)),
+                }
+                with self.subTest(kind=kind, **conditions):
+                    self.assertEqual(sorted(self.store.query_keys(kind, **conditions)),
+                                     sorted(scan(reference, kind, **conditions)))
+            for status in STATUSES:
+                self.assertEqual(self.store.count(kind, status=status), len(scan(reference, kind, status=status)))
+
+    def test_random_operations(self):
+        self.assert_matches_reference()
+        for _ in range(20):
+            self.ops.run(25)
+            self.assert_matches_reference()
+            self.assert_queries_match()
+
+    def test_load_copies_input(self):
+        employees = random_employees(self.rng, 3)
+        store = RecordStore()
+        store.load(employees)
+        kind = 'leave_requests'
+        key = store.query_keys(kind)[0]
+        store.update_record(kind, key, {'status': '已核准'})
+        original = next(record for entry in employees.values() for record in entry[kind]
+                        if record[RECORD_ID_FIELD] == key)
+        self.assertNotEqual(original.get('status'), '已核准')
+        self.assertEqual(store.to_dict(), store.snapshot())
+
+
+class RecordIdTest(unittest.TestCase):
+
+    def test_missing_and_duplicate_ids_are_assigned(self):
+        store = RecordStore()
+        store.load({'E1': {'basic_info': {'name': '王小明'},
+                           'leave_requests': [{'start_date': '2024-01-02'},
+                                              {'record_id': 'a', 'start_date': '2024-01-03'},
+                                              {'record_id': 'a', 'start_date': '2024-01-04'}]}})
+        records = store.to_dict()['E1']['leave_requests']
+        ids = [record[RECORD_ID_FIELD] for record in records]
+        self.assertEqual(len(set(ids)), 3)
+        self.assertTrue(all(ids))
+        self.assertEqual(ids[1], 'a')
+        self.assertEqual([record['start_date'] for record in records], ['2024-01-02', '2024-01-03', '2024-01-04'])
+        self.assertEqual(sorted(store.query_keys('leave_requests')), sorted(ids))
+
+    def test_add_record_returns_key(self):
+        store = RecordStore()
+        store.put_employee('E1', {'name': '王小明'})
+        first = store.add_record('overtime_requests', 'E1', {'overtime_date': '2024-01-02', 'hours': '2'})
+        # 複製既有記錄（含相同編號）新增時，必須取得新的編號
+        copied = store.get_record('overtime_requests', first)[1].to_dict()
+        second = store.add_record('overtime_requests', 'E1', copied)
+        self.assertNotEqual(first, second)
+        self.assertEqual(store.get_record('overtime_requests', second)[1][RECORD_ID_FIELD], second)
+        store.delete_record('overtime_requests', first)
+        self.assertEqual([record[RECORD_ID_FIELD] for record in store.records_of('overtime_requests', 'E1')],
+                         [second])
+
+
+class ProvisionalLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(2)
+        self.store = RecordStore()
+        self.store.load(random_employees(self.rng, 5))
+        self.before = self.store.to_dict()
+        self.events = []
+        self.persistent = []
+        self.store.add_listener(lambda event: self.events.append(event['op']))
+        self.store.add_listener(lambda event: self.persistent.append(event['op']), persistent=True)
+
+    def stream(self):
+        self.store.begin_provisional()
+        self.assertTrue(self.store.provisional)
+        batch = random_employees(random.Random(3), 4)
+        self.store.extend(dict(list(batch.items())[:2]))
+        self.store.extend(dict(list(batch.items())[2:]))
+        return batch
+
+    def test_rollback_restores_data(self):
+        self.stream()
+        self.store.rollback_provisional()
+        self.assertFalse(self.store.provisional)
+        self.assertEqual(self.store.to_dict(), self.before)
+        self.assertEqual(self.events, ['clear', 'extend', 'extend', 'load'])
+        self.assertEqual(self.persistent, [])
+        self.assertEqual(sorted(self.store.query_keys('leave_requests')),
+                         sorted(scan(self.before, 'leave_requests')))
+
+    def test_commit_notifies_persistent_once(self):
+        batch = self.stream()
+        self.store.commit_provisional()
+        self.assertFalse(self.store.provisional)
+        self.assertEqual(list(self.store.employees), list(batch))
+        self.assertEqual(self.persistent, ['load'])
+        self.assertEqual(self.events, ['clear', 'extend', 'extend'])
+
+
+if __name__ == '__main__':
+    unittest.main()
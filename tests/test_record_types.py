@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記錄型別測試
+不論欄位值是否為標準格式，from_dict 與逐欄設定建立的記錄都必須相同，
+且 to_dict 一定還原成原本的資料
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record_types import RECORD_TYPES, DATE, NUMBER, TEXT, to_record
+
+
+ODD_VALUES = {
+    TEXT: ("", "王小明", None, 0, "2024-01-02"),
+    DATE: ("2024-01-02", "2024-02-29", "2023-02-29", "2024/1/5", "", " 2024-01-02", None, 20240102),
+    NUMBER: ("1", "0.5", "3.50", "", "-0", "1e3", "nan", "inf", " 2", None, 2, 1.5),
+}
+
+
+def random_data(cls, rng):
+    data = {}
+    fields = list(cls.FIELDS)
+    rng.shuffle(fields)
+    for field, kind in fields:
+        if rng.random() < 0.8:
+            data[field] = rng.choice(ODD_VALUES[kind])
+    if rng.random() < 0.3:
+        data['備註'] = rng.choice(ODD_VALUES[TEXT])
+    return data
+
+
+class TypedRecordTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        rng = random.Random(1)
+        for kind, cls in RECORD_TYPES.items():
+            for _ in range(300):
+                data = random_data(cls, rng)
+                with self.subTest(kind=kind, data=data):
+                    fast, slow = cls.from_dict(data), cls(data)
+                    self.assertEqual(fast.to_dict(), data)
+                    self.assertEqual(slow.to_dict(), data)
+                    self.assertEqual(fast, slow)
+                    self.assertEqual(sorted(fast.keys()), sorted(data))
+                    for field, _ in cls.FIELDS:
+                        self.assertEqual(field in fast, field in data)
+                        self.assertEqual(fast.get(field, '預設'), data.get(field, '預設'))
+                        self.assertEqual(fast.typed(field), slow.typed(field))
+
+    def test_typed_values(self):
+        record = to_record('leave_requests', {'start_date': '2024-01-02', 'days': '1.5', 'status': '已核准'})
+        self.assertEqual(record.typed('days'), 1.5)
+        self.assertEqual(record.typed('start_date'), 738887)
+        self.assertEqual(record.typed('status'), '已核准')
+        self.assertIsNone(record.typed('end_date'))
+
+        # 非標準格式的值保留原樣，沒有型別化的值
+        record['days'] = '3.50'
+        self.assertEqual(record['days'], '3.50')
+        self.assertIsNone(record.typed('days'))
+        record['days'] = '3.5'
+        self.assertEqual(record.typed('days'), 3.5)
+        self.assertEqual(record.to_dict(), {'start_date': '2024-01-02', 'days': '3.5', 'status': '已核准'})
+
+    def test_from_dict_returns_existing_record(self):
+        record = to_record('overtime_requests', {'hours': '2'})
+        self.assertIs(to_record('overtime_requests', record), record)
+        copied = record.copy()
+        copied['hours'] = '3'
+        self.assertEqual(record['hours'], '2')
+
+
+if __name__ == '__main__':
+    unittest.main()
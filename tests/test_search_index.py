@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+員工搜尋索引測試
+隨機異動員工資料後，搜尋結果（含排列順序）必須與逐筆比對參考資料的結果相同
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record_store import RecordStore
+from search_index import EmployeeSearchIndex, search_text, SEPARATOR
+from store_fixtures import RandomOperations, random_employees
+
+
+QUERIES = ("王", "小明", "王小明", "陳 美", "alice", "ALICE chen", "ch", "ＡＢＣ", "abc", "09", "e0", "n0",
+           "資訊", "部", "人事 王", "09 業務", "不存在", "zz", "  ", "")
+
+
+def expected_search(reference, query):
+    """逐筆比對參考資料：前綴符合第一個字詞的員工在前，其餘依原本順序"""
+    terms = query.casefold().split()
+    if not terms:
+        return list(reference)
+    texts = {employee_id: search_text(employee_id, entry['basic_info']) for employee_id, entry in reference.items()}
+    matched = [employee_id for employee_id, text in texts.items() if all(term in text for term in terms)]
+    prefix = SEPARATOR + terms[0]
+    return ([employee_id for employee_id in matched if prefix in texts[employee_id]]
+            + [employee_id for employee_id in matched if prefix not in texts[employee_id]])
+
+
+class EmployeeSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(1)
+        self.store = RecordStore()
+        self.index = EmployeeSearchIndex(self.store)
+        self.ops = RandomOperations(self.store, self.rng, random_employees(self.rng, 40))
+
+    def assert_search_matches(self):
+        for query in QUERIES:
+            with self.subTest(query=query):
+                expected = expected_search(self.ops.reference, query)
+                self.assertEqual(self.index.search(query), expected)
+                # 接著輸入時只在上一次的結果中比對
+                shorter = query[:-1]
+                self.assertEqual(self.index.search(query, within=self.index.search(shorter)), expected)
+
+    def test_random_operations(self):
+        self.assert_search_matches()
+        for _ in range(20):
+            self.ops.run(20)
+            self.assert_search_matches()
+
+    def test_rebuild_after_reload(self):
+        self.assert_search_matches()
+        self.ops = RandomOperations(self.store, self.rng, random_employees(self.rng, 10))
+        self.assert_search_matches()
+        self.store.clear()
+        self.assertEqual(self.index.search("王"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
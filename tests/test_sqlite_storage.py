@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 儲存後端測試
+隨機異動後資料庫的內容必須與參考資料相同；舊版資料庫（沒有 record_id）須能升級，
+各類記錄在 load_records 之前維持未載入
+"""
+
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record_store import RecordStore, RECORD_KINDS, RECORD_ID_FIELD
+from sqlite_storage import SQLiteStorage, SCHEMA_VERSION
+from store_fixtures import RandomOperations, random_employees
+
+
+# 加入 record_id 之前的資料表結構
+LEGACY_SCHEMA = """
+CREATE TABLE basic_info (employee_id TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE performance_records (id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT '', year TEXT NOT NULL DEFAULT '', data TEXT NOT NULL);
+CREATE TABLE leave_requests (id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT '', start_date TEXT NOT NULL DEFAULT '', data TEXT NOT NULL);
+CREATE TABLE overtime_requests (id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT '', overtime_date TEXT NOT NULL DEFAULT '', data TEXT NOT NULL);
+"""
+
+
+class SQLiteStorageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'employees.db')
+
+    def open_storage(self):
+        storage = SQLiteStorage(self.path)
+        self.addCleanup(storage.close)
+        return storage
+
+    @staticmethod
+    def read_all(storage):
+        """以延遲載入的方式讀出資料庫的完整內容"""
+        store = RecordStore()
+        store.load(storage.load_employees())
+        for kind in RECORD_KINDS:
+            store.load_records(kind, storage.load_records(kind))
+        return store.to_dict()
+
+    def test_state_matches_reference(self):
+        rng = random.Random(1)
+        storage = self.open_storage()
+        store = RecordStore()
+        store.add_listener(storage.apply_change)
+        ops = RandomOperations(store, rng, random_employees(rng))
+        for _ in range(5):
+            ops.run(40)
+            # 變更員工編號時資料庫保留原本的列順序，因此只比對內容
+            self.assertEqual(self.read_all(self.open_storage()), ops.reference)
+
+        # 重新開啟後從資料庫載入，繼續異動
+        storage.close()
+        storage = self.open_storage()
+        store = RecordStore()
+        ops = RandomOperations(store, rng, self.read_all(storage))
+        store.add_listener(storage.apply_change)
+        ops.run(100)
+        self.assertEqual(self.read_all(self.open_storage()), ops.reference)
+
+    def test_records_load_lazily(self):
+        rng = random.Random(2)
+        storage = self.open_storage()
+        employees = random_employees(rng, 5)
+        storage.replace_all(employees)
+        self.assertFalse(storage.is_empty())
+
+        storage = self.open_storage()
+        loaded = storage.load_employees()
+        self.assertEqual(storage.pending_kinds, set(RECORD_KINDS))
+        self.assertEqual(list(loaded), list(employees))
+        self.assertTrue(all(not entry[kind] for entry in loaded.values() for kind in RECORD_KINDS))
+
+        rows = storage.load_records('leave_requests')
+        self.assertEqual(storage.pending_kinds, set(RECORD_KINDS) - {'leave_requests'})
+        self.assertEqual(rows, [(employee_id, record) for employee_id, entry in employees.items()
+                                for record in entry['leave_requests']])
+
+    def test_legacy_database_is_migrated(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript(LEGACY_SCHEMA)
+        conn.execute("INSERT INTO basic_info VALUES ('E1', ?)", (json.dumps({'name': '王小明'}),))
+        for days in ('1', '2', '2'):
+            record = {'leave_type': '年假', 'start_date': '2024-01-02', 'days': days}
+            conn.execute("INSERT INTO leave_requests (employee_id, start_date, data) VALUES ('E1', ?, ?)",
+                         (record['start_date'], json.dumps(record)))
+        conn.commit()
+        conn.close()
+
+        storage = self.open_storage()
+        self.assertEqual(storage.conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+        storage.load_employees()
+        rows = storage.load_records('leave_requests')
+        self.assertEqual([record['days'] for _, record in rows], ['1', '2', '2'])
+        ids = [record[RECORD_ID_FIELD] for _, record in rows]
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(sorted(ids), sorted(row[0] for row in storage.conn.execute(
+            "SELECT record_id FROM leave_requests")))
+        storage.close()
+
+        # 已升級的資料庫再次開啟時不會重新編號
+        storage = self.open_storage()
+        self.assertEqual([record[RECORD_ID_FIELD] for _, record in storage.load_records('leave_requests')], ids)
+
+        # 升級後的記錄可依 record_id 修改與刪除
+        store = RecordStore()
+        store.load(storage.load_employees())
+        store.load_records('leave_requests', storage.load_records('leave_requests'))
+        store.add_listener(storage.apply_change)
+        store.set_status('leave_requests', ids[1], '已核准')
+        store.delete_record('leave_requests', ids[2])
+        rows = storage.load_records('leave_requests')
+        self.assertEqual([(record[RECORD_ID_FIELD], record.get('status')) for _, record in rows],
+                         [(ids[0], None), (ids[1], '已核准')])
+
+
+if __name__ == '__main__':
+    unittest.main()
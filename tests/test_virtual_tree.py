@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VirtualTreeview 選取測試
+以不需要顯示器的假 Treeview 模擬捲動與點選，確認選取的鍵值與使用者看到的一致
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from virtual_tree import VirtualTreeview
+
+
+SHIFT, CONTROL = 0x0001, 0x0004
+
+
+class FakeTree:
+    """只實作 VirtualTreeview 用到的 Treeview 方法"""
+
+    def __init__(self, height=20):
+        self.height = height
+        self.children = []
+        self.values = {}
+        self.selected = ()
+        self.bindings = {}
+        self.generated = []
+
+    def configure(self, **kwargs):
+        pass
+
+    def bind(self, sequence, callback, add=None):
+        self.bindings.setdefault(sequence, []).append(callback)
+
+    def fire(self, sequence, **event):
+        for callback in self.bindings.get(sequence, ()):
+            callback(SimpleNamespace(**event))
+
+    def get_children(self, item=''):
+        return tuple(self.children)
+
+    def delete(self, *iids):
+        self.children = [iid for iid in self.children if iid not in iids]
+        self.selected = tuple(iid for iid in self.selected if iid not in iids)
+
+    def item(self, iid, values=None):
+        self.values[iid] = values
+
+    def insert(self, parent, index, iid, values):
+        self.children.append(iid)
+        self.values[iid] = values
+        return iid
+
+    def set_children(self, item, *iids):
+        self.children = list(iids)
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, iids):
+        self.selected = tuple(iids)
+        self.fire('<<TreeviewSelect>>', state=0)
+
+    def yview(self):
+        return (0.0, 1.0)
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def winfo_height(self):
+        return 1
+
+    def cget(self, option):
+        return self.height
+
+    def after_idle(self, callback):
+        pass
+
+    def event_generate(self, sequence):
+        self.generated.append(sequence)
+
+
+class FakeScrollbar:
+
+    def configure(self, **kwargs):
+        pass
+
+    def set(self, first, last):
+        pass
+
+
+class VirtualTreeSelectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = FakeTree()
+        self.view = VirtualTreeview(self.tree, FakeScrollbar(), lambda key: (key,), buffer=10)
+        self.view.set_keys(f"K{i}" for i in range(1000))
+
+    def click(self, key, state=0):
+        """模擬使用者點選：先按下滑鼠，Treeview 再依修飾鍵更新選取"""
+        self.tree.fire('<ButtonPress-1>', state=state)
+        iid = self.view.iid_for(key)
+        if state & (SHIFT | CONTROL):
+            self.tree.selected = self.tree.selected + (iid,)
+        else:
+            self.tree.selected = (iid,)
+        self.tree.fire('<<TreeviewSelect>>', state=0)
+
+    def test_plain_click_after_scroll_replaces_selection(self):
+        self.click('K5')
+        self.view.scroll_to(500)
+        self.assertNotIn('K5', self.view.window_keys)
+        self.click('K505')
+        self.assertEqual(self.view.selected_keys(), ['K505'])
+        self.assertEqual(self.view.selected_key(), 'K505')
+
+    def test_ctrl_click_keeps_rows_outside_window(self):
+        self.click('K5')
+        self.view.scroll_to(500)
+        self.click('K505', state=CONTROL)
+        self.assertEqual(self.view.selected_keys(), ['K5', 'K505'])
+
+    def test_selection_survives_scrolling(self):
+        self.click('K5')
+        self.view.scroll_to(500)
+        self.view.scroll_to(0)
+        self.assertEqual(self.view.selected_keys(), ['K5'])
+        self.assertIn(self.view.iid_for('K5'), self.tree.selection())
+
+    def test_removed_keys_leave_selection(self):
+        self.click('K5')
+        self.view.set_keys(f"K{i}" for i in range(1, 5))
+        self.assertEqual(self.view.selected_keys(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
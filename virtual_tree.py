@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+虛擬列表模組
+讓 ttk.Treeview 只建立可視範圍（加上少量緩衝）的資料列，
+捲動時再向資料模型取得需要的列，資料量再大也不會卡住介面；
+刷新時以穩定的 iid 比對新舊內容，只異動有變化的項目
+"""
+
+import tkinter as tk
+
+
+# 事件 state 中 Shift、Control 的位元：按住時點選或按方向鍵是延伸選取
+EXTEND_SELECT_MASK = 0x0001 | 0x0004
+
+
+def sync_tree_rows(tree, rows, cache):
+    """以 iid 比對新舊資料，只插入、更新、刪除有變動的項目
+
+    rows 為 [(iid, values), ...]，依序成為 tree 的頂層項目；
+    cache 為 {iid: values}，記錄上次寫入的內容，比對時不必向 Tk 查詢。
+    """
+    wanted = [iid for iid, _ in rows]
+    wanted_set = set(wanted)
+
+    stale = [iid for iid in tree.get_children() if iid not in wanted_set]
+    if stale:
+        tree.delete(*stale)
+        for iid in stale:
+            cache.pop(iid, None)
+
+    for iid, values in rows:
+        values = tuple(values)
+        if iid in cache:
+            if cache[iid] != values:
+                tree.item(iid, values=values)
+                cache[iid] = values
+        else:
+            tree.insert('', tk.END, iid=iid, values=values)
+            cache[iid] = values
+
+    if list(tree.get_children()) != wanted:
+        tree.set_children('', *wanted)
+
+
+class VirtualTreeview:
+    """Treeview 虛擬列表
+
+    資料模型是一串鍵值（keys），每列的內容由 row_values(key) 提供，
+    回傳 None 表示該鍵值已不存在（尚未重新設定 keys 前），該列會略過。
+    Treeview 中只會存在 [window_start, window_start + 視窗大小) 範圍的項目，
+    捲軸則依整份資料的比例顯示與操作。
+
+    捲動時重建項目也會觸發 <<TreeviewSelect>>，因此使用者真正改變選取時
+    會另外發出 <<VirtualTreeSelect>>，外部應綁定這個事件。
+    只有按住 Shift 或 Ctrl 延伸選取時，才保留已捲出視窗的選取；
+    一般點選以 Treeview 目前的選取取代。
+    """
+
+    def __init__(self, tree, scrollbar, row_values, buffer=30):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values
+        self.buffer = buffer
+
+        self.keys = []
+        self.window_start = 0
+        self.window_keys = []
+        self._iid_to_key = {}
+        self._row_cache = {}
+        self._selected = []
+        self._extend = False
+        self._rendering = False
+
+        self.tree.configure(yscrollcommand=self._on_tree_yview)
+        self.scrollbar.configure(command=self._on_scrollbar)
+        self.tree.bind('<ButtonPress-1>', self._on_press, add='+')
+        self.tree.bind('<KeyPress>', self._on_press, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        self.tree.bind('<Configure>', lambda e: self._render(self.top_index()), add='+')
+
+    # === 資料模型 ===
+    def set_keys(self, keys):
+        """設定整份資料的鍵值順序，並保持目前的捲動位置"""
+        self.keys = list(keys)
+        present = set(self.keys)
+        self._selected = [key for key in self._selected if key in present]
+        self._render(self.top_index())
+
+    def refresh(self):
+        """重新取得可視範圍內各列的內容"""
+        self._render(self.top_index())
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def iid_for(key):
+        """由鍵值產生穩定的 Treeview iid"""
+        return str(key)
+
+    # === 選取 ===
+    def key_of(self, iid):
+        """取得 Treeview 項目對應的鍵值"""
+        return self._iid_to_key.get(iid)
+
+    def selected_keys(self):
+        """取得目前選取的鍵值（包含已捲出可視範圍的列）"""
+        return list(self._selected)
+
+    def selected_key(self):
+        """取得第一個選取的鍵值，沒有選取時回傳 None"""
+        return self._selected[0] if self._selected else None
+
+    def _on_press(self, event):
+        """記錄這次點選或按鍵是否為延伸選取（<<TreeviewSelect>> 本身不帶修飾鍵狀態）"""
+        self._extend = bool(event.state & EXTEND_SELECT_MASK)
+
+    def _on_select(self, event):
+        if self._rendering:
+            return
+        extend, self._extend = self._extend, False
+        selected = [self._iid_to_key[iid] for iid in self.tree.selection() if iid in self._iid_to_key]
+        previous = self._selected
+        if extend:
+            # 延伸選取：保留選取中但目前不在視窗內的列
+            window = set(self.window_keys)
+            selected = [key for key in previous if key not in window] + selected
+        self._selected = selected
+        if set(self._selected) != set(previous):
+            self.tree.event_generate('<<VirtualTreeSelect>>')
+
+    # === 捲動 ===
+    def visible_rows(self):
+        """估算可視範圍的列數"""
+        height = self.tree.winfo_height()
+        rows = int(self.tree.cget('height'))
+        if height > 1:
+            rows = max(rows, height // 20)
+        return rows
+
+    def top_index(self):
+        """目前可視範圍第一列在整份資料中的位置"""
+        if not self.window_keys:
+            return min(self.window_start, max(len(self.keys) - 1, 0))
+        first, _ = self.tree.yview()
+        return self.window_start + int(round(float(first) * len(self.window_keys)))
+
+    def scroll_to(self, index):
+        """捲動到指定列"""
+        self._render(index)
+
+    def _on_scrollbar(self, *args):
+        total = len(self.keys)
+        if not total:
+            return
+        visible = self.visible_rows()
+        if args[0] == 'moveto':
+            index = int(float(args[1]) * total)
+        else:
+            step = int(args[1])
+            index = self.top_index() + (step * visible if args[2] == 'pages' else step)
+        self._render(index)
+
+    def _on_tree_yview(self, first, last):
+        """Treeview 自己捲動（滑鼠滾輪、方向鍵）時更新捲軸，接近視窗邊緣就重新取資料"""
+        total = len(self.keys)
+        if not total or not self.window_keys:
+            self.scrollbar.set(0, 1)
+            return
+
+        size = len(self.window_keys)
+        top = self.window_start + float(first) * size
+        bottom = self.window_start + float(last) * size
+        self.scrollbar.set(top / total, bottom / total)
+
+        if self._rendering:
+            return
+        margin = self.buffer // 3
+        near_top = self.window_start > 0 and top - self.window_start < margin
+        near_bottom = (self.window_start + size < total
+                       and self.window_start + size - bottom < margin)
+        if near_top or near_bottom:
+            self.tree.after_idle(lambda: self._render(int(round(top))))
+
+    # === 繪製 ===
+    def _render(self, index):
+        """以 index 為可視範圍第一列，同步緩衝視窗內的項目"""
+        total = len(self.keys)
+        visible = self.visible_rows()
+        index = max(0, min(index, max(total - visible, 0)))
+        start = max(0, index - self.buffer)
+        end = min(total, index + visible + self.buffer)
+
+        self._rendering = True
+        try:
+            self.window_start = start
+            self.window_keys = self.keys[start:end]
+
+            rows = []
+            self._iid_to_key = {}
+            for key in self.window_keys:
+                values = self.row_values(key)
+                if values is None:
+                    continue
+                iid = self.iid_for(key)
+                rows.append((iid, values))
+                self._iid_to_key[iid] = key
+            sync_tree_rows(self.tree, rows, self._row_cache)
+
+            selected = set(self._selected)
+            reselect = [iid for iid, key in self._iid_to_key.items() if key in selected]
+            if set(reselect) != set(self.tree.selection()):
+                self.tree.selection_set(reselect)
+
+            if self.window_keys:
+                self.tree.yview_moveto((index - start) / len(self.window_keys))
+        finally:
+            self._rendering = False